@@ -4,12 +4,14 @@ Base agent class for the debate system
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
 
 from config.settings import AgentConfig
 from utils.llm_client import LLMClient
 from utils.logger import setup_logger
+from utils.usage import TokenUsage, record_call
+from utils.fast_json import CachedJSON
 
 logger = setup_logger(__name__)
 
@@ -17,21 +19,32 @@ logger = setup_logger(__name__)
 class Message:
     role: str  # 'pro', 'con', 'judge', 'system'
     content: str
-    timestamp: float
+    timestamp: float  # wall-clock epoch milliseconds (see utils.timing.wall_clock_ms)
     metadata: Dict[str, Any] = None
+    _record: Optional[CachedJSON] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
 
+    def to_dict(self) -> CachedJSON:
+        """Wire representation, built (and JSON-encoded) once per message"""
+        if self._record is None:
+            self._record = CachedJSON(role=self.role, content=self.content,
+                                      timestamp=self.timestamp, metadata=self.metadata)
+        return self._record
+
 class BaseAgent(ABC):
     """Base class for all debate agents"""
     
     def __init__(self, config: AgentConfig, role: str, api_keys: Dict[str, str]):
         self.config = config
         self.role = role
-        self.llm_client = LLMClient(config, api_keys)
+        # Speaker name in debate formats with several debaters per side ("pro_2")
+        self.seat = role
+        self.llm_client = LLMClient(config, api_keys, role=role)
         self.logger = setup_logger(f"agent.{role}")
+        self.usage = TokenUsage()
     
     @abstractmethod
     async def generate_response(self, 
@@ -41,24 +54,20 @@ class BaseAgent(ABC):
         """Generate a response based on the conversation history"""
         pass
     
-    def _build_conversation_context(self, 
-                                  conversation_history: List[Message],
-                                  max_history: int = 10) -> str:
-        """Build conversation context from history"""
-        if not conversation_history:
-            return ""
-        
-        # Take the most recent messages
-        recent_history = conversation_history[-max_history:]
-        
-        context_parts = []
-        for msg in recent_history:
+    def _build_chat_history(self,
+                            conversation_history: List[Message],
+                            max_history: int = 10) -> List[Dict[str, str]]:
+        """Build chat messages from history: own turns as assistant, others as labelled user turns"""
+        messages = []
+        for msg in conversation_history[-max_history:]:
             if msg.role == 'system':
                 continue
-            role_name = msg.role.upper()
-            context_parts.append(f"{role_name}: {msg.content}")
-        
-        return "\n\n".join(context_parts)
+            speaker = msg.metadata.get("speaker", msg.role)
+            if speaker == self.seat:
+                messages.append({"role": "assistant", "content": msg.content})
+            else:
+                messages.append({"role": "user", "content": f"{speaker.upper()}: {msg.content}"})
+        return messages
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt for this agent"""
@@ -69,16 +78,39 @@ class BaseAgent(ABC):
         """Load the prompt template for this agent"""
         pass
     
-    async def _call_llm(self, prompt: str, system_prompt: str) -> str:
-        """Call the LLM with the given prompt"""
+    async def _call_llm(self, prompt: str, system_prompt: str, cached_prefix: Optional[str] = None) -> str:
+        """Call the LLM with the given prompt and record its token usage
+        
+        ``cached_prefix`` is the stable leading part of the user prompt, sent
+        ahead of ``prompt`` and marked for provider-side prompt caching.
+        """
         try:
             response = await self.llm_client.generate(
                 prompt=prompt,
                 system_prompt=system_prompt,
                 temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                cached_prefix=cached_prefix
+            )
+            record_call(self.usage, response.prompt_tokens, response.completion_tokens, response.latency_ms,
+                        response.cached_tokens)
+            return response.text
+        except Exception as e:
+            self.logger.error(f"LLM call failed: {str(e)}")
+            raise
+    
+    async def _chat_llm(self, messages: List[Dict[str, Any]], system_prompt: str) -> str:
+        """Call the LLM with a multi-turn message list and record its token usage"""
+        try:
+            response = await self.llm_client.chat(
+                messages=messages,
+                system_prompt=system_prompt,
+                temperature=self.config.temperature,
                 max_tokens=self.config.max_tokens
             )
-            return response
+            record_call(self.usage, response.prompt_tokens, response.completion_tokens, response.latency_ms,
+                        response.cached_tokens)
+            return response.text
         except Exception as e:
             self.logger.error(f"LLM call failed: {str(e)}")
             raise
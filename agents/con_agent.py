@@ -3,13 +3,45 @@ CON agent - argues against the debate topic
 """
 
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 
 from .base_agent import BaseAgent, Message
 from utils.logger import setup_logger
+from utils.timing import timed, PROMPT_BUILD
+from utils.prompt_registry import prompt_registry, DebatePromptTemplate
 
 logger = setup_logger(__name__)
 
+# Fallback system prompt if prompts/con_agent.txt is missing
+FALLBACK_SYSTEM_PROMPT = """You are a skilled debater arguing AGAINST the given topic.
+
+Your role:
+- Present strong, evidence-based arguments opposing the CON position
+- Use logical reasoning, facts, and credible sources
+- Address pro-arguments effectively
+- Maintain a professional and persuasive tone
+- Stay focused on the debate topic
+
+Debate guidelines:
+- Be respectful but assertive in your arguments
+- Use specific examples and evidence when possible
+- Structure your arguments clearly
+- Acknowledge valid points from the opposition while reinforcing your position
+- Avoid personal attacks or inflammatory language
+
+Remember: You are arguing AGAINST the topic. Make the strongest possible case against the position."""
+
+CON_TURN_PROMPT = DebatePromptTemplate(
+    task="Your task: Provide a strong CON argument against this topic. Be persuasive, use evidence, and directly address any PRO arguments that have been made.",
+    guidelines=[
+        "- Stay focused on the topic",
+        "- Use logical reasoning and evidence",
+        "- Address pro-arguments directly",
+        "- Be respectful but assertive",
+        "- Keep your response concise but comprehensive"
+    ],
+    closing="Your CON argument:"
+)
+
 class ConAgent(BaseAgent):
     """Agent that argues against the debate topic"""
     
@@ -22,61 +54,19 @@ class ConAgent(BaseAgent):
                               context: Optional[Dict[str, Any]] = None) -> str:
         """Generate a CON argument"""
         
-        system_prompt = self._get_system_prompt()
-        conversation_context = self._build_conversation_context(conversation_history)
-        
-        # Build the prompt
-        prompt_parts = [
-            f"DEBATE TOPIC: {topic}",
-            "",
-            "RESEARCH CONTEXT:" if context and context.get('research') else "",
-            context.get('research', '') if context else "",
-            "",
-            "CONVERSATION HISTORY:" if conversation_context else "",
-            conversation_context,
-            "",
-            "Your task: Provide a strong CON argument against this topic. Be persuasive, use evidence, and directly address any PRO arguments that have been made.",
-            "",
-            "Guidelines:",
-            "- Stay focused on the topic",
-            "- Use logical reasoning and evidence",
-            "- Address pro-arguments directly",
-            "- Be respectful but assertive",
-            "- Keep your response concise but comprehensive",
-            "",
-            "Your CON argument:"
-        ]
-        
-        prompt = "\n".join(filter(None, prompt_parts))
+        with timed(PROMPT_BUILD):
+            system_prompt = self._get_system_prompt()
+            history = self._build_chat_history(conversation_history)
+            research = context.get('research', '') if context else ''
+            instruction = context.get('instruction') if context else None
+            evidence = context.get('evidence', '') if context else ''
+            messages = CON_TURN_PROMPT.render_messages(topic, research, history, instruction, evidence)
         
         self.logger.info(f"Generating CON response for topic: {topic}")
-        response = await self._call_llm(prompt, system_prompt)
+        response = await self._chat_llm(messages, system_prompt)
         
         return response.strip()
     
     def _load_prompt_template(self) -> str:
-        """Load the CON agent prompt template"""
-        template_path = Path(__file__).parent.parent / "prompts" / "con_agent.txt"
-        
-        if template_path.exists():
-            with open(template_path, 'r') as f:
-                return f.read()
-        
-        # Fallback system prompt
-        return """You are a skilled debater arguing AGAINST the given topic.
-
-Your role:
-- Present strong, evidence-based arguments opposing the CON position
-- Use logical reasoning, facts, and credible sources
-- Address pro-arguments effectively
-- Maintain a professional and persuasive tone
-- Stay focused on the debate topic
-
-Debate guidelines:
-- Be respectful but assertive in your arguments
-- Use specific examples and evidence when possible
-- Structure your arguments clearly
-- Acknowledge valid points from the opposition while reinforcing your position
-- Avoid personal attacks or inflammatory language
-
-Remember: You are arguing AGAINST the topic. Make the strongest possible case against the position."""
+        """Get the CON agent prompt template from the preloaded registry"""
+        return prompt_registry.get("con_agent", FALLBACK_SYSTEM_PROMPT)
@@ -3,49 +3,42 @@ JUDGE agent - researches topics and evaluates debates
 """
 
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 import json
 
 from .base_agent import BaseAgent, Message
 from tools.web_search_tool import WebSearchTool
 from utils.logger import setup_logger
+from utils.timing import timed, PROMPT_BUILD
+from utils.prompt_registry import prompt_registry
+from utils.retrieval import chunk_text
+from utils.shared_store import result_cache
 
 logger = setup_logger(__name__)
 
-class JudgeAgent(BaseAgent):
-    """Agent that researches topics and judges debates"""
-    
-    def __init__(self, config, api_keys: Dict[str, str], tools_config: Dict[str, Any]):
-        super().__init__(config, "judge", api_keys)
-        self.web_search = WebSearchTool(tools_config.get('web_search', {}), api_keys)
-    
-    async def research_topic(self, topic: str) -> str:
-        """Research the debate topic using web search"""
-        self.logger.info(f"Researching topic: {topic}")
-        
-        try:
-            # Perform web search
-            search_results = await self.web_search.search(topic)
-            
-            # Format research context
-            research_parts = [
-                f"RESEARCH RESULTS FOR: {topic}",
-                "=" * 50,
-                ""
-            ]
-            
-            for i, result in enumerate(search_results, 1):
-                research_parts.extend([
-                    f"{i}. {result.get('title', 'No title')}",
-                    f"   Source: {result.get('url', 'No URL')}",
-                    f"   Summary: {result.get('snippet', 'No summary')}",
-                    ""
-                ])
-            
-            research_context = "\n".join(research_parts)
-            
-            # Generate research summary using LLM
-            system_prompt = """You are a research assistant. Analyze the provided search results and create a balanced, informative summary that will help debaters understand the key aspects of the topic.
+# Fallback system prompt if prompts/judge_agent.txt is missing
+FALLBACK_SYSTEM_PROMPT = """You are an impartial debate judge with expertise in critical thinking and argumentation.
+
+Your responsibilities:
+1. Research topics thoroughly using available tools
+2. Evaluate debates based on objective criteria
+3. Provide fair and balanced judgments
+4. Explain your reasoning clearly
+
+Evaluation criteria:
+- Strength and quality of arguments
+- Use of evidence and credible sources
+- Logical reasoning and coherence
+- Addressing of counterarguments
+- Overall persuasiveness and impact
+
+Guidelines:
+- Remain completely impartial and objective
+- Base judgments on argument quality, not personal beliefs
+- Provide detailed reasoning for all decisions
+- Consider both sides fairly
+- Focus on facts, logic, and evidence"""
+
+RESEARCH_SYSTEM_PROMPT = """You are a research assistant. Analyze the provided search results and create a balanced, informative summary that will help debaters understand the key aspects of the topic.
 
 Focus on:
 - Key facts and statistics
@@ -55,11 +48,7 @@ Focus on:
 
 Be objective and comprehensive."""
 
-            summary_prompt = f"""Based on these search results, provide a comprehensive research summary for the debate topic: "{topic}"
-
-{research_context}
-
-Create a balanced summary that covers:
+RESEARCH_SUMMARY_INSTRUCTIONS = """Create a balanced summary that covers:
 1. Background and context
 2. Key arguments FOR the topic
 3. Key arguments AGAINST the topic
@@ -68,41 +57,7 @@ Create a balanced summary that covers:
 
 Research Summary:"""
 
-            summary = await self._call_llm(summary_prompt, system_prompt)
-            
-            return f"{research_context}\n\nRESEARCH SUMMARY:\n{summary}"
-            
-        except Exception as e:
-            self.logger.error(f"Research failed: {str(e)}")
-            return f"Research could not be completed for topic: {topic}. Error: {str(e)}"
-    
-    async def judge_debate(self, 
-                          topic: str, 
-                          conversation_history: List[Message]) -> Dict[str, Any]:
-        """Judge the debate and declare a winner"""
-        
-        system_prompt = self._get_system_prompt()
-        
-        # Build debate transcript
-        transcript_parts = [f"DEBATE TOPIC: {topic}", "=" * 50, ""]
-        
-        for msg in conversation_history:
-            if msg.role in ['pro', 'con']:
-                role_name = msg.role.upper()
-                transcript_parts.extend([
-                    f"{role_name} ARGUMENT:",
-                    msg.content,
-                    ""
-                ])
-        
-        transcript = "\n".join(transcript_parts)
-        
-        # Judge the debate
-        judge_prompt = f"""Analyze this complete debate transcript and provide your judgment:
-
-{transcript}
-
-Evaluate based on:
+JUDGE_INSTRUCTIONS = """Evaluate based on:
 1. Strength of arguments and evidence
 2. Logical reasoning and coherence
 3. Addressing of counterarguments
@@ -110,23 +65,117 @@ Evaluate based on:
 5. Overall persuasiveness
 
 Provide your judgment in the following JSON format:
-{{
+{
     "winner": "PRO" or "CON",
     "reasoning": "Detailed explanation of your decision",
-    "score": {{
+    "score": {
         "pro_score": 0-100,
         "con_score": 0-100
-    }},
-    "analysis": {{
+    },
+    "analysis": {
         "pro_strengths": ["strength1", "strength2"],
         "pro_weaknesses": ["weakness1", "weakness2"],
         "con_strengths": ["strength1", "strength2"],
         "con_weaknesses": ["weakness1", "weakness2"]
-    }}
-}}
+    }
+}
 
 Your judgment:"""
 
+RESEARCH_HEADING = "RESEARCH RESULTS FOR:"
+
+def research_chunks(research: str, chunk_words: int = 80) -> List[str]:
+    """Retrieval chunks of ``research_topic`` output: one per search result or summary passage, heading dropped"""
+    return [chunk for chunk in chunk_text(research, chunk_words) if not chunk.startswith(RESEARCH_HEADING)]
+
+class JudgeAgent(BaseAgent):
+    """Agent that researches topics and judges debates"""
+    
+    def __init__(self, config, api_keys: Dict[str, str], tools_config: Dict[str, Any]):
+        super().__init__(config, "judge", api_keys)
+        self.web_search = WebSearchTool(tools_config.get('web_search', {}), api_keys)
+    
+    async def research_topic(self, topic: str) -> str:
+        """Research the debate topic using web search
+        
+        With ``store.research_cache_ttl`` set, results are cached per topic, judge
+        model and search settings, across API workers when a shared store is set.
+        """
+        cache_key = result_cache.key(topic, self.config.provider, self.config.model,
+                                     self.web_search.provider, self.web_search.max_results)
+        cached = await result_cache.get("research", cache_key)
+        if cached is not None:
+            self.logger.info(f"Research cache hit for topic: {topic}")
+            return cached
+        
+        self.logger.info(f"Researching topic: {topic}")
+        
+        try:
+            # Perform web search
+            search_results = await self.web_search.search(topic)
+            
+            with timed(PROMPT_BUILD):
+                # Format research context
+                research_parts = [
+                    f"{RESEARCH_HEADING} {topic}",
+                    "=" * 50,
+                    ""
+                ]
+            
+                for i, result in enumerate(search_results, 1):
+                    research_parts.extend([
+                        f"{i}. {result.get('title', 'No title')}",
+                        f"   Source: {result.get('url', 'No URL')}",
+                        f"   Summary: {result.get('snippet', 'No summary')}",
+                        ""
+                    ])
+            
+                research_context = "\n".join(research_parts)
+                
+                # Generate research summary using LLM
+                summary_prompt = (
+                    f'Based on these search results, provide a comprehensive research summary for the debate topic: "{topic}"'
+                    f"\n\n{research_context}\n\n{RESEARCH_SUMMARY_INSTRUCTIONS}"
+                )
+            
+            summary = await self._call_llm(summary_prompt, RESEARCH_SYSTEM_PROMPT)
+            
+            research = f"{research_context}\n\nRESEARCH SUMMARY:\n{summary}"
+            if search_results:
+                result_cache.put("research", cache_key, research)
+            return research
+            
+        except Exception as e:
+            self.logger.error(f"Research failed: {str(e)}")
+            return f"Research could not be completed for topic: {topic}. Error: {str(e)}"
+    
+    async def judge_debate(self, 
+                          topic: str, 
+                          conversation_history: List[Message]) -> Dict[str, Any]:
+        """Judge the debate and declare a winner"""
+        
+        with timed(PROMPT_BUILD):
+            system_prompt = self._get_system_prompt()
+            
+            # Build debate transcript
+            transcript_parts = [f"DEBATE TOPIC: {topic}", "=" * 50, ""]
+            
+            for msg in conversation_history:
+                if msg.role in ['pro', 'con']:
+                    # Speaker and kind of turn in formats with several debaters or turn types
+                    speaker = msg.metadata.get("speaker", msg.role).upper()
+                    kind = msg.metadata.get("kind", "argument").replace("_", " ").upper()
+                    transcript_parts.extend([
+                        f"{speaker} {kind}:",
+                        msg.content,
+                        ""
+                    ])
+            
+            transcript = "\n".join(transcript_parts)
+            
+            # Judge the debate
+            judge_prompt = f"Analyze this complete debate transcript and provide your judgment:\n\n{transcript}\n\n{JUDGE_INSTRUCTIONS}"
+        
         self.logger.info(f"Judging debate on topic: {topic}")
         response = await self._call_llm(judge_prompt, system_prompt)
         
@@ -157,32 +206,5 @@ Your judgment:"""
         return await self.research_topic(topic)
     
     def _load_prompt_template(self) -> str:
-        """Load the JUDGE agent prompt template"""
-        template_path = Path(__file__).parent.parent / "prompts" / "judge_agent.txt"
-        
-        if template_path.exists():
-            with open(template_path, 'r') as f:
-                return f.read()
-        
-        # Fallback system prompt
-        return """You are an impartial debate judge with expertise in critical thinking and argumentation.
-
-Your responsibilities:
-1. Research topics thoroughly using available tools
-2. Evaluate debates based on objective criteria
-3. Provide fair and balanced judgments
-4. Explain your reasoning clearly
-
-Evaluation criteria:
-- Strength and quality of arguments
-- Use of evidence and credible sources
-- Logical reasoning and coherence
-- Addressing of counterarguments
-- Overall persuasiveness and impact
-
-Guidelines:
-- Remain completely impartial and objective
-- Base judgments on argument quality, not personal beliefs
-- Provide detailed reasoning for all decisions
-- Consider both sides fairly
-- Focus on facts, logic, and evidence"""
+        """Get the JUDGE agent prompt template from the preloaded registry"""
+        return prompt_registry.get("judge_agent", FALLBACK_SYSTEM_PROMPT)
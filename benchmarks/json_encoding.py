@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Encoding cost of debate transcripts: SSE events and the /debate response
+
+Builds synthetic 50-turn transcripts and times the two places a debate is
+serialized: streaming (one event per message plus the ``complete`` event
+carrying the whole transcript) and the ``POST /debate`` body. The legacy
+path is stdlib ``json.dumps`` per event and pydantic validation of the
+result before FastAPI encodes it; the current path encodes each message
+record once, with each available JSON backend:
+
+    python benchmarks/json_encoding.py --turns 50 --iterations 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from agents.base_agent import Message  # noqa: E402
+from main import DebateResponse  # noqa: E402
+from orchestrator.events import encode_result, message_event, sse_frame  # noqa: E402
+from utils import fast_json  # noqa: E402
+
+PARAGRAPH = ("Congestion pricing in dense city centres cuts traffic by 15–30% and funds transit; "
+             "critics point to equity costs for commuters without alternatives. ")
+
+
+def build_messages(turns: int, content_chars: int) -> List[Message]:
+    content = (PARAGRAPH * (content_chars // len(PARAGRAPH) + 1))[:content_chars]
+    messages = []
+    for turn in range(1, turns + 1):
+        role = "pro" if turn % 2 else "con"
+        messages.append(Message(role=role, content=f"{turn}: {content}", timestamp=1.7e12 + turn * 1000.5, metadata={
+            "turn": turn,
+            "agent_config": {"model": "gpt-4o-mini", "provider": "openai"},
+            "timings": {"total_ms": 2310.4, "queue_wait_ms": 1.2, "prompt_build_ms": 0.8,
+                        "network_ms": 2290.1, "parse_ms": 0.3, "search_ms": 0.0},
+            "usage": {"prompt_tokens": 1800 + turn * 40, "completion_tokens": 420, "cached_tokens": 1024,
+                      "total_tokens": 2220 + turn * 40, "cost_usd": 0.000512}
+        }))
+    return messages
+
+
+def build_result(transcript: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "topic": "Should cities ban cars?",
+        "winner": "PRO",
+        "reasoning": "PRO grounded its claims in evidence. " * 10,
+        "score": {"pro_score": 8, "con_score": 6},
+        "transcript": transcript,
+        "metadata": {"duration": 130.2, "total_turns": len(transcript), "research_context": "Research. " * 50,
+                     "analysis": {"pro_strengths": ["evidence"], "con_strengths": ["equity"]},
+                     "timings": {"research_ms": 5000.0, "debate_ms": 120000.0, "judgment_ms": 5200.0},
+                     "usage": {"total": {"prompt_tokens": 120000, "completion_tokens": 21000}}}
+    }
+
+
+def legacy_stream(messages: List[Message]) -> int:
+    size = 0
+    for message in messages:
+        data = {"role": message.role, "content": message.content, "timestamp": message.timestamp,
+                "metadata": message.metadata}
+        size += len(f"data: {json.dumps({'type': 'message', 'message': data})}\n\n".encode("utf-8"))
+    transcript = [{"role": m.role, "content": m.content, "timestamp": m.timestamp, "metadata": m.metadata}
+                  for m in messages]
+    size += len(f"data: {json.dumps({'type': 'complete', 'result': build_result(transcript)})}\n\n".encode("utf-8"))
+    return size
+
+
+def legacy_response(messages: List[Message]) -> int:
+    transcript = [{"role": m.role, "content": m.content, "timestamp": m.timestamp, "metadata": m.metadata}
+                  for m in messages]
+    model = DebateResponse(**build_result(transcript))
+    # FastAPI's response_model handling: dump, validate again, jsonable_encoder, json.dumps
+    validated = DebateResponse.model_validate(model.model_dump())
+    return len(json.dumps(jsonable_encoder(validated)).encode("utf-8"))
+
+
+def current_stream(messages: List[Message]) -> int:
+    size = 0
+    for event_id, message in enumerate(messages, 1):
+        size += len(sse_frame(event_id, message_event(message)))
+    result = build_result([message.to_dict() for message in messages])
+    return size + len(sse_frame(len(messages) + 1, {"type": "complete", "result": result}))
+
+
+def current_response(messages: List[Message]) -> int:
+    return len(encode_result(build_result([message.to_dict() for message in messages])))
+
+
+def measure(fn: Callable[[List[Message]], int], args, fresh: bool) -> Dict[str, float]:
+    """Median milliseconds per transcript; ``fresh`` rebuilds messages so no encoding is cached"""
+    samples = []
+    size = 0
+    messages = build_messages(args.turns, args.content_chars)
+    for _ in range(args.iterations):
+        if fresh:
+            messages = build_messages(args.turns, args.content_chars)
+        start = time.perf_counter()
+        size = fn(messages)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(samples), 3), "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgenticDebate transcript encoding benchmark")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--content-chars", type=int, default=2500, help="Characters per turn")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "turns": args.turns,
+        "legacy": {"stream": measure(legacy_stream, args, False), "response": measure(legacy_response, args, False)}
+    }
+    for name in fast_json.CODECS:
+        try:
+            fast_json.use(name)
+        except ImportError:
+            report[name] = "not installed"
+            continue
+        report[name] = {
+            "stream": measure(current_stream, args, True),
+            "response": measure(current_response, args, True),
+            # /debate after streaming (or a second viewer): every message is already encoded
+            "response_cached": measure(current_response, args, False)
+        }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Load generator for the debate API
+
+Drives ``POST /debate`` or ``POST /debate/stream`` at a target concurrency and
+reports throughput and latency percentiles. By default every agent and the web
+search use the built-in mock providers, so runs are offline, free and
+reproducible:
+
+    python main.py --mode api &
+    python benchmarks/load_test.py --endpoint stream --concurrency 20 --debates 200
+
+With ``--viewers N`` every streamed debate also gets N subscribers on
+``GET /debates/{debate_id}/events``, as for a debate shown on many dashboards.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, rounded to milliseconds"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index], 3)
+
+
+def build_payload(args, index: int) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "topic": f"{args.topic} #{index % args.topics}",
+        "max_turns": args.max_turns
+    }
+    if args.provider:
+        for role in ("pro", "con", "judge"):
+            payload[f"{role}_provider"] = args.provider
+            payload[f"{role}_model"] = args.model
+    if args.priority:
+        payload["priority"] = args.priority
+    if args.tenant:
+        payload["tenant"] = args.tenant
+    if args.search_provider:
+        payload["tools"] = {"web_search": {"provider": args.search_provider, "max_results": 5}}
+    return payload
+
+
+async def watch(session: aiohttp.ClientSession, args, debate_id: str) -> bool:
+    """Follow a debate as a viewer; whether it saw the debate complete"""
+    try:
+        async with session.get(f"{args.url}/debates/{debate_id}/events") as response:
+            if response.status != 200:
+                return False
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                if line.startswith("data: ") and json.loads(line[6:]).get("type") == "complete":
+                    return True
+    except Exception:
+        return False
+    return False
+
+
+async def run_one(session: aiohttp.ClientSession, args, index: int) -> Dict[str, Any]:
+    payload = build_payload(args, index)
+    start = time.perf_counter()
+    first_event: Optional[float] = None
+    viewers: List[asyncio.Task] = []
+    try:
+        if args.endpoint == "stream":
+            async with session.post(f"{args.url}/debate/stream", json=payload) as response:
+                if response.status != 200:
+                    return {"ok": False, "error": f"HTTP {response.status}"}
+                debate_id = response.headers.get("X-Debate-Id")
+                if debate_id:
+                    viewers = [asyncio.create_task(watch(session, args, debate_id)) for _ in range(args.viewers)]
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data: "):
+                        continue
+                    if first_event is None:
+                        first_event = time.perf_counter() - start
+                    event = json.loads(line[6:])
+                    if event.get("type") == "error":
+                        return {"ok": False, "error": event.get("error", "stream error")}
+                    if event.get("type") == "complete":
+                        break
+        else:
+            async with session.post(f"{args.url}/debate", json=payload) as response:
+                if response.status != 200:
+                    return {"ok": False, "error": f"HTTP {response.status}"}
+                await response.read()
+    except Exception as e:
+        for viewer in viewers:
+            viewer.cancel()
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    latency = time.perf_counter() - start
+    watched = sum(await asyncio.gather(*viewers)) if viewers else 0
+    return {"ok": True, "latency": latency, "first_event": first_event,
+            "viewers": len(viewers), "viewers_completed": watched}
+
+
+async def run_load(args) -> Dict[str, Any]:
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(args.debates):
+        queue.put_nowait(index)
+    results: List[Dict[str, Any]] = []
+
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=args.concurrency * (1 + args.viewers))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        async def worker():
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results.append(await run_one(session, args, index))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [r["latency"] for r in results if r["ok"]]
+    first_events = [r["first_event"] for r in results if r["ok"] and r.get("first_event") is not None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+    report = {
+        "endpoint": args.endpoint,
+        "concurrency": args.concurrency,
+        "debates": len(results),
+        "succeeded": len(latencies),
+        "failed": len(results) - len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "debates_per_hour": round(len(latencies) / elapsed * 3600, 1) if elapsed else 0.0,
+        "latency_s": {f"p{p}": percentile(latencies, p) for p in (50, 90, 99)},
+        "errors": errors
+    }
+    if args.viewers:
+        report["viewers"] = {
+            "subscribed": sum(r.get("viewers", 0) for r in results),
+            "completed": sum(r.get("viewers_completed", 0) for r in results)
+        }
+    if first_events:
+        report["time_to_first_event_s"] = {f"p{p}": percentile(first_events, p) for p in (50, 90, 99)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgenticDebate load generator")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--endpoint", choices=["debate", "stream"], default="debate")
+    parser.add_argument("--concurrency", type=int, default=10, help="Debates in flight")
+    parser.add_argument("--debates", type=int, default=100, help="Total debates to run")
+    parser.add_argument("--max-turns", type=int, default=4)
+    parser.add_argument("--topic", default="Benchmark topic")
+    parser.add_argument("--topics", type=int, default=10, help="Distinct topics to cycle through")
+    parser.add_argument("--provider", default="mock", help="LLM provider for all agents ('' keeps server config)")
+    parser.add_argument("--model", default="mock-1")
+    parser.add_argument("--search-provider", default="mock", help="Search provider ('' keeps server config)")
+    parser.add_argument("--priority", help="LLM scheduling class: interactive, batch, background")
+    parser.add_argument("--tenant", help="Fair-queuing tenant for this run")
+    parser.add_argument("--viewers", type=int, default=0, help="Stream endpoint: extra subscribers per debate")
+    parser.add_argument("--timeout", type=float, default=1800.0, help="Per-debate timeout in seconds")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
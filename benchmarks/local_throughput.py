@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Debates/hour on the local model backend
+
+Runs debates in-process with every agent on ``provider: "local"`` and the
+mock web search, once per batch size, and reports throughput and the
+average executed batch size. The default ``mock`` backend simulates batched
+decoding cost, so the effect of batching can be measured on any machine;
+pass ``--backend llama_cpp --model path/to/model.gguf`` for a real model:
+
+    python benchmarks/local_throughput.py --concurrency 16 --debates 32 --batch-sizes 1 8 16
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import Config  # noqa: E402
+from orchestrator.debate_loop import DebateOrchestrator  # noqa: E402
+from utils.local_llm import shutdown_engines  # noqa: E402
+from utils.metrics import LLM_BATCH_SIZE, registry  # noqa: E402
+
+
+def build_config(args, max_batch_size: int) -> Config:
+    config = Config()
+    options: Dict[str, Any] = {
+        "backend": args.backend,
+        "max_batch_size": max_batch_size,
+        "batch_wait_ms": args.batch_wait_ms,
+        "workers": args.workers
+    }
+    if args.backend == "mock":
+        options.update({"step_ms": args.step_ms, "prefill_tokens_per_second": args.prefill_tps,
+                        "completion_tokens": args.completion_tokens})
+    for agent in (config.agents.pro, config.agents.con, config.agents.judge):
+        agent.provider = "local"
+        agent.model = args.model
+        agent.max_tokens = args.max_tokens
+        agent.options = dict(options)
+    config.debate.max_turns = args.max_turns
+    config.debate.turn_delay = 0
+    config.tools = {"web_search": {"provider": "mock", "max_results": 3, "mock": {"latency_ms": 5, "latency_jitter_ms": 1}}}
+    return config
+
+
+async def run_batch_size(args, max_batch_size: int) -> Dict[str, Any]:
+    registry.reset()
+    config = build_config(args, max_batch_size)
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(args.debates):
+        queue.put_nowait(index)
+    results: List[bool] = []
+
+    async def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = await DebateOrchestrator(config).run_debate(f"{args.topic} #{index}")
+                results.append(result["winner"] != "ERROR")
+            except Exception:
+                results.append(False)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    shutdown_engines()
+
+    batches = LLM_BATCH_SIZE.labels(f"local:{args.backend}")
+    succeeded = sum(results)
+    return {
+        "max_batch_size": max_batch_size,
+        "debates": len(results),
+        "succeeded": succeeded,
+        "elapsed_s": round(elapsed, 3),
+        "debates_per_hour": round(succeeded / elapsed * 3600, 1) if elapsed else 0.0,
+        "batches": batches.count,
+        "avg_batch_size": round(batches.sum / batches.count, 2) if batches.count else 0.0
+    }
+
+
+async def run_all(args) -> List[Dict[str, Any]]:
+    return [await run_batch_size(args, size) for size in args.batch_sizes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgenticDebate local backend throughput benchmark")
+    parser.add_argument("--backend", default="mock", help="Local backend: mock, llama_cpp, transformers")
+    parser.add_argument("--model", default="mock-1", help="Model path or name")
+    parser.add_argument("--workers", type=int, default=0, help="Model worker processes (0 = in-process thread)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8], help="max_batch_size values to compare")
+    parser.add_argument("--batch-wait-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8, help="Debates in flight")
+    parser.add_argument("--debates", type=int, default=16, help="Debates per batch size")
+    parser.add_argument("--max-turns", type=int, default=4)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--topic", default="Benchmark topic")
+    parser.add_argument("--step-ms", type=float, default=10.0, help="Mock backend: simulated decode step")
+    parser.add_argument("--prefill-tps", type=float, default=5000.0, help="Mock backend: simulated prefill tokens/s")
+    parser.add_argument("--completion-tokens", type=int, default=60, help="Mock backend: tokens per completion")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_all(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
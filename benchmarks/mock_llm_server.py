@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Local stand-in LLM server speaking the OpenAI and Anthropic wire formats
+
+Point an agent at it with ``provider: "openai"`` (or "anthropic") and
+``base_url: "http://localhost:9000/v1"``. Responses come from the seeded
+MockLLM, so runs are reproducible, and latency/throughput/errors are
+configurable from the command line. Anthropic Message Batches jobs are
+accepted too (``batch_api: true``); they end once every request completes.
+
+    python benchmarks/mock_llm_server.py --port 9000 --latency-ms 400 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.mock_llm import MockLLM, MockLLMError  # noqa: E402
+
+
+def _openai_prompt(messages):
+    # Automatic prefix caching: any message boundary before the final message may hit
+    system_prompt = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    texts = [m["content"] for m in messages if m["role"] != "system"]
+    boundaries = []
+    offset = 0
+    for text in texts[:-1]:
+        offset += len(text)
+        boundaries.append(offset)
+        offset += 2
+    return "\n\n".join(texts), system_prompt, boundaries
+
+
+def _text(content) -> str:
+    # Anthropic content may be a string or a list of content blocks
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content)
+
+
+def _anthropic_prompt(payload):
+    # Cacheable prefixes end at block boundaries up to the last cache_control breakpoint
+    system_prompt = _text(payload.get("system", ""))
+    texts = []
+    boundaries = []
+    last_breakpoint = 0
+    offset = 0
+    for message in payload["messages"]:
+        if texts:
+            offset += 2
+        content = message["content"]
+        blocks = [{"text": content}] if isinstance(content, str) else content
+        for block in blocks:
+            offset += len(block.get("text", ""))
+            boundaries.append(offset)
+            if block.get("cache_control"):
+                last_breakpoint = len(boundaries)
+        texts.append(_text(content))
+    return "\n\n".join(texts), system_prompt, boundaries[:last_breakpoint]
+
+
+async def _start_stream(mock: MockLLM, prompt, system_prompt, max_tokens, boundaries):
+    # Pull the first chunk before answering, so injected errors still get an HTTP status
+    chunks = mock.stream(prompt, system_prompt, max_tokens, boundaries)
+    first = await chunks.__anext__()
+    return first, chunks
+
+
+async def _sse_response(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+    await response.prepare(request)
+    return response
+
+
+async def _send(response: web.StreamResponse, data, event: str = None):
+    prefix = f"event: {event}\n" if event else ""
+    body = data if isinstance(data, str) else json.dumps(data)
+    await response.write(f"{prefix}data: {body}\n\n".encode("utf-8"))
+
+
+def _anthropic_message(payload, completion):
+    return {
+        "id": f"msg_{uuid.uuid4().hex}",
+        "type": "message",
+        "role": "assistant",
+        "model": payload.get("model", "mock"),
+        "content": [{"type": "text", "text": completion.text}],
+        "stop_reason": "end_turn",
+        "usage": {
+            "input_tokens": completion.prompt_tokens - completion.cached_tokens,
+            "cache_read_input_tokens": completion.cached_tokens,
+            "output_tokens": completion.completion_tokens
+        }
+    }
+
+
+def create_app(mock: MockLLM) -> web.Application:
+    # Message Batches jobs: id -> {"status": ..., "results": [...]}
+    batches = {}
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        payload = await request.json()
+        prompt, system_prompt, boundaries = _openai_prompt(payload["messages"])
+        if payload.get("stream"):
+            return await stream_chat_completions(request, payload, prompt, system_prompt, boundaries)
+        try:
+            completion = await mock.generate(prompt, system_prompt, payload.get("max_tokens", 1000), boundaries)
+        except MockLLMError as e:
+            return web.json_response({"error": {"message": str(e), "type": "mock_error"}}, status=e.status)
+
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion.text},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": completion.prompt_tokens,
+                "completion_tokens": completion.completion_tokens,
+                "total_tokens": completion.prompt_tokens + completion.completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": completion.cached_tokens}
+            }
+        })
+
+    async def stream_chat_completions(request, payload, prompt, system_prompt, boundaries):
+        try:
+            first, chunks = await _start_stream(mock, prompt, system_prompt, payload.get("max_tokens", 1000), boundaries)
+        except MockLLMError as e:
+            return web.json_response({"error": {"message": str(e), "type": "mock_error"}}, status=e.status)
+
+        response = await _sse_response(request)
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": payload.get("model", "mock")}
+        item = first
+        while isinstance(item, str):
+            await _send(response, {**base, "choices": [{"index": 0, "delta": {"content": item}, "finish_reason": None}]})
+            item = await chunks.__anext__()
+        await _send(response, {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            await _send(response, {**base, "choices": [], "usage": {
+                "prompt_tokens": item.prompt_tokens,
+                "completion_tokens": item.completion_tokens,
+                "total_tokens": item.prompt_tokens + item.completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": item.cached_tokens}
+            }})
+        await _send(response, "[DONE]")
+        return response
+
+    async def messages(request: web.Request) -> web.Response:
+        payload = await request.json()
+        prompt, system_prompt, boundaries = _anthropic_prompt(payload)
+        if payload.get("stream"):
+            return await stream_messages(request, payload, prompt, system_prompt, boundaries)
+        try:
+            completion = await mock.generate(prompt, system_prompt, payload.get("max_tokens", 1000), boundaries)
+        except MockLLMError as e:
+            return web.json_response(
+                {"type": "error", "error": {"type": "api_error", "message": str(e)}}, status=e.status
+            )
+
+        return web.json_response(_anthropic_message(payload, completion))
+
+    async def stream_messages(request, payload, prompt, system_prompt, boundaries):
+        try:
+            first, chunks = await _start_stream(mock, prompt, system_prompt, payload.get("max_tokens", 1000), boundaries)
+        except MockLLMError as e:
+            return web.json_response(
+                {"type": "error", "error": {"type": "api_error", "message": str(e)}}, status=e.status
+            )
+
+        response = await _sse_response(request)
+        # Usage is only known at the end here; real servers send input usage in message_start
+        await _send(response, {"type": "message_start", "message": {
+            "id": f"msg_{uuid.uuid4().hex}", "type": "message", "role": "assistant",
+            "model": payload.get("model", "mock"), "content": [], "usage": {}
+        }}, "message_start")
+        await _send(response, {"type": "content_block_start", "index": 0,
+                               "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        item = first
+        while isinstance(item, str):
+            await _send(response, {"type": "content_block_delta", "index": 0,
+                                   "delta": {"type": "text_delta", "text": item}}, "content_block_delta")
+            item = await chunks.__anext__()
+        await _send(response, {"type": "content_block_stop", "index": 0}, "content_block_stop")
+        await _send(response, {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {
+            "input_tokens": item.prompt_tokens - item.cached_tokens,
+            "cache_read_input_tokens": item.cached_tokens,
+            "output_tokens": item.completion_tokens
+        }}, "message_delta")
+        await _send(response, {"type": "message_stop"}, "message_stop")
+        return response
+
+    async def run_batch(batch_id, requests):
+        async def run_one(entry):
+            params = entry["params"]
+            prompt, system_prompt, boundaries = _anthropic_prompt(params)
+            try:
+                completion = await mock.generate(prompt, system_prompt, params.get("max_tokens", 1000), boundaries)
+                result = {"type": "succeeded", "message": _anthropic_message(params, completion)}
+            except MockLLMError as e:
+                result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": str(e)}}}
+            return {"custom_id": entry["custom_id"], "result": result}
+
+        batches[batch_id]["results"] = await asyncio.gather(*(run_one(entry) for entry in requests))
+        batches[batch_id]["status"] = "ended"
+
+    def batch_status(request, batch_id):
+        status = batches[batch_id]["status"]
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": status,
+            "results_url": f"{request.scheme}://{request.host}/v1/messages/batches/{batch_id}/results" if status == "ended" else None
+        }
+
+    async def create_batch(request: web.Request) -> web.Response:
+        payload = await request.json()
+        batch_id = f"msgbatch_{uuid.uuid4().hex}"
+        batches[batch_id] = {"status": "in_progress", "results": []}
+        asyncio.create_task(run_batch(batch_id, payload["requests"]))
+        return web.json_response(batch_status(request, batch_id))
+
+    async def get_batch(request: web.Request) -> web.Response:
+        batch_id = request.match_info["batch_id"]
+        if batch_id not in batches:
+            return web.json_response({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+        return web.json_response(batch_status(request, batch_id))
+
+    async def batch_results(request: web.Request) -> web.Response:
+        batch = batches.get(request.match_info["batch_id"])
+        if batch is None or batch["status"] != "ended":
+            return web.json_response({"type": "error", "error": {"type": "not_found_error"}}, status=404)
+        return web.Response(text="\n".join(json.dumps(line) for line in batch["results"]),
+                            content_type="application/x-jsonl")
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_post("/v1/messages", messages)
+    app.router.add_post("/v1/messages/batches", create_batch)
+    app.router.add_get("/v1/messages/batches/{batch_id}", get_batch)
+    app.router.add_get("/v1/messages/batches/{batch_id}/results", batch_results)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI/Anthropic-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-distribution", default="lognormal",
+                        choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=150)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0,
+                        help="Model prompt prefill time for uncached tokens (0 disables)")
+    args = parser.parse_args()
+
+    mock = MockLLM(
+        seed=args.seed,
+        latency_distribution=args.latency_distribution,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        prefill_tokens_per_second=args.prefill_tokens_per_second
+    )
+    web.run_app(create_app(mock), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+API throughput by worker process count
+
+Starts ``main.py --mode api --workers N`` for each N with every agent and the
+web search on zero-latency mocks and no turn delay, so the server's own CPU
+work (prompt assembly, JSON, SSE) is the bottleneck, then drives it with the
+load generator and reports debates/hour per worker count. Workers share one
+SQLite store (a temporary file unless ``--store`` is given):
+
+    python benchmarks/worker_scaling.py --workers 1 2 4 --concurrency 32 --debates 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import aiohttp
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_test import run_load  # noqa: E402
+
+MOCK_OPTIONS = {"latency_distribution": "fixed", "latency_ms": 0, "latency_jitter_ms": 0, "tokens_per_second": 0}
+
+
+def write_config(path: Path, max_turns: int):
+    with open(ROOT / "config" / "config.yaml") as f:
+        config = yaml.safe_load(f) or {}
+    for role in ("pro", "con", "judge"):
+        config.setdefault("agents", {}).setdefault(role, {}).update(
+            provider="mock", model="mock-1", options=dict(MOCK_OPTIONS))
+    config.setdefault("debate", {}).update(max_turns=max_turns, turn_delay=0)
+    config["tools"] = {"web_search": {"provider": "mock", "max_results": 5,
+                                      "mock": {"latency_distribution": "fixed", "latency_ms": 0}}}
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+
+
+async def wait_ready(url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"API server at {url} did not start")
+
+
+def run_workers(args, workers: int, config_path: Path, store_path: str) -> Dict[str, Any]:
+    url = f"http://127.0.0.1:{args.port}"
+    env = {**os.environ, "DEBATE_STORE": store_path}
+    server = subprocess.Popen(
+        [sys.executable, "main.py", "--mode", "api", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(workers), "--config", str(config_path)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_ready(url, 30))
+        load_args = argparse.Namespace(
+            url=url, endpoint=args.endpoint, concurrency=args.concurrency, debates=args.debates,
+            max_turns=args.max_turns, topic="Scaling topic", topics=args.debates, provider="", model="",
+            search_provider="", priority=None, tenant=None, viewers=0, timeout=600.0
+        )
+        report = asyncio.run(run_load(load_args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {"workers": workers, **{k: report[k] for k in ("succeeded", "failed", "elapsed_s", "debates_per_hour",
+                                                           "latency_s")}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgenticDebate API worker scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--endpoint", choices=["debate", "stream"], default="stream")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--debates", type=int, default=200)
+    parser.add_argument("--max-turns", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--store", help="Shared store path (default: a temporary file)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        write_config(config_path, args.max_turns)
+        for workers in args.workers:
+            results.append(run_workers(args, workers, config_path, args.store or str(Path(tmp) / f"store-{workers}.db")))
+
+    report = {"cpu_count": os.cpu_count(), "endpoint": args.endpoint, "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
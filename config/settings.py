@@ -5,7 +5,7 @@ Configuration management for AgenticDebate
 import os
 import yaml
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
 from dotenv import load_dotenv
@@ -15,11 +15,72 @@ class AgentConfig(BaseModel):
     provider: str = "google"
     temperature: float = 0.7
     max_tokens: int = 1000
+    base_url: Optional[str] = None  # Override the provider endpoint, e.g. "http://localhost:9000/v1"
+    options: Dict[str, Any] = {}  # Provider-specific options (e.g. mock latency/seed)
+    prompt_cache: bool = True  # Mark the stable prompt prefix for provider-side caching
+    prompt_cache_ttl: Optional[int] = None  # Seconds; enables Gemini explicit context caching
+    max_retries: int = 2  # Retries on throttling, 5xx and connection errors (exponential backoff)
+    request_timeout: float = 120.0  # Seconds per HTTP request
+    batch_window_ms: float = 0.0  # Collect non-streaming calls this long and send them as one batch (0 = off)
+    batch_max_size: int = 16  # Flush a batch early once it holds this many calls
+    batch_api: bool = False  # Send batches through the provider's asynchronous batch API (Anthropic)
+
+class ProviderConfig(BaseModel):
+    """A named OpenAI-compatible endpoint (vLLM, llama.cpp server, Ollama, ...)"""
+    base_url: str
+    api_key_env: Optional[str] = None  # Environment variable holding the API key, if any
+    headers: Dict[str, str] = {}
+
+class ConvergenceConfig(BaseModel):
+    policy: str = "off"  # off, repetition, stale, either, both (orchestrator/convergence.py)
+    min_turns: int = 4  # Turns taken before the debate may end early
+    patience: int = 2  # Consecutive converged turns that end the debate
+    similarity_threshold: float = 0.5  # MinHash similarity to the speaker's previous turn that counts as repetition
+    novelty_threshold: float = 0.3  # Share of new shingles below which a turn adds no new claims
+    shingle_size: int = 3  # Words per shingle
+    num_perm: int = 64  # MinHash permutations
+
+class ClaimIndexConfig(BaseModel):
+    enabled: bool = True  # Index the debate's claims (sentences) and report redundancy
+    collapse_context: bool = True  # Collapse repeated claims in the turns agents see
+    collapse_judge: bool = True  # Collapse repeated claims in the judge transcript
+    similarity_threshold: float = 0.7  # Estimated Jaccard similarity at which two sentences are one claim
+    min_words: int = 6  # Shorter sentences are kept as they are
+    shingle_size: int = 2  # Words per shingle
+    num_perm: int = 64  # MinHash permutations
+    bands: int = 16  # LSH bands (num_perm / bands rows each)
+
+class RetrievalConfig(BaseModel):
+    enabled: bool = True  # Give each turn the research chunks relevant to it instead of all research
+    top_k: int = 3  # Chunks per turn
+    chunk_words: int = 80  # Longer research paragraphs are split into windows of about this many words
+    k1: float = 1.5  # BM25 term frequency saturation
+    b: float = 0.75  # BM25 length normalization
 
 class DebateConfig(BaseModel):
     max_turns: int = 10
     max_time: int = 1800  # 30 minutes
     turn_timeout: int = 120  # 2 minutes per turn
+    turn_delay: float = 0.5  # Seconds between turns (pacing for live viewers; 0 for batch runs)
+    format: str = "sequential"  # Built-in format (orchestrator/formats.py) or a name from ``formats``
+    priority: str = "interactive"  # LLM scheduling class: interactive, batch, background
+    tenant: str = "default"  # Fair-queuing key for LLM calls (API server: request tenant or API key)
+    convergence: ConvergenceConfig = ConvergenceConfig()  # Early end of the debate phase once turns repeat
+    claims: ClaimIndexConfig = ClaimIndexConfig()  # Near-duplicate claim index (orchestrator/memory_manager.py)
+    retrieval: RetrievalConfig = RetrievalConfig()  # Per-turn research retrieval (utils/retrieval.py)
+
+class TurnSpec(BaseModel):
+    speaker: str  # Seat of the format
+    kind: str = "argument"  # opening, rebuttal, question, answer, closing, or argument (no extra instruction)
+
+class RoundSpec(BaseModel):
+    name: str
+    parallel: bool = False  # Turns run concurrently and see only earlier rounds (a nested list runs in order)
+    turns: List[Union[TurnSpec, List[TurnSpec]]]
+
+class FormatSpec(BaseModel):
+    seats: Dict[str, str]  # Seat -> side (pro/con); seats "pro" and "con" are the configured agents
+    rounds: List[RoundSpec]
 
 class AgentsConfig(BaseModel):
     pro: AgentConfig = AgentConfig()
@@ -33,11 +94,77 @@ class ToolsConfig(BaseModel):
         "timeout": 30
     }
 
+class TracingConfig(BaseModel):
+    enabled: bool = False
+    sample_ratio: float = 0.1  # fraction of debates traced
+    exporter: str = "file"  # Options: file, otlp_http
+    file_path: str = "logs/traces.jsonl"
+    otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    service_name: str = "agentic-debate"
+
+class SchedulerConfig(BaseModel):
+    enabled: bool = True
+    max_concurrency: int = 32  # Concurrent LLM calls per provider
+    provider_concurrency: Dict[str, int] = {}  # Per-provider overrides, e.g. {"groq": 4}
+
+class StreamConfig(BaseModel):
+    replay_buffer: int = 1000  # Events kept per debate for Last-Event-ID resume
+    heartbeat_seconds: float = 15.0  # Comment frame sent after this long without events
+    on_disconnect: str = "cancel"  # When the last client leaves: cancel (after the grace period) or detach
+    resume_grace_seconds: float = 30.0  # Time a client has to reconnect before the debate is cancelled
+    retention_seconds: float = 300.0  # How long finished debates remain available for replay
+
+class StoreConfig(BaseModel):
+    path: Optional[str] = None  # SQLite file shared by API workers (WAL mode); None keeps state in-process
+    search_cache_ttl: float = 0.0  # Seconds web search results are reused (0, the default, disables)
+    research_cache_ttl: float = 0.0  # Seconds research summaries are reused per topic/judge (0, the default, disables)
+    memory_cache_size: int = 1024  # Cache entries kept in-process when no path is set
+    retention_seconds: float = 86400.0  # How long finished debates stay queryable in the store
+    stale_after_seconds: float = 600.0  # A running debate without events for this long is treated as lost
+
+class ArchiveConfig(BaseModel):
+    path: Optional[str] = None  # SQLite file indexing every finished debate for search; None disables archiving
+    search_window: int = 1000  # Searches rank and facet at most this many of the newest matches
+
+class AnalyticsConfig(BaseModel):
+    path: Optional[str] = None  # Directory of column files every finished debate is appended to; None disables export
+
+class QueueConfig(BaseModel):
+    broker: Optional[str] = None  # sqlite:///path or redis://host:port/db; None runs debates in the API process
+    lease_seconds: float = 60.0  # A job whose worker stops renewing for this long is delivered again
+    max_attempts: int = 3  # Deliveries before a job is abandoned and its debate marked failed
+    concurrency: int = 8  # Debates each worker runs at once
+    poll_seconds: float = 0.5  # Idle workers check for jobs this often
+
+# USD per million tokens; longest matching prefix wins for dated model ids.
+# "cached_input" prices prompt tokens served from the provider's prompt cache
+# (defaults to the "input" price when absent).
+DEFAULT_PRICING: Dict[str, Dict[str, float]] = {
+    "gemini-1.5-flash": {"input": 0.075, "cached_input": 0.01875, "output": 0.30},
+    "gemini-1.5-pro": {"input": 1.25, "cached_input": 0.3125, "output": 5.00},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "claude-3-5-sonnet": {"input": 3.00, "cached_input": 0.30, "output": 15.00},
+    "claude-3-5-haiku": {"input": 0.80, "cached_input": 0.08, "output": 4.00},
+    "grok-beta": {"input": 5.00, "output": 15.00},
+    "llama-3.1-70b-versatile": {"input": 0.59, "output": 0.79},
+}
+
 class Config(BaseModel):
 
     debate: DebateConfig = DebateConfig()
     agents: AgentsConfig = AgentsConfig()
     tools: Dict[str, Any] = ToolsConfig().model_dump()
+    tracing: TracingConfig = TracingConfig()
+    scheduler: SchedulerConfig = SchedulerConfig()
+    stream: StreamConfig = StreamConfig()
+    store: StoreConfig = StoreConfig()
+    queue: QueueConfig = QueueConfig()
+    archive: ArchiveConfig = ArchiveConfig()
+    analytics: AnalyticsConfig = AnalyticsConfig()
+    formats: Dict[str, FormatSpec] = {}  # Custom debate formats by name
+    providers: Dict[str, ProviderConfig] = {}  # Extra OpenAI-compatible providers by name
+    pricing: Dict[str, Dict[str, float]] = DEFAULT_PRICING
     api_keys: Dict[str, str] = {}
 
     @classmethod
@@ -63,9 +190,9 @@ def load_config(config_path: Optional[str] = None) -> Config:
     # Load environment variables from .env file
     load_dotenv()
     
-    # Default config path
+    # Default config path (DEBATE_CONFIG lets API workers share a non-default file)
     if not config_path:
-        config_path = Path(__file__).parent / "config.yaml"
+        config_path = os.getenv("DEBATE_CONFIG") or Path(__file__).parent / "config.yaml"
 
     config_data = {}
 
@@ -99,6 +226,22 @@ def load_config(config_path: Optional[str] = None) -> Config:
     if api_keys:
         config_data["api_keys"] = {**config_data.get("api_keys", {}), **api_keys}
     
+    # Shared store path (set for every worker by ``--workers``)
+    if os.getenv("DEBATE_STORE"):
+        config_data["store"] = {**(config_data.get("store") or {}), "path": os.getenv("DEBATE_STORE")}
+    
+    # Job broker (set by ``--broker``)
+    if os.getenv("DEBATE_BROKER"):
+        config_data["queue"] = {**(config_data.get("queue") or {}), "broker": os.getenv("DEBATE_BROKER")}
+    
+    # Debate archive (set by ``--archive``)
+    if os.getenv("DEBATE_ARCHIVE"):
+        config_data["archive"] = {**(config_data.get("archive") or {}), "path": os.getenv("DEBATE_ARCHIVE")}
+    
+    # Analytics export (set by ``--analytics``)
+    if os.getenv("DEBATE_ANALYTICS"):
+        config_data["analytics"] = {**(config_data.get("analytics") or {}), "path": os.getenv("DEBATE_ANALYTICS")}
+    
     return Config(**config_data)
 
 def save_config(config: Config, config_path: str):
@@ -6,27 +6,79 @@ Entry point for the debate system
 
 import asyncio
 import argparse
+import hashlib
 import json
+import os
+import signal
+import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
 from orchestrator.debate_loop import DebateOrchestrator
+from orchestrator.convergence import POLICIES, check_policy
+from orchestrator.formats import format_names, plan_for
+from orchestrator.events import encode_result
+from orchestrator.live import DISCONNECT_POLICIES, STORE_POLL_INTERVAL, follow_stored, live_debates
+from orchestrator.worker import DebateWorker, job_payload
 from config.settings import load_config, Config
 from utils.logger import setup_logger
+from utils.timing import timing_registry
+from utils.metrics import registry as metrics_registry, SSE_CLIENTS, SSE_RESUMES, record_error
+from utils.tracing import configure_tracing, tracer
+from utils.llm_providers import close_sessions
+from utils.local_llm import shutdown_engines
+from utils.llm_scheduler import configure_scheduler, PRIORITIES, DEFAULT_TENANT
+from utils.shared_store import QUEUED, RUNNING, close_store, configure_store, get_store
+from utils.job_broker import close_broker, configure_broker, get_broker
+from utils.debate_archive import ArchiveQuery, close_archive, configure_archive, get_archive
+from utils.debate_analytics import EXPORT_FORMATS, close_analytics, configure_analytics, export_tables, report
+from utils.fast_json import dumps_object
 
 logger = setup_logger(__name__)
 
+# Reconnection delay (ms) suggested to EventSource clients
+SSE_RETRY_FRAME = b"retry: 3000\n\n"
+
+# Shared store used by ``--workers`` when the config sets no store.path
+DEFAULT_STORE_PATH = "data/debate_store.db"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Configure process-wide observability, LLM scheduling, shared state and the job broker from the default
+    config; on shutdown cancel streamed debates, flush trace spans, close provider connections, stop local
+    models, the store, archive, analytics export and broker"""
+    config = load_config()
+    configure_tracing(config.tracing)
+    configure_scheduler(config.scheduler)
+    configure_store(config.store)
+    configure_archive(config.archive)
+    configure_analytics(config.analytics)
+    await configure_broker(config.queue, config.store.retention_seconds)
+    try:
+        yield
+    finally:
+        live_debates.shutdown()
+        tracer.flush()
+        await close_sessions()
+        shutdown_engines()
+        await close_broker()
+        close_store()
+        close_archive()
+        close_analytics()
+
 # FastAPI app
 app = FastAPI(
     title="AgenticDebate",
     description="Multi-Agent Debate Orchestration System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -36,12 +88,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Debate-Id"],
 )
 
 class DebateRequest(BaseModel):
     topic: str
     max_turns: Optional[int] = None
     max_time: Optional[int] = None
+    format: Optional[str] = None  # Debate format, e.g. sequential, simultaneous, oxford, panel
+    early_stop: Optional[str] = None  # Convergence policy: off, repetition, stale, either, both
     
     # Pro agent configuration
     pro_model: Optional[str] = None
@@ -66,6 +121,26 @@ class DebateRequest(BaseModel):
     
     # API keys
     api_keys: Optional[dict] = None
+    
+    # LLM scheduling: priority class (interactive, batch, background) and fair-queuing tenant
+    priority: Optional[str] = None
+    tenant: Optional[str] = None
+    
+    # Streaming: what happens when the last client disconnects (cancel, detach)
+    on_disconnect: Optional[str] = None
+
+def _tenant(request: DebateRequest) -> str:
+    """Fair-queuing key: the explicit tenant, else a hash of the caller's API keys"""
+    if request.tenant:
+        return request.tenant
+    if request.api_keys:
+        keys = "\x1f".join(str(request.api_keys[name]) for name in sorted(request.api_keys))
+        return "key:" + hashlib.sha256(keys.encode("utf-8")).hexdigest()[:12]
+    return DEFAULT_TENANT
+
+def _check_priority(request: DebateRequest):
+    if request.priority and request.priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of: {', '.join(PRIORITIES)}")
 
 class DebateResponse(BaseModel):
     topic: str
@@ -75,139 +150,263 @@ class DebateResponse(BaseModel):
     transcript: list
     metadata: dict
 
+def _debate_config(request: DebateRequest) -> Config:
+    """Default config with the request's overrides applied"""
+    config = load_config()
+    
+    # Override config with request parameters
+    if request.max_turns:
+        config.debate.max_turns = request.max_turns
+    if request.max_time:
+        config.debate.max_time = request.max_time
+    if request.format:
+        config.debate.format = request.format
+    if request.early_stop:
+        config.debate.convergence.policy = request.early_stop
+    
+    # Update pro agent configuration
+    if request.pro_model:
+        config.agents.pro.model = request.pro_model
+    if request.pro_provider:
+        config.agents.pro.provider = request.pro_provider
+    if request.pro_temperature is not None:
+        config.agents.pro.temperature = request.pro_temperature
+    if request.pro_max_tokens:
+        config.agents.pro.max_tokens = request.pro_max_tokens
+    
+    # Update con agent configuration
+    if request.con_model:
+        config.agents.con.model = request.con_model
+    if request.con_provider:
+        config.agents.con.provider = request.con_provider
+    if request.con_temperature is not None:
+        config.agents.con.temperature = request.con_temperature
+    if request.con_max_tokens:
+        config.agents.con.max_tokens = request.con_max_tokens
+    
+    # Update judge agent configuration
+    if request.judge_model:
+        config.agents.judge.model = request.judge_model
+    if request.judge_provider:
+        config.agents.judge.provider = request.judge_provider
+    if request.judge_temperature is not None:
+        config.agents.judge.temperature = request.judge_temperature
+    if request.judge_max_tokens:
+        config.agents.judge.max_tokens = request.judge_max_tokens
+    
+    # Update tools configuration
+    if request.tools:
+        config.tools = request.tools
+    
+    # Update API keys from request
+    if request.api_keys:
+        config.api_keys.update(request.api_keys)
+    
+    # LLM scheduling class and tenant
+    if request.priority:
+        config.debate.priority = request.priority
+    config.debate.tenant = _tenant(request)
+    
+    return config
+
+def _request_config(request: DebateRequest) -> Config:
+    """The request's config; 400 for an unknown priority class, debate format or convergence policy"""
+    _check_priority(request)
+    config = _debate_config(request)
+    try:
+        plan_for(config)
+        check_policy(config.debate.convergence.policy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return config
+
+def _debate_log():
+    """Where debates not running in this process are read from: the job broker, else the shared store"""
+    broker = get_broker()
+    return broker if broker is not None else get_store()
+
+async def _enqueue(request: DebateRequest, config: Config) -> str:
+    debate_id = uuid.uuid4().hex
+    await get_broker().enqueue(debate_id, request.topic, job_payload(request.topic, config, request.api_keys))
+    return debate_id
+
+async def _queued_result(debate_id: str) -> Response:
+    """Wait for a debate run by a broker worker and return its result"""
+    broker = get_broker()
+    while True:
+        found = await broker.get_debate(debate_id)
+        if found is None:
+            raise HTTPException(status_code=500, detail="Debate expired before it finished")
+        record, result = found
+        if record["status"] == "completed":
+            return Response(content=result, media_type="application/json")
+        if record["status"] not in (QUEUED, RUNNING):
+            raise HTTPException(status_code=500, detail=f"Debate {record['status']}")
+        await asyncio.sleep(STORE_POLL_INTERVAL)
+
 @app.post("/debate", response_model=DebateResponse)
 async def start_debate(request: DebateRequest):
-    """Start a new debate session"""
+    """Start a new debate session (on a worker when a job broker is configured)"""
+    config = _request_config(request)
+    if get_broker() is not None:
+        try:
+            debate_id = await _enqueue(request, config)
+        except Exception as e:
+            logger.error(f"Enqueueing debate failed: {str(e)}")
+            record_error("api", e)
+            raise HTTPException(status_code=500, detail=str(e))
+        return await _queued_result(debate_id)
     try:
-        config = load_config()
-        
-        # Override config with request parameters
-        if request.max_turns:
-            config.debate.max_turns = request.max_turns
-        if request.max_time:
-            config.debate.max_time = request.max_time
-        
-        # Update pro agent configuration
-        if request.pro_model:
-            config.agents.pro.model = request.pro_model
-        if request.pro_provider:
-            config.agents.pro.provider = request.pro_provider
-        if request.pro_temperature is not None:
-            config.agents.pro.temperature = request.pro_temperature
-        if request.pro_max_tokens:
-            config.agents.pro.max_tokens = request.pro_max_tokens
-        
-        # Update con agent configuration
-        if request.con_model:
-            config.agents.con.model = request.con_model
-        if request.con_provider:
-            config.agents.con.provider = request.con_provider
-        if request.con_temperature is not None:
-            config.agents.con.temperature = request.con_temperature
-        if request.con_max_tokens:
-            config.agents.con.max_tokens = request.con_max_tokens
-        
-        # Update judge agent configuration
-        if request.judge_model:
-            config.agents.judge.model = request.judge_model
-        if request.judge_provider:
-            config.agents.judge.provider = request.judge_provider
-        if request.judge_temperature is not None:
-            config.agents.judge.temperature = request.judge_temperature
-        if request.judge_max_tokens:
-            config.agents.judge.max_tokens = request.judge_max_tokens
-        
-        # Update tools configuration
-        if request.tools:
-            config.tools = request.tools
-        
-        # Update API keys from request
-        if request.api_keys:
-            config.api_keys.update(request.api_keys)
-        
         orchestrator = DebateOrchestrator(config)
         result = await orchestrator.run_debate(request.topic)
         
-        return DebateResponse(**result)
+        # DebateResponse documents the schema; the result is encoded directly (each transcript
+        # message once) instead of being re-validated and re-serialized by pydantic
+        return Response(content=encode_result(result), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Debate failed: {str(e)}")
+        record_error("api", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/debate/stream")
-async def stream_debate(request: DebateRequest):
-    """Start a new debate session with real-time streaming"""
+def _event_stream(debate_id: str, frames: AsyncIterator[bytes]) -> StreamingResponse:
+    """SSE response for a debate's encoded frames"""
+    
     async def generate():
+        SSE_CLIENTS.inc()
         try:
-            config = load_config()
-            
-            # Override config with request parameters
-            if request.max_turns:
-                config.debate.max_turns = request.max_turns
-            if request.max_time:
-                config.debate.max_time = request.max_time
-            
-            # Update pro agent configuration
-            if request.pro_model:
-                config.agents.pro.model = request.pro_model
-            if request.pro_provider:
-                config.agents.pro.provider = request.pro_provider
-            if request.pro_temperature is not None:
-                config.agents.pro.temperature = request.pro_temperature
-            if request.pro_max_tokens:
-                config.agents.pro.max_tokens = request.pro_max_tokens
-            
-            # Update con agent configuration
-            if request.con_model:
-                config.agents.con.model = request.con_model
-            if request.con_provider:
-                config.agents.con.provider = request.con_provider
-            if request.con_temperature is not None:
-                config.agents.con.temperature = request.con_temperature
-            if request.con_max_tokens:
-                config.agents.con.max_tokens = request.con_max_tokens
-            
-            # Update judge agent configuration
-            if request.judge_model:
-                config.agents.judge.model = request.judge_model
-            if request.judge_provider:
-                config.agents.judge.provider = request.judge_provider
-            if request.judge_temperature is not None:
-                config.agents.judge.temperature = request.judge_temperature
-            if request.judge_max_tokens:
-                config.agents.judge.max_tokens = request.judge_max_tokens
-            
-            # Update tools configuration
-            if request.tools:
-                config.tools = request.tools
-            
-            # Update API keys from request
-            if request.api_keys:
-                config.api_keys.update(request.api_keys)
-            
-            orchestrator = DebateOrchestrator(config)
-            
-            # Stream the debate with real-time updates
-            async for update in orchestrator.stream_debate(request.topic):
-                yield f"data: {json.dumps(update)}\n\n"
-            
-        except Exception as e:
-            logger.error(f"Streaming debate failed: {str(e)}")
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+            yield SSE_RETRY_FRAME
+            async for chunk in frames:
+                yield chunk
+        finally:
+            SSE_CLIENTS.dec()
+    
+    headers = {"X-Debate-Id": debate_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=headers)
+
+@app.post("/debate/stream")
+async def stream_debate(request: DebateRequest):
+    """Start a new debate session with real-time streaming
+    
+    The debate runs in the background; reconnect with ``GET /debate/stream/{debate_id}``
+    and ``Last-Event-ID`` to resume (the id is in the first event and the X-Debate-Id header).
+    With a job broker the debate is queued for a worker and always runs to completion.
+    """
+    if request.on_disconnect and request.on_disconnect not in DISCONNECT_POLICIES:
+        raise HTTPException(status_code=400, detail=f"on_disconnect must be one of: {', '.join(DISCONNECT_POLICIES)}")
+    config = _request_config(request)
+    try:
+        if get_broker() is not None:
+            debate_id = await _enqueue(request, config)
+            return _event_stream(debate_id, follow_stored(get_broker(), debate_id, 0, config.stream,
+                                                          config.store.stale_after_seconds))
+        session = live_debates.start(DebateOrchestrator(config), request.topic, config.stream, request.on_disconnect)
+    except Exception as e:
+        logger.error(f"Streaming debate failed: {str(e)}")
+        record_error("api", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return _event_stream(session.debate_id, session.frames(0))
+
+@app.get("/debates")
+async def list_debates():
+    """Running and recently finished streamed debates (of every worker, with a shared store or broker)"""
+    store = _debate_log()
+    if store is not None:
+        return {"debates": await store.list_debates()}
+    return {"debates": [session.summary() for session in live_debates.list()]}
+
+@app.get("/debates/search")
+async def search_debates(q: str = "", winner: Optional[str] = None, format: Optional[str] = None,
+                         model: Optional[str] = None, provider: Optional[str] = None,
+                         min_duration: Optional[float] = None, max_duration: Optional[float] = None,
+                         min_pro_score: Optional[float] = None, min_con_score: Optional[float] = None,
+                         since: Optional[float] = None, until: Optional[float] = None,
+                         limit: int = 20, offset: int = 0, facets: bool = True):
+    """Full-text and faceted search over archived debates (``archive.path``)"""
+    archive = get_archive()
+    if archive is None:
+        raise HTTPException(status_code=503, detail="Debate archive is not configured (archive.path)")
+    query = ArchiveQuery(q, winner, format, model, provider, min_duration, max_duration, min_pro_score,
+                         min_con_score, since, until, min(max(limit, 0), 100), max(offset, 0), facets)
+    return await archive.search(query)
+
+@app.get("/debates/archived/{archive_id}")
+async def archived_debate(archive_id: str):
+    """Result of an archived debate"""
+    archive = get_archive()
+    result = await archive.get(archive_id) if archive is not None else None
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown archived debate")
+    return Response(content=result, media_type="application/json")
+
+@app.get("/debates/{debate_id}")
+async def debate_status(debate_id: str):
+    """Status of a streamed debate, with its result once complete"""
+    session = live_debates.get(debate_id)
+    if session is not None:
+        summary, result = session.summary(), session.result
+    else:
+        store = _debate_log()
+        found = await store.get_debate(debate_id) if store is not None else None
+        if found is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired debate")
+        summary, result = found
+    return Response(content=dumps_object({**summary, "result": None}, {"result": result or b"null"}),
+                    media_type="application/json")
+
+@app.get("/debates/{debate_id}/events")
+@app.get("/debate/stream/{debate_id}")
+async def debate_events(debate_id: str,
+                        last_event_id: Optional[str] = Header(None),
+                        from_id: Optional[int] = None):
+    """Subscribe to a streamed debate: replay after ``Last-Event-ID`` (or ``from_id``), then follow it live
     
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    Any number of viewers can subscribe; they share the debate's encoded events. Debates
+    running on another worker are followed through the shared store or job broker.
+    """
+    try:
+        cursor = int(last_event_id) if last_event_id else (from_id or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+    
+    session = live_debates.get(debate_id)
+    if session is not None:
+        frames = session.frames(cursor)
+    else:
+        store = _debate_log()
+        if store is None or await store.get_debate(debate_id) is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired debate")
+        config = load_config()
+        frames = follow_stored(store, debate_id, cursor, config.stream, config.store.stale_after_seconds)
+    if cursor:
+        SSE_RESUMES.inc()
+    return _event_stream(debate_id, frames)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "debate-mirror-mcp"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for debates, LLM calls, search, caches and serving"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/timing")
+async def timing_metrics():
+    """Aggregated phase, turn and segment timings (milliseconds) since startup"""
+    return timing_registry.snapshot()
+
 async def cli_mode():
     """Command line interface mode"""
     parser = argparse.ArgumentParser(description="AgenticDebate CLI")
     parser.add_argument("topic", help="Debate topic")
     parser.add_argument("--max-turns", type=int, help="Maximum number of turns")
     parser.add_argument("--max-time", type=int, help="Maximum time in seconds")
+    parser.add_argument("--format", help=f"Debate format: {', '.join(format_names())} or one from the config")
+    parser.add_argument("--early-stop", choices=POLICIES,
+                        help="End the debate early once turns repeat (convergence policy)")
     parser.add_argument("--config", help="Config file path")
     parser.add_argument("--output", help="Output file for results")
     
@@ -221,9 +420,25 @@ async def cli_mode():
             config.debate.max_turns = args.max_turns
         if args.max_time:
             config.debate.max_time = args.max_time
+        if args.format:
+            config.debate.format = args.format
+        if args.early_stop:
+            config.debate.convergence.policy = args.early_stop
+        
+        configure_tracing(config.tracing)
+        configure_scheduler(config.scheduler)
+        configure_store(config.store)
+        configure_archive(config.archive)
+        configure_analytics(config.analytics)
         
         orchestrator = DebateOrchestrator(config)
         result = await orchestrator.run_debate(args.topic)
+        tracer.flush()
+        await close_sessions()
+        shutdown_engines()
+        close_store()
+        close_archive()
+        close_analytics()
         
         # Print results
         print(f"\n{'='*60}")
@@ -244,24 +459,202 @@ async def cli_mode():
         logger.error(f"CLI execution failed: {str(e)}")
         print(f"Error: {str(e)}")
 
+async def worker_mode(config_path: Optional[str] = None):
+    """Run debates from the job broker until interrupted"""
+    config = load_config(config_path)
+    configure_tracing(config.tracing)
+    configure_scheduler(config.scheduler)
+    configure_store(config.store)
+    configure_archive(config.archive)
+    configure_analytics(config.analytics)
+    broker = await configure_broker(config.queue, config.store.retention_seconds)
+    if broker is None:
+        print("Error: worker mode needs a job broker (queue.broker in the config, or --broker)")
+        close_archive()
+        close_analytics()
+        return
+    
+    worker = DebateWorker(broker, config.queue)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        tracer.flush()
+        await close_sessions()
+        shutdown_engines()
+        await close_broker()
+        close_store()
+        close_archive()
+        close_analytics()
+
+def _import_results(target, paths) -> int:
+    """Add saved debate results (``--output`` files, API responses; JSON, or JSON lines) to the archive or analytics"""
+    added = 0
+    for path in paths:
+        text = Path(path).read_text()
+        try:
+            results = [json.loads(text)]
+        except json.JSONDecodeError:
+            results = [json.loads(line) for line in text.splitlines() if line.strip()]
+        batch = [(result, encode_result(result)) for result in results
+                 if isinstance(result, dict) and "transcript" in result]
+        added += target.add_many(batch)
+    return added
+
+async def search_mode():
+    """Query the debate archive, or add saved results to it"""
+    parser = argparse.ArgumentParser(description="AgenticDebate archive search")
+    parser.add_argument("query", nargs="*", help="Words to find in topics and transcripts (all must match)")
+    parser.add_argument("--winner", help="PRO, CON or TIE")
+    parser.add_argument("--format", help="Debate format")
+    parser.add_argument("--model", help="Model of any seat")
+    parser.add_argument("--provider", help="Provider of any seat")
+    parser.add_argument("--min-duration", type=float, help="Minimum duration in seconds")
+    parser.add_argument("--max-duration", type=float, help="Maximum duration in seconds")
+    parser.add_argument("--limit", type=int, default=10, help="Results to show")
+    parser.add_argument("--json", action="store_true", help="Print the full search response as JSON")
+    parser.add_argument("--import", dest="imports", nargs="+", metavar="FILE",
+                        help="Add saved debate results to the archive instead of searching")
+    parser.add_argument("--config", help="Config file path")
+    args = parser.parse_args()
+    
+    config = load_config(args.config)
+    archive = configure_archive(config.archive)
+    if archive is None:
+        print("Error: search mode needs a debate archive (archive.path in the config, or --archive)")
+        return
+    try:
+        if args.imports:
+            added = _import_results(archive, args.imports)
+            print(f"Archived {added} new debates ({await archive.count()} in {config.archive.path})")
+            return
+        
+        response = await archive.search(ArchiveQuery(
+            " ".join(args.query), args.winner, args.format, args.model, args.provider,
+            args.min_duration, args.max_duration, limit=args.limit))
+        if args.json:
+            print(json.dumps(response, indent=2))
+            return
+        window = f", best of the newest {response['window']}" if response["sampled"] else ""
+        print(f"{response['total']} debates ({response['took_ms']} ms{window})")
+        for entry in response["results"]:
+            duration = f"{entry['duration']:.0f}s" if entry["duration"] is not None else "-"
+            print(f"\n{entry['archive_id']}  {entry['winner'] or '-'}  {entry['pro_score']}-{entry['con_score']}  "
+                  f"{duration}  {entry['pro_model']} vs {entry['con_model']}")
+            print(f"  {entry['topic']}")
+            if entry.get("snippet"):
+                print(f"  {entry['snippet']}")
+        for name, counts in response["facets"].items():
+            if counts:
+                print(f"\n{name}: " + ", ".join(f"{value} ({count})" for value, count in list(counts.items())[:8]))
+    finally:
+        close_archive()
+
+def _print_report(response: Dict[str, Any]):
+    print(f"{response['debates']} debates ({response['judged']} judged), {response['turns']} turns "
+          f"[{response['backend']}]")
+    print("\nBy pairing (PRO vs CON): debates, PRO win rate, duration p50/p90/p99 (s)")
+    for entry in response["pairings"]:
+        durations = "/".join(f"{entry[f'p{percentile}_duration_s'] or 0:.0f}" for percentile in (50, 90, 99))
+        print(f"  {entry['pro_model']} vs {entry['con_model']}: {entry['debates']}, "
+              f"{entry['pro_win_rate']:.0%} ({entry['pro_wins']}-{entry['con_wins']}-{entry['ties']}), {durations}")
+    print("\nBy model: Elo, win rate, debates")
+    for entry in response["models"]:
+        elo = f"{entry['elo']:.0f}" if entry["elo"] is not None else "-"
+        print(f"  {entry['model']}: {elo}, {entry['win_rate']:.0%}, {entry['debates']}")
+    print("\nTurn latency by model: turns, p50/p90/p99 (ms), mean completion tokens")
+    for entry in response["turn_latency"]:
+        latencies = "/".join(f"{entry[f'p{percentile}_latency_ms'] or 0:.0f}" for percentile in (50, 90, 99))
+        print(f"  {entry['model']}: {entry['turns']}, {latencies}, {entry['mean_completion_tokens']}")
+
+async def report_mode():
+    """Report win rates, Elo and latency from the analytics tables, add saved results, or export them"""
+    parser = argparse.ArgumentParser(description="AgenticDebate analytics report")
+    parser.add_argument("--import", dest="imports", nargs="+", metavar="FILE",
+                        help="Append saved debate results to the analytics tables first")
+    parser.add_argument("--export", metavar="DIR", help="Write the tables as Parquet or Arrow files (needs pyarrow)")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="parquet", help="Export file format")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--config", help="Config file path")
+    args = parser.parse_args()
+    
+    config = load_config(args.config)
+    analytics = configure_analytics(config.analytics)
+    if analytics is None:
+        print("Error: report mode needs an analytics directory (analytics.path in the config, or --analytics)")
+        return
+    try:
+        if args.imports:
+            added = _import_results(analytics, args.imports)
+            print(f"Exported {added} new debates to {config.analytics.path}")
+        if args.export:
+            for path in export_tables(config.analytics.path, args.export, args.export_format):
+                print(f"Wrote {path}")
+            return
+        response = report(config.analytics.path)
+        if args.json:
+            print(json.dumps(response, indent=2))
+        else:
+            _print_report(response)
+    except RuntimeError as e:
+        print(f"Error: {str(e)}")
+    finally:
+        close_analytics()
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description="AgenticDebate")
-    parser.add_argument("--mode", choices=["api", "cli"], default="cli", 
-                       help="Run mode: api (FastAPI server) or cli (command line)")
+    parser.add_argument("--mode", choices=["api", "cli", "worker", "search", "report"], default="cli", 
+                       help="Run mode: api (FastAPI server), cli (command line), worker (runs queued debates), "
+                            "search (query or import into the debate archive) or report (win rates, Elo and "
+                            "latency from the analytics tables)")
     parser.add_argument("--host", default="0.0.0.0", help="API host")
     parser.add_argument("--port", type=int, default=8000, help="API port")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="API worker processes; they share caches and debate state through the store")
+    parser.add_argument("--config", help="Config file path")
+    parser.add_argument("--broker", help="Job broker URL (sqlite:///path or redis://host:port/db); "
+                                         "the API enqueues debates and workers run them")
+    parser.add_argument("--archive", help="Debate archive file (SQLite); finished debates are indexed for search")
+    parser.add_argument("--analytics", help="Analytics directory; finished debates are appended as column files")
     
     # Parse only known args to allow topic in CLI mode
     args, remaining = parser.parse_known_args()
+    if args.broker:
+        os.environ["DEBATE_BROKER"] = args.broker
+    if args.archive:
+        os.environ["DEBATE_ARCHIVE"] = args.archive
+    if args.analytics:
+        os.environ["DEBATE_ANALYTICS"] = args.analytics
     
-    if args.mode == "api":
+    if args.mode == "worker":
+        print("Starting AgenticDebate worker...")
+        asyncio.run(worker_mode(args.config))
+    elif args.mode == "search":
+        import sys
+        sys.argv = [sys.argv[0]] + remaining + (["--config", args.config] if args.config else [])
+        asyncio.run(search_mode())
+    elif args.mode == "report":
+        import sys
+        sys.argv = [sys.argv[0]] + remaining + (["--config", args.config] if args.config else [])
+        asyncio.run(report_mode())
+    elif args.mode == "api":
         print("Starting AgenticDebate API server...")
-        uvicorn.run(app, host=args.host, port=args.port)
+        if args.config:
+            os.environ["DEBATE_CONFIG"] = args.config
+        if args.workers > 1:
+            # Workers load their config on startup; the environment carries the shared settings
+            os.environ.setdefault("DEBATE_STORE", load_config().store.path or DEFAULT_STORE_PATH)
+            print(f"{args.workers} workers sharing {os.environ['DEBATE_STORE']}")
+            uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+        else:
+            uvicorn.run(app, host=args.host, port=args.port)
     else:
         # Re-parse with remaining args for CLI mode
         import sys
-        sys.argv = [sys.argv[0]] + remaining
+        sys.argv = [sys.argv[0]] + remaining + (["--config", args.config] if args.config else [])
         asyncio.run(cli_mode())
 
 if __name__ == "__main__":
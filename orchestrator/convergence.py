@@ -0,0 +1,140 @@
+"""
+Convergence detection: end the debate phase once turns stop adding anything
+
+After each turn the detector scores two signals from word shingles
+(utils/text_similarity.py), both local and cheap:
+
+- similarity: estimated (MinHash) Jaccard similarity to the same speaker's
+  previous turn; high when a speaker restates their last argument;
+- novelty: share of the turn's shingles said nowhere earlier in the debate;
+  low when a turn brings no new claims.
+
+``debate.convergence.policy`` decides when a turn counts as converged:
+``repetition`` (similarity at or above ``similarity_threshold``), ``stale``
+(novelty below ``novelty_threshold``), ``either`` or ``both``; ``off`` (the
+default) never ends a debate early. Once ``patience`` scored turns in a row
+have converged, and at least ``min_turns`` turns were taken, the orchestrator
+starts no further turns except closing statements, and the reason goes into
+the result's ``metadata.convergence``. Only argument and rebuttal turns are
+scored; openings, cross-examination and closings neither count nor break a
+streak.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+from agents.base_agent import Message
+from config.settings import ConvergenceConfig
+from utils.logger import setup_logger
+from utils.text_similarity import MinHasher, Signature, novelty, shingles
+
+logger = setup_logger(__name__)
+
+POLICIES = ("off", "repetition", "stale", "either", "both")
+
+# Turn kinds whose repetition ends a debate
+SCORED_KINDS = ("argument", "rebuttal")
+
+# What each signal says about the converged turns
+TRIGGERS = {"repetition": "repeated their speaker's previous turn", "stale": "added no new claims"}
+
+
+def check_policy(policy: str):
+    if policy not in POLICIES:
+        raise ValueError(f"Unsupported convergence policy: {policy} (expected one of {', '.join(POLICIES)})")
+
+
+class ConvergenceDetector:
+    """Scores finished turns and decides when the debate has converged"""
+
+    def __init__(self, config: ConvergenceConfig):
+        check_policy(config.policy)
+        self.config = config
+        self.hasher = MinHasher(config.num_perm)
+        self._previous: Dict[str, Signature] = {}  # Seat -> signature of its last turn
+        self._seen: Set[int] = set()
+        self._streak: List[Dict[str, Any]] = []
+        self._observed = 0
+        self.scores: List[Dict[str, Any]] = []
+        self.reason: Optional[str] = None
+        self.after_turn: Optional[int] = None
+        self.trigger: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.policy != "off"
+
+    @property
+    def converged(self) -> bool:
+        return self.reason is not None
+
+    def _signals(self, score: Dict[str, Any]) -> List[str]:
+        signals = []
+        if score["similarity"] is not None and score["similarity"] >= self.config.similarity_threshold:
+            signals.append("repetition")
+        if score["novelty"] < self.config.novelty_threshold:
+            signals.append("stale")
+        return signals
+
+    def _is_converged(self, signals: List[str]) -> bool:
+        policy = self.config.policy
+        if policy == "either":
+            return bool(signals)
+        if policy == "both":
+            return len(signals) == 2
+        return policy in signals
+
+    def observe(self, message: Message) -> bool:
+        """Score a finished turn; True once, when the debate has just converged"""
+        if not self.enabled or self.converged:
+            return False
+        self._observed += 1
+        metadata = message.metadata
+        seat = metadata.get("speaker", message.role)
+        hashes = shingles(message.content, self.config.shingle_size)
+        signature = self.hasher.signature(hashes)
+        previous = self._previous.get(seat)
+        score = {
+            "turn": metadata.get("turn"),
+            "speaker": seat,
+            "similarity": round(self.hasher.similarity(signature, previous), 3) if previous is not None else None,
+            "novelty": round(novelty(hashes, self._seen), 3)
+        }
+        self._previous[seat] = signature
+        self._seen |= hashes
+        if metadata.get("kind", "argument") not in SCORED_KINDS:
+            return False
+
+        signals = self._signals(score)
+        score["converged"] = self._is_converged(signals)
+        self.scores.append(score)
+        if not score["converged"]:
+            self._streak = []
+            return False
+        self._streak.append({**score, "signals": signals})
+        if len(self._streak) < max(1, self.config.patience) or self._observed < self.config.min_turns:
+            return False
+
+        self.after_turn = score["turn"]
+        if self.config.policy in TRIGGERS:
+            self.trigger = self.config.policy
+        else:
+            common = [signal for signal in TRIGGERS if all(signal in turn["signals"] for turn in self._streak)]
+            self.trigger = common[0] if common else "mixed"
+        turns = ", ".join(f"{turn['turn']} ({turn['speaker'].upper()}: similarity "
+                          f"{turn['similarity'] if turn['similarity'] is not None else '-'}, "
+                          f"novelty {turn['novelty']})" for turn in self._streak)
+        what = TRIGGERS.get(self.trigger) or " or ".join(TRIGGERS.values())
+        self.reason = f"{len(self._streak)} consecutive turns {what}: {turns}"
+        logger.info(f"Debate converged after turn {self.after_turn}: {self.reason}")
+        return True
+
+    def summary(self, skipped_turns: int) -> Dict[str, Any]:
+        return {
+            "policy": self.config.policy,
+            "stopped_early": self.converged,
+            "reason": self.reason,
+            "trigger": self.trigger,
+            "after_turn": self.after_turn,
+            "skipped_turns": skipped_turns,
+            "scores": self.scores
+        }
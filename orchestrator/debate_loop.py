@@ -4,82 +4,226 @@ Main debate orchestration logic
 
 import asyncio
 import time
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, List, Optional, Set
 
 from agents.pro_agent import ProAgent
 from agents.con_agent import ConAgent
-from agents.judge_agent import JudgeAgent
+from agents.judge_agent import JudgeAgent, research_chunks
 from agents.base_agent import Message
+from orchestrator.convergence import ConvergenceDetector
+from orchestrator.formats import SIDES, TURN_INSTRUCTIONS, TurnNode, plan_for
 from orchestrator.turn_manager import TurnManager
 from orchestrator.memory_manager import MemoryManager
+from orchestrator.events import DebateResult, EventSink, default_sinks, message_dict, message_event, system_event
 from config.settings import Config
 from utils.logger import setup_logger
+from utils.timing import PhaseTimer, wall_clock_ms
+from utils.metrics import DEBATES_IN_FLIGHT, DEBATES_TOTAL, DEBATE_DURATION, DEBATE_EARLY_STOPS, record_error
+from utils.tracing import tracer
+from utils.llm_providers import register_endpoints
+from utils.llm_scheduler import call_context
+from utils.retrieval import BM25Index
+from utils.usage import TokenUsage, collect_usage, estimate_cost
 
 logger = setup_logger(__name__)
 
+@dataclass
+class DebateCheckpoint:
+    """Where to continue an interrupted debate: its research and the turns already taken"""
+    research_context: str
+    messages: List[Message] = field(default_factory=list)
+
 class DebateOrchestrator:
     """Orchestrates the entire debate process"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, sinks: Optional[List[EventSink]] = None):
         self.config = config
+        self.sinks: List[EventSink] = sinks if sinks is not None else default_sinks()
+        # Turn graph of the debate format (ValueError for an unknown or invalid format)
+        self.plan = plan_for(config)
         self.turn_manager = TurnManager(config.debate)
-        self.memory_manager = MemoryManager()
+        self.turn_manager.state.max_turns = len(self.plan.turns)
+        # ValueError for an unknown convergence policy
+        self.convergence = ConvergenceDetector(config.debate.convergence)
+        self.skipped_turns = 0
+        # Research chunks retrieved per turn (built once research is known)
+        self.research_index: Optional[BM25Index] = None
+        self.evidence_chars: List[int] = []
+        self.memory_manager = MemoryManager(claims=config.debate.claims)
+        self.timer = PhaseTimer()
+        self.research_context: Optional[str] = None
+        
+        # Named OpenAI-compatible endpoints must be registered before agents resolve their provider
+        register_endpoints(config.providers)
         
         # Initialize agents
         self.pro_agent = ProAgent(config.agents.pro, config.api_keys)
         self.con_agent = ConAgent(config.agents.con, config.api_keys)
         self.judge_agent = JudgeAgent(config.agents.judge, config.api_keys, config.tools)
         
+        # One agent per seat; extra seats (panels, teams) use their side's agent config
+        self.seat_agents: Dict[str, Any] = {"pro": self.pro_agent, "con": self.con_agent}
+        for seat, side in self.plan.seats.items():
+            if seat not in self.seat_agents:
+                agent_class = ProAgent if side == "pro" else ConAgent
+                agent = agent_class(config.agents.pro if side == "pro" else config.agents.con, config.api_keys)
+                agent.seat = seat
+                self.seat_agents[seat] = agent
+        
         logger.info("Debate orchestrator initialized")
     
     async def run_debate(self, topic: str) -> Dict[str, Any]:
-        """Run a complete debate session"""
+        """Run a complete debate session and return its result
+        
+        Consumes the same event pipeline as ``stream_debate``; a failure is
+        raised after the error event reaches the sinks.
+        """
+        result = None
+        async for event in self.stream_debate(topic):
+            if event["type"] == "complete":
+                result = event["result"]
+        return result
+    
+    async def stream_debate(self, topic: str,
+                            resume: Optional[DebateCheckpoint] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run a complete debate session, yielding events as it progresses
+        
+        Each event goes through the orchestrator's sinks before it is yielded. With
+        ``resume``, research is skipped and the debate continues after the given turns.
+        """
+        async for event in self._pipeline(topic, resume):
+            for sink in self.sinks:
+                await sink.emit(event)
+            yield event
+    
+    async def _pipeline(self, topic: str, resume: Optional[DebateCheckpoint] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Research, debate and judgment phases as a stream of events"""
         logger.info(f"Starting debate on topic: {topic}")
         
-        start_time = time.time()
+        self.timer = PhaseTimer()
+        DEBATES_IN_FLIGHT.inc()
         
         try:
-            # Phase 1: Research
-            research_context = await self._research_phase(topic)
-            
-            # Phase 2: Debate
-            conversation_history = await self._debate_phase(topic, research_context)
-            
-            # Phase 3: Judgment
-            judgment = await self._judgment_phase(topic, conversation_history)
+            with call_context(self.config.debate.priority, self.config.debate.tenant), \
+                    tracer.span("debate", **{"debate.topic": topic, "debate.max_turns": self.config.debate.max_turns}):
+                if resume is None:
+                    # Phase 1: Research
+                    yield {"type": "phase", "phase": "research"}
+                    yield system_event("Starting research phase...", "research")
+                    
+                    with self.timer.phase("research"), tracer.span("debate.research_phase"):
+                        research_context = await self._research_phase(topic)
+                    self.research_context = research_context
+                    
+                    yield system_event(f"Research completed. Found relevant information about {topic}.", "research_complete")
+                    
+                    # Phase 2: Debate (the phase spans the whole loop, including yields)
+                    yield {"type": "phase", "phase": "debate"}
+                    yield system_event("Starting debate phase...", "debate_start")
+                    conversation_history: List[Message] = []
+                else:
+                    research_context = self._restore(resume)
+                    yield system_event(f"Resuming debate after turn {len(resume.messages)}...", "resumed")
+                    conversation_history = list(resume.messages)
+                
+                with self.timer.phase("debate"), tracer.span("debate.debate_phase"):
+                    async for message in self._debate_phase(topic, research_context, conversation_history):
+                        conversation_history.append(message)
+                        yield message_event(message)
+                # Turns of a round are yielded as they finish; the transcript is in turn order
+                conversation_history.sort(key=lambda msg: msg.metadata.get("turn", 0))
+                logger.info(f"Debate phase completed. Total turns: {len(conversation_history)}")
+                if self.convergence.converged:
+                    yield system_event(f"Debate converged after turn {self.convergence.after_turn}, "
+                                       f"skipping {self.skipped_turns} turns: {self.convergence.reason}", "converged")
+                
+                # Phase 3: Judgment
+                yield {"type": "phase", "phase": "judgment"}
+                yield system_event("Evaluating debate arguments...", "judgment")
+                
+                with self.timer.phase("judgment"), tracer.span("debate.judgment_phase") as span:
+                    judgment = await self._judgment_phase(topic, conversation_history)
+                    span.set_attribute("debate.winner", judgment["winner"])
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = self.timer.elapsed_seconds
             
             # Compile results
-            result = {
+            result = DebateResult({
                 "topic": topic,
                 "winner": judgment["winner"],
                 "reasoning": judgment["reasoning"],
                 "score": judgment["score"],
-                "transcript": [
-                    {
-                        "role": msg.role,
-                        "content": msg.content,
-                        "timestamp": msg.timestamp,
-                        "metadata": msg.metadata
-                    }
-                    for msg in conversation_history
-                ],
+                "transcript": [message_dict(msg) for msg in conversation_history],
                 "metadata": {
                     "duration": duration,
                     "total_turns": len([msg for msg in conversation_history if msg.role in ['pro', 'con']]),
                     "research_context": research_context[:500] + "..." if len(research_context) > 500 else research_context,
-                    "analysis": judgment.get("analysis", {})
+                    "analysis": judgment.get("analysis", {}),
+                    "format": {"name": self.plan.name, "turns": len(self.plan.turns),
+                               "critical_path": self.plan.critical_path},
+                    "timings": self.timer.summary(),
+                    "usage": self.usage_summary()
                 }
-            }
+            })
+            if self.research_index is not None:
+                result["metadata"]["retrieval"] = self.retrieval_summary(research_context)
+            claims = self.memory_manager.claim_summary()
+            if claims is not None:
+                result["metadata"]["claims"] = claims
+            if self.convergence.enabled:
+                result["metadata"]["convergence"] = self.convergence.summary(self.skipped_turns)
+            if resume is not None:
+                # Timings and usage cover this run only
+                result["metadata"]["resumed_after_turn"] = len(resume.messages)
             
+            DEBATE_DURATION.observe(duration)
+            DEBATES_TOTAL.labels("completed").inc()
             logger.info(f"Debate completed. Winner: {judgment['winner']}")
-            return result
+            yield {"type": "complete", "result": result}
             
         except Exception as e:
             logger.error(f"Debate failed: {str(e)}")
+            DEBATES_TOTAL.labels("failed").inc()
+            record_error("orchestrator", e)
+            yield {"type": "error", "error": str(e)}
             raise
+        finally:
+            DEBATES_IN_FLIGHT.dec()
+    
+    def _usage_dict(self, agent, usage: TokenUsage) -> Dict[str, Any]:
+        """Export usage with a cost estimate from the configured price table"""
+        cost = estimate_cost(agent.config.model, usage.prompt_tokens, usage.completion_tokens,
+                             self.config.pricing, usage.cached_tokens)
+        return usage.to_dict(cost)
+    
+    def usage_summary(self) -> Dict[str, Any]:
+        """Token usage and estimated cost per agent and for the whole debate"""
+        agents = {}
+        total = TokenUsage()
+        total_cost = 0.0
+        cost_known = True
+        
+        for agent in (*self.seat_agents.values(), self.judge_agent):
+            usage_dict = self._usage_dict(agent, agent.usage)
+            agents[agent.seat] = {"model": agent.config.model, "provider": agent.config.provider, **usage_dict}
+            total.merge(agent.usage)
+            if usage_dict["cost_usd"] is None:
+                cost_known = False
+            else:
+                total_cost += usage_dict["cost_usd"]
+        
+        return {"agents": agents, "total": total.to_dict(total_cost if cost_known else None)}
+    
+    def retrieval_summary(self, research_context: str) -> Dict[str, Any]:
+        """Research chunk count and how much research the turns carried"""
+        turns = len(self.evidence_chars)
+        return {
+            "chunks": len(self.research_index),
+            "top_k": self.config.debate.retrieval.top_k,
+            "research_chars": len(research_context),
+            "mean_evidence_chars": round(sum(self.evidence_chars) / turns) if turns else 0
+        }
     
     async def _research_phase(self, topic: str) -> str:
         """Phase 1: Judge researches the topic"""
@@ -92,7 +236,7 @@ class DebateOrchestrator:
             research_msg = Message(
                 role="system",
                 content=f"Research completed for topic: {topic}",
-                timestamp=time.time(),
+                timestamp=wall_clock_ms(),
                 metadata={"phase": "research", "research_context": research_context}
             )
             self.memory_manager.add_message(research_msg)
@@ -102,86 +246,198 @@ class DebateOrchestrator:
             
         except Exception as e:
             logger.error(f"Research phase failed: {str(e)}")
+            record_error("research", e)
             return f"Research failed: {str(e)}"
     
-    async def _debate_phase(self, topic: str, research_context: str) -> List[Message]:
-        """Phase 2: PRO and CON agents debate"""
-        logger.info("Starting debate phase")
+    def _restore(self, checkpoint: DebateCheckpoint) -> str:
+        """Load a checkpoint's research and turns into memory and the turn counter"""
+        self.research_context = checkpoint.research_context
+        self.memory_manager.add_message(Message(
+            role="system",
+            content="Research restored from checkpoint",
+            timestamp=wall_clock_ms(),
+            metadata={"phase": "research", "research_context": checkpoint.research_context}
+        ))
+        for message in checkpoint.messages:
+            self.memory_manager.add_message(message)
+        self.turn_manager.state.current_turn = len(checkpoint.messages)
+        logger.info(f"Restored debate after turn {len(checkpoint.messages)}")
+        return checkpoint.research_context
+    
+    async def _debate_phase(self, topic: str, research_context: str,
+                            history: Optional[List[Message]] = None) -> AsyncIterator[Message]:
+        """Phase 2: run the format's turns, yielding each turn's message as it finishes
+        
+        Every turn whose dependencies are done is started at once, so the critical path of the
+        format's turn graph, not its turn count, sets the phase's duration. ``history`` holds
+        turns already taken (when resuming); they are not run again. Once the convergence
+        detector reports that turns stopped adding anything, turns not yet started are skipped,
+        except closing statements. A turn still running after ``turn_timeout`` is cancelled, and
+        no turn starts after that. With retrieval enabled, each turn gets the research chunks
+        relevant to the opponent's last argument instead of the whole research.
+        """
+        logger.info(f"Starting debate phase: {self.plan.name}, {len(self.plan.turns)} turns, "
+                    f"critical path {self.plan.critical_path}")
         
-        conversation_history = []
+        done: Dict[int, Message] = {msg.metadata["turn"]: msg for msg in history or [] if "turn" in msg.metadata}
         context = {"research": research_context}
+        retrieval = self.config.debate.retrieval
+        if retrieval.enabled:
+            index = BM25Index(research_chunks(research_context, retrieval.chunk_words), retrieval.k1, retrieval.b)
+            if len(index):
+                self.research_index = index
+                context = {}
+        running: Dict[asyncio.Task, TurnNode] = {}
+        deadlines: Dict[asyncio.Task, float] = {}
+        turn_timeout = self.turn_manager.state.turn_timeout
+        timed_out = False
+        skipped: Set[int] = set()
         
-        # PRO agent starts
-        current_agent = "pro"
+        def converge():
+            # Skipped turns count as done, so closing statements that follow them can start
+            started = {node.turn for node in running.values()}
+            skipped.update(node.turn for node in self.plan.turns
+                           if node.turn not in done and node.turn not in started and node.kind != "closing")
+            self.skipped_turns = len(skipped)
+            self.turn_manager.state.max_turns -= len(skipped)
+            DEBATE_EARLY_STOPS.labels(self.convergence.trigger).inc()
         
-        while not self.turn_manager.is_debate_finished():
-            try:
-                # Check timeout
-                if self.turn_manager.is_turn_timeout():
-                    logger.warning("Turn timeout reached")
+        # A resumed debate replays the detector over the turns already taken
+        for turn in sorted(done):
+            if self.convergence.observe(done[turn]):
+                converge()
+        
+        try:
+            while True:
+                # Start every ready turn unless a limit was reached (running turns still finish)
+                if not timed_out and not self.turn_manager.is_debate_finished():
+                    started = {node.turn for node in running.values()}
+                    for node in self.plan.ready(set(done) | skipped, started):
+                        history_seen = [done[turn] for turn in node.sees if turn in done]
+                        if self.config.debate.claims.collapse_context:
+                            history_seen = self.memory_manager.collapse_repeats(history_seen, "context")
+                        task = asyncio.create_task(self._take_turn(topic, node, history_seen, context))
+                        running[task] = node
+                        deadlines[task] = time.monotonic() + turn_timeout
+                if not running:
                     break
                 
-                # Generate response
-                if current_agent == "pro":
-                    response = await self.pro_agent.generate_response(
-                        topic, conversation_history, context
-                    )
-                    agent = self.pro_agent
-                else:
-                    response = await self.con_agent.generate_response(
-                        topic, conversation_history, context
-                    )
-                    agent = self.con_agent
-                
-                # Create message
-                message = Message(
-                    role=current_agent,
-                    content=response,
-                    timestamp=time.time(),
-                    metadata={
-                        "turn": self.turn_manager.current_turn,
-                        "agent_config": {
-                            "model": agent.config.model,
-                            "provider": agent.config.provider
-                        }
-                    }
-                )
-                
-                # Add to history and memory
-                conversation_history.append(message)
-                self.memory_manager.add_message(message)
+                timeout = max(0.0, min(deadlines[task] for task in running) - time.monotonic())
+                finished, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                messages: List[Message] = []
+                failed = False
+                for task in sorted(finished, key=lambda task: running[task].turn):
+                    node = running.pop(task)
+                    del deadlines[task]
+                    try:
+                        message = task.result()
+                    except Exception as e:
+                        logger.error(f"Error in debate turn: {str(e)}")
+                        record_error("debate_turn", e)
+                        failed = True
+                        continue
+                    
+                    # Add to history and memory
+                    done[node.turn] = message
+                    self.memory_manager.add_message(message)
+                    
+                    # Log the turn
+                    logger.info(f"Turn {node.turn} ({node.speaker.upper()}, {node.kind}): {len(message.content)} characters")
+                    self.turn_manager.advance_turn()
+                    messages.append(message)
+                    if self.convergence.observe(message):
+                        converge()
                 
-                # Log the turn
-                logger.info(f"Turn {self.turn_manager.current_turn} ({current_agent.upper()}): {len(response)} characters")
+                # Turns past their deadline are cancelled; the rest finish, then the phase ends
+                now = time.monotonic()
+                overdue = [task for task in running if deadlines[task] <= now]
+                if overdue:
+                    logger.warning(f"Turn timeout reached ({turn_timeout}s): cancelling turns "
+                                   f"{', '.join(str(running[task].turn) for task in overdue)}")
+                    for task in overdue:
+                        task.cancel()
+                        del running[task], deadlines[task]
+                    timed_out = True
                 
-                # Advance turn
-                self.turn_manager.advance_turn()
-                
-                # Switch agents
-                current_agent = "con" if current_agent == "pro" else "pro"
-                
-                # Small delay to prevent rate limiting
-                await asyncio.sleep(1)
+                for message in messages:
+                    yield message
+                if failed:
+                    break
                 
-            except Exception as e:
-                logger.error(f"Error in debate turn: {str(e)}")
-                break
+                # Pacing between turns (configurable; 0 disables)
+                if self.config.debate.turn_delay > 0 and not timed_out and self.turn_manager.get_remaining_turns() > 0:
+                    await asyncio.sleep(self.config.debate.turn_delay)
+        finally:
+            for task in running:
+                task.cancel()
+    
+    async def _take_turn(self, topic: str, node: TurnNode, history: List[Message],
+                         context: Dict[str, Any]) -> Message:
+        """Generate one turn from the turns it depends on"""
+        agent = self.seat_agents[node.speaker]
+        instruction = TURN_INSTRUCTIONS[node.kind]
+        if instruction:
+            context = {**context, "instruction": instruction}
+        chunks: List[int] = []
+        if self.research_index is not None:
+            chunks = self._retrieve(topic, node, history)
+            evidence = "\n\n".join(self.research_index.documents[chunk] for chunk in chunks)
+            self.evidence_chars.append(len(evidence))
+            context = {**context, "evidence": evidence}
+        
+        # Generate response
+        with collect_usage() as usage, self.timer.turn(node.turn, node.side) as turn_timing, \
+                tracer.span("debate.turn", **{"agent.role": node.side, "debate.turn": node.turn,
+                                              "debate.speaker": node.speaker, "debate.turn_kind": node.kind}):
+            response = await agent.generate_response(topic, history, context)
         
-        logger.info(f"Debate phase completed. Total turns: {len(conversation_history)}")
-        return conversation_history
+        # Create message
+        return Message(
+            role=node.side,
+            content=response,
+            timestamp=wall_clock_ms(),
+            metadata={
+                "turn": node.turn,
+                "speaker": node.speaker,
+                "kind": node.kind,
+                "round": node.round,
+                "research_chunks": chunks,
+                "agent_config": {
+                    "model": agent.config.model,
+                    "provider": agent.config.provider
+                },
+                "timings": turn_timing.to_dict(),
+                "usage": self._usage_dict(agent, usage)
+            }
+        )
+    
+    def _retrieve(self, topic: str, node: TurnNode, history: List[Message]) -> List[int]:
+        """Research chunks for a turn (in research order): the best matches for the opponent's
+        last argument, else for the topic, else the first chunks"""
+        top_k = self.config.debate.retrieval.top_k
+        opponent = next((msg for msg in reversed(history) if msg.role in SIDES and msg.role != node.side), None)
+        hits = self.research_index.search(opponent.content, top_k) if opponent is not None else []
+        if not hits:
+            hits = self.research_index.search(topic, top_k)
+        if not hits:
+            return list(range(min(top_k, len(self.research_index))))
+        return sorted(chunk for chunk, _ in hits)
     
     async def _judgment_phase(self, topic: str, conversation_history: List[Message]) -> Dict[str, Any]:
         """Phase 3: Judge evaluates the debate"""
         logger.info("Starting judgment phase")
         
         try:
+            # The judge reads each claim once; the result keeps the full transcript
+            if self.config.debate.claims.collapse_judge:
+                conversation_history = self.memory_manager.collapse_repeats(conversation_history, "judge")
             judgment = await self.judge_agent.judge_debate(topic, conversation_history)
             
             # Add judgment to memory
             judgment_msg = Message(
                 role="judge",
                 content=f"Judgment: {judgment['winner']} wins",
-                timestamp=time.time(),
+                timestamp=wall_clock_ms(),
                 metadata={"phase": "judgment", "judgment": judgment}
             )
             self.memory_manager.add_message(judgment_msg)
@@ -191,155 +447,10 @@ class DebateOrchestrator:
             
         except Exception as e:
             logger.error(f"Judgment phase failed: {str(e)}")
+            record_error("judgment", e)
             return {
                 "winner": "ERROR",
                 "reasoning": f"Judgment failed: {str(e)}",
                 "score": {"pro_score": 0, "con_score": 0},
                 "analysis": {}
             }
-    
-    async def stream_debate(self, topic: str):
-        """Run a complete debate session with streaming updates"""
-        logger.info(f"Starting streaming debate on topic: {topic}")
-        
-        start_time = time.time()
-        
-        try:
-            # Phase 1: Research
-            yield {"type": "phase", "phase": "research"}
-            yield {"type": "message", "message": {
-                "role": "system",
-                "content": "Starting research phase...",
-                "timestamp": int(time.time() * 1000),
-                "metadata": {"phase": "research"}
-            }}
-            
-            research_context = await self._research_phase(topic)
-            
-            yield {"type": "message", "message": {
-                "role": "system", 
-                "content": f"Research completed. Found relevant information about {topic}.",
-                "timestamp": int(time.time() * 1000),
-                "metadata": {"phase": "research_complete"}
-            }}
-            
-            # Phase 2: Debate
-            yield {"type": "phase", "phase": "debate"}
-            yield {"type": "message", "message": {
-                "role": "system",
-                "content": "Starting debate phase...",
-                "timestamp": int(time.time() * 1000),
-                "metadata": {"phase": "debate_start"}
-            }}
-            
-            conversation_history = []
-            
-            # Stream debate turns
-            async for message in self._stream_debate_phase(topic, research_context):
-                conversation_history.append(message)
-                yield {"type": "message", "message": {
-                    "role": message.role,
-                    "content": message.content,
-                    "timestamp": message.timestamp,
-                    "metadata": message.metadata
-                }}
-            
-            # Phase 3: Judgment
-            yield {"type": "phase", "phase": "judgment"}
-            yield {"type": "message", "message": {
-                "role": "system",
-                "content": "Evaluating debate arguments...",
-                "timestamp": int(time.time() * 1000),
-                "metadata": {"phase": "judgment"}
-            }}
-            
-            judgment = await self._judgment_phase(topic, conversation_history)
-            
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            # Compile final results
-            result = {
-                "topic": topic,
-                "winner": judgment["winner"],
-                "reasoning": judgment["reasoning"],
-                "score": judgment["score"],
-                "transcript": [
-                    {
-                        "role": msg.role,
-                        "content": msg.content,
-                        "timestamp": msg.timestamp,
-                        "metadata": msg.metadata
-                    }
-                    for msg in conversation_history
-                ],
-                "metadata": {
-                    "duration": duration,
-                    "total_turns": len([msg for msg in conversation_history if msg.role in ['pro', 'con']]),
-                    "research_context": research_context[:500] + "..." if len(research_context) > 500 else research_context,
-                    "analysis": judgment.get("analysis", {})
-                }
-            }
-            
-            yield {"type": "complete", "result": result}
-            logger.info(f"Streaming debate completed. Winner: {judgment['winner']}")
-            
-        except Exception as e:
-            logger.error(f"Streaming debate failed: {str(e)}")
-            yield {"type": "error", "error": str(e)}
-            raise
-
-    async def _stream_debate_phase(self, topic: str, research_context: str):
-        """Stream the debate phase with real-time message updates"""
-        self.memory_manager.add_message(Message(
-            role="system",
-            content=f"Research Context: {research_context}",
-            timestamp=int(time.time() * 1000)
-        ))
-        
-        current_agent = "pro"
-        turn_count = 0
-        
-        while not self.turn_manager.is_debate_finished():
-            turn_count += 1
-            
-            if current_agent == "pro":
-                agent = self.pro_agent
-                opponent_role = "con"
-            else:
-                agent = self.con_agent
-                opponent_role = "pro"
-            
-            # Get conversation history for context
-            history = self.memory_manager.get_conversation_history()
-            
-            # Generate response
-            if turn_count == 1:
-                # First turn, no previous arguments
-                response = await agent.generate_response(topic, [], {"research": research_context})
-            else:
-                # Include previous arguments
-                response = await agent.generate_response(topic, history, {"research": research_context})
-            
-            # Create message
-            message = Message(
-                role=current_agent,
-                content=response,
-                timestamp=int(time.time() * 1000),
-                metadata={"turn": turn_count, "agent_config": agent.config.model_dump()}
-            )
-            
-            # Add to memory and yield
-            self.memory_manager.add_message(message)
-            yield message
-            
-            # Advance turn manager
-            self.turn_manager.advance_turn()
-            
-            # Switch to the other agent
-            current_agent = "con" if current_agent == "pro" else "pro"
-            
-            # Add a small delay to make streaming visible
-            await asyncio.sleep(0.5)
-        
-        # End of debate phase - no return needed in async generator
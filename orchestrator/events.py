@@ -0,0 +1,139 @@
+"""
+Debate events and event sinks
+
+Every debate runs as one pipeline that emits events. ``stream_debate`` yields
+them to SSE clients and ``run_debate`` collects the final result; both pass
+each event through the orchestrator's sinks first. Event shapes (also the
+SSE wire format):
+
+    {"type": "phase", "phase": "research" | "debate" | "judgment"}
+    {"type": "message", "message": {"role", "content", "timestamp", "metadata"}}
+    {"type": "complete", "result": {...}}
+    {"type": "error", "error": "..."}
+
+Messages are ``CachedJSON`` records shared by their event and the result's
+transcript, so each is encoded once however often it is sent. The result is a
+``DebateResult``, encoded once for the sinks, the SSE frame and the response.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from agents.base_agent import Message
+from utils.debate_analytics import get_analytics
+from utils.debate_archive import get_archive
+from utils.fast_json import CachedJSON, dumps, dumps_list, dumps_object, loads
+from utils.logger import setup_logger
+from utils.metrics import DEBATE_EVENTS
+from utils.timing import wall_clock_ms
+
+logger = setup_logger(__name__)
+
+
+def message_dict(message: Message) -> Dict[str, Any]:
+    return message.to_dict()
+
+
+def message_event(message: Message) -> Dict[str, Any]:
+    return {"type": "message", "message": message_dict(message)}
+
+
+def system_event(content: str, phase: str) -> Dict[str, Any]:
+    """Progress note shown to live viewers"""
+    return message_event(Message(role="system", content=content, timestamp=wall_clock_ms(),
+                                 metadata={"phase": phase}))
+
+
+class DebateResult(CachedJSON):
+    """Result of a finished debate; complete before its ``complete`` event is emitted"""
+
+    __slots__ = ()
+
+    def encode(self) -> bytes:
+        return dumps_object(self, {"transcript": dumps_list(self["transcript"])})
+
+
+def encode_result(result: Dict[str, Any]) -> bytes:
+    """JSON for a debate result, reusing the transcript's encoded messages (and a ``DebateResult``'s encoding)"""
+    if isinstance(result, DebateResult):
+        return result.json()
+    return dumps_object(result, {"transcript": dumps_list(result["transcript"])})
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    kind = event["type"]
+    if kind == "message":
+        return b'{"type":"message","message":' + dumps(event["message"]) + b"}"
+    if kind == "complete":
+        return b'{"type":"complete","result":' + encode_result(event["result"]) + b"}"
+    return dumps(event)
+
+
+def sse_frame(event_id: int, event: Dict[str, Any]) -> bytes:
+    """Encode an event as one Server-Sent Events frame"""
+    return b"id: " + str(event_id).encode("ascii") + b"\ndata: " + encode_event(event) + b"\n\n"
+
+
+def decode_frame(frame: bytes) -> Tuple[int, Dict[str, Any]]:
+    """Event id and event of a frame built by ``sse_frame``"""
+    header, _, data = frame.partition(b"\ndata: ")
+    return int(header[len(b"id: "):]), loads(data)
+
+
+class EventSink:
+    """Receives every event of a debate, in order, before it is yielded"""
+
+    async def emit(self, event: Dict[str, Any]):
+        raise NotImplementedError
+
+
+class LogSink(EventSink):
+    """Log each event (debug level; phases and outcomes at info)"""
+
+    async def emit(self, event: Dict[str, Any]):
+        kind = event["type"]
+        if kind == "phase":
+            logger.info(f"Phase: {event['phase']}")
+        elif kind == "message":
+            message = event["message"]
+            logger.debug(f"{message['role'].upper()}: {message['content'][:80]}")
+        elif kind == "complete":
+            logger.info(f"Complete: {event['result']['winner']}")
+        elif kind == "error":
+            logger.info(f"Error: {event['error']}")
+
+
+class MetricsSink(EventSink):
+    """Count events by type"""
+
+    def __init__(self):
+        self._counters = {}
+
+    async def emit(self, event: Dict[str, Any]):
+        kind = event["type"]
+        counter = self._counters.get(kind)
+        if counter is None:
+            counter = self._counters[kind] = DEBATE_EVENTS.labels(kind)
+        counter.inc()
+
+
+class ArchiveSink(EventSink):
+    """Add each completed debate to the searchable archive (utils/debate_archive.py)"""
+
+    async def emit(self, event: Dict[str, Any]):
+        archive = get_archive()
+        if event["type"] == "complete" and archive is not None:
+            archive.add(event["result"], encode_result(event["result"]))
+
+
+class AnalyticsSink(EventSink):
+    """Append each completed debate to the analytics column tables (utils/debate_analytics.py)"""
+
+    async def emit(self, event: Dict[str, Any]):
+        analytics = get_analytics()
+        if event["type"] == "complete" and analytics is not None:
+            analytics.add(event["result"], encode_result(event["result"]))
+
+
+def default_sinks() -> List[EventSink]:
+    """Sinks of an orchestrator created without explicit ones"""
+    return [MetricsSink(), ArchiveSink(), AnalyticsSink()]
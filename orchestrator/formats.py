@@ -0,0 +1,199 @@
+"""
+Debate formats compiled into turn graphs
+
+A format declares seats (speakers and their side) and rounds of turns. The
+turns of a round run one after another, or concurrently with ``parallel:
+true``; inside a parallel round, a nested list is a chain whose turns run in
+order (a cross-examination question and its answer). Every turn of a round
+waits for the last turns of the previous round.
+
+``compile_format`` turns a format into a ``DebatePlan``: numbered turns with
+explicit dependencies. The orchestrator starts every turn whose dependencies
+are done, so a debate takes as long as its critical path (the longest chain
+of dependent turns), not its turn count. A turn sees exactly the turns it
+depends on, directly or transitively.
+
+``sequential``, ``parallel_openings`` and ``simultaneous`` are generated from
+``max_turns``; the other built-in formats are declared below, and
+``formats`` in the config adds more in the same shape, e.g.::
+
+    formats:
+      quick_clash:
+        seats: {pro: pro, con: con}
+        rounds:
+          - {name: opening, parallel: true, turns: [{speaker: pro, kind: opening}, {speaker: con, kind: opening}]}
+          - {name: closing, parallel: true, turns: [{speaker: pro, kind: closing}, {speaker: con, kind: closing}]}
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.settings import Config, FormatSpec, RoundSpec, TurnSpec
+
+SIDES = ("pro", "con")
+
+# Extra instruction for each kind of turn (argument: the agent's standard turn prompt only)
+TURN_INSTRUCTIONS: Dict[str, Optional[str]] = {
+    "argument": None,
+    "opening": "This is your opening statement: set out your case and its main arguments.",
+    "rebuttal": "This is a rebuttal: answer the strongest opposing arguments so far and reinforce your case.",
+    "question": ("This is cross-examination: ask your opponent up to three short, pointed questions that "
+                 "expose weaknesses in their case. Ask questions only; do not argue."),
+    "answer": ("Answer the cross-examination questions just put to you, directly and briefly, "
+               "then restate the point your opponent missed."),
+    "closing": ("This is your closing statement: summarize why your side has the stronger case. "
+                "Do not introduce new arguments.")
+}
+
+
+def _turn(speaker: str, kind: str) -> TurnSpec:
+    return TurnSpec(speaker=speaker, kind=kind)
+
+
+def _pair(kind: str) -> List[TurnSpec]:
+    return [_turn("pro", kind), _turn("con", kind)]
+
+
+DEBATERS = {"pro": "pro", "con": "con"}
+TEAMS = {"pro": "pro", "pro_2": "pro", "con": "con", "con_2": "con"}
+
+BUILTIN_FORMATS: Dict[str, FormatSpec] = {
+    # Two speakers per side, strictly in turn, then closings (opposition first)
+    "oxford": FormatSpec(seats=TEAMS, rounds=[
+        RoundSpec(name="constructive", turns=[_turn("pro", "opening"), _turn("con", "opening"),
+                                              _turn("pro_2", "rebuttal"), _turn("con_2", "rebuttal")]),
+        RoundSpec(name="closing", turns=[_turn("con", "closing"), _turn("pro", "closing")])
+    ]),
+    # Constructives each followed by the opponent's cross-examination, then alternating rebuttals
+    "lincoln_douglas": FormatSpec(seats=DEBATERS, rounds=[
+        RoundSpec(name="affirmative_constructive", turns=[_turn("pro", "opening")]),
+        RoundSpec(name="cross_examination_1", turns=[_turn("con", "question"), _turn("pro", "answer")]),
+        RoundSpec(name="negative_constructive", turns=[_turn("con", "opening")]),
+        RoundSpec(name="cross_examination_2", turns=[_turn("pro", "question"), _turn("con", "answer")]),
+        RoundSpec(name="rebuttals", turns=[_turn("pro", "rebuttal"), _turn("con", "rebuttal"),
+                                           _turn("pro", "closing")])
+    ]),
+    # Independent openings, both cross-examinations at once, simultaneous rebuttals and closings
+    "cross_examination": FormatSpec(seats=DEBATERS, rounds=[
+        RoundSpec(name="opening", parallel=True, turns=_pair("opening")),
+        RoundSpec(name="cross_examination", parallel=True, turns=[
+            [_turn("pro", "question"), _turn("con", "answer")],
+            [_turn("con", "question"), _turn("pro", "answer")]
+        ]),
+        RoundSpec(name="rebuttal", parallel=True, turns=_pair("rebuttal")),
+        RoundSpec(name="closing", parallel=True, turns=_pair("closing"))
+    ]),
+    # Four panelists: every opening at once, every rebuttal at once, one closing per side
+    "panel": FormatSpec(seats=TEAMS, rounds=[
+        RoundSpec(name="opening", parallel=True, turns=[_turn(seat, "opening") for seat in TEAMS]),
+        RoundSpec(name="rebuttal", parallel=True, turns=[_turn(seat, "rebuttal") for seat in TEAMS]),
+        RoundSpec(name="closing", parallel=True, turns=_pair("closing"))
+    ])
+}
+
+GENERATED_FORMATS = ("sequential", "parallel_openings", "simultaneous")
+
+
+def _alternating(max_turns: int, start: int = 0) -> List[TurnSpec]:
+    return [_turn(SIDES[(start + index) % 2], "argument") for index in range(max_turns)]
+
+
+def generate_format(name: str, max_turns: int) -> FormatSpec:
+    """PRO/CON alternation up to ``max_turns``: in turn, with both openings at once, or every round at once"""
+    if name == "sequential" or max_turns < 2:
+        rounds = [RoundSpec(name="debate", turns=_alternating(max_turns))]
+    elif name == "parallel_openings":
+        rounds = [RoundSpec(name="opening", parallel=True, turns=_alternating(2))]
+        if max_turns > 2:
+            rounds.append(RoundSpec(name="debate", turns=_alternating(max_turns - 2)))
+    else:
+        rounds = [RoundSpec(name=f"round_{index + 1}", parallel=True, turns=_alternating(min(2, max_turns - start)))
+                  for index, start in enumerate(range(0, max_turns, 2))]
+    return FormatSpec(seats=DEBATERS, rounds=rounds)
+
+
+@dataclass
+class TurnNode:
+    turn: int  # 1-based, in declaration order
+    speaker: str
+    side: str
+    kind: str
+    round: str
+    depends_on: Tuple[int, ...]
+    sees: Tuple[int, ...] = ()  # Every turn this one depends on, directly or transitively
+
+
+@dataclass
+class DebatePlan:
+    name: str
+    seats: Dict[str, str]
+    turns: List[TurnNode]
+
+    @property
+    def critical_path(self) -> int:
+        """Turns on the longest dependency chain: the debate's latency in turns"""
+        depth: Dict[int, int] = {}
+        for node in self.turns:
+            depth[node.turn] = 1 + max((depth[turn] for turn in node.depends_on), default=0)
+        return max(depth.values(), default=0)
+
+    def ready(self, done: Set[int], started: Set[int]) -> List[TurnNode]:
+        """Turns not yet started whose dependencies are all done"""
+        return [node for node in self.turns
+                if node.turn not in done and node.turn not in started
+                and all(turn in done for turn in node.depends_on)]
+
+
+def compile_format(name: str, spec: FormatSpec) -> DebatePlan:
+    """Number a format's turns and derive their dependencies; ValueError for an invalid format"""
+    for seat, side in spec.seats.items():
+        if side not in SIDES:
+            raise ValueError(f"Format {name}: seat {seat} has side {side} (expected pro or con)")
+    turns: List[TurnNode] = []
+    previous: Tuple[int, ...] = ()
+    for round_spec in spec.rounds:
+        entries = [entry if isinstance(entry, list) else [entry] for entry in round_spec.turns]
+        # A sequential round is a single chain
+        chains = entries if round_spec.parallel else [[turn for chain in entries for turn in chain]]
+        ends: List[int] = []
+        for chain in chains:
+            after = previous
+            for turn_spec in chain:
+                if turn_spec.speaker not in spec.seats:
+                    raise ValueError(f"Format {name}: round {round_spec.name} uses unknown seat {turn_spec.speaker}")
+                if turn_spec.kind not in TURN_INSTRUCTIONS:
+                    raise ValueError(f"Format {name}: unknown turn kind {turn_spec.kind} "
+                                     f"(expected one of {', '.join(TURN_INSTRUCTIONS)})")
+                node = TurnNode(len(turns) + 1, turn_spec.speaker, spec.seats[turn_spec.speaker],
+                                turn_spec.kind, round_spec.name, after)
+                turns.append(node)
+                after = (node.turn,)
+            ends.extend(after if chain else ())
+        if ends:
+            previous = tuple(ends)
+
+    # Dependencies always point to earlier turns, so one pass collects every ancestor
+    ancestors: Dict[int, Set[int]] = {}
+    for node in turns:
+        seen = set(node.depends_on)
+        for turn in node.depends_on:
+            seen |= ancestors[turn]
+        ancestors[node.turn] = seen
+        node.sees = tuple(sorted(seen))
+    return DebatePlan(name, dict(spec.seats), turns)
+
+
+def format_names(config: Optional[Config] = None) -> List[str]:
+    custom = list(config.formats) if config is not None else []
+    return [*GENERATED_FORMATS, *BUILTIN_FORMATS, *(name for name in custom if name not in BUILTIN_FORMATS)]
+
+
+def plan_for(config: Config) -> DebatePlan:
+    """Compile the configured debate format"""
+    name = config.debate.format
+    if name in GENERATED_FORMATS:
+        return compile_format(name, generate_format(name, config.debate.max_turns))
+    spec = config.formats.get(name) or BUILTIN_FORMATS.get(name)
+    if spec is None:
+        raise ValueError(f"Unsupported debate format: {name} (expected one of {', '.join(format_names(config))})")
+    return compile_format(name, spec)
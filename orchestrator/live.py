@@ -0,0 +1,272 @@
+"""
+Live debates for resumable, fan-out Server-Sent Events streams
+
+``POST /debate/stream`` starts the debate as a background task owned by a
+``DebateSession`` instead of inside the HTTP response. Each event gets an
+increasing id and is encoded once into an SSE frame kept in a bounded
+per-debate replay buffer. Every subscriber (the client that started the
+debate, a client resuming with ``Last-Event-ID``, or any number of viewers on
+``GET /debates/{debate_id}/events``) reads the same frames from its own
+cursor, so a viewer costs a cursor and a socket write, not a copy of the
+stream. A slow subscriber falls behind in the buffer (and eventually skips
+ahead) rather than growing a queue on the server.
+
+When the last subscriber disconnects, ``on_disconnect`` decides what happens:
+``cancel`` stops the debate (and its LLM spend) if nobody reconnects within
+``resume_grace_seconds``; ``detach`` lets it finish for later replay.
+Finished debates stay available for ``retention_seconds``.
+
+With a shared store (multi-worker serving), sessions also write their status,
+frames and result to it, and ``follow_stored`` serves a debate running on
+another worker by polling the store. Those remote subscribers do not count
+towards the disconnect policy. Debates run by broker workers
+(``orchestrator.worker``) are followed the same way through the broker.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from orchestrator.debate_loop import DebateOrchestrator
+from orchestrator.events import encode_result, sse_frame
+from config.settings import StreamConfig
+from utils.logger import setup_logger
+from utils.metrics import DEBATES_TOTAL, LIVE_DEBATES, SSE_REPLAY_GAPS, record_error
+from utils.shared_store import QUEUED, RUNNING, SharedStore, get_store
+
+logger = setup_logger(__name__)
+
+CANCEL = "cancel"
+DETACH = "detach"
+DISCONNECT_POLICIES = (CANCEL, DETACH)
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+# Seconds between shared store reads when following a debate on another worker
+STORE_POLL_INTERVAL = 0.25
+
+
+class DebateSession:
+    """One running debate, its replay buffer and its subscribers"""
+
+    def __init__(self, debate_id: str, orchestrator: DebateOrchestrator, topic: str,
+                 config: StreamConfig, on_disconnect: Optional[str] = None):
+        on_disconnect = on_disconnect or config.on_disconnect
+        if on_disconnect not in DISCONNECT_POLICIES:
+            raise ValueError(f"Unsupported disconnect policy: {on_disconnect} "
+                             f"(expected one of {', '.join(DISCONNECT_POLICIES)})")
+        self.debate_id = debate_id
+        self.orchestrator = orchestrator
+        self.topic = topic
+        self.config = config
+        self.on_disconnect = on_disconnect
+        # Encoded frames of events first_id..last_id; at least ``replay_buffer`` are kept
+        self._limit = max(1, config.replay_buffer)
+        self._frames: List[bytes] = []
+        self._first_id = 1
+        self._last_type: Optional[str] = None
+        self.last_id = 0
+        self.subscribers = 0
+        self.status = RUNNING
+        self.result: Optional[bytes] = None
+        self.done = False
+        self.finished_at: Optional[float] = None
+        self._changed: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_handle: Optional[asyncio.TimerHandle] = None
+        self.store = get_store()
+
+    def start(self):
+        if self.store is not None:
+            self.store.create_debate(self.debate_id, self.topic)
+        self._publish({"type": "session", "debate_id": self.debate_id})
+        self._task = asyncio.create_task(self._run())
+        LIVE_DEBATES.inc()
+
+    async def _run(self):
+        try:
+            async for event in self.orchestrator.stream_debate(self.topic):
+                if event["type"] == "complete":
+                    self.result = encode_result(event["result"])
+                self._publish(event)
+            self.status = "completed"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+            logger.info(f"Debate {self.debate_id} cancelled: no client reconnected")
+            DEBATES_TOTAL.labels("cancelled").inc()
+            self._publish({"type": "error", "error": "Debate cancelled after all clients disconnected"})
+        except Exception as e:
+            self.status = "failed"
+            # The pipeline has already published its error event
+            logger.error(f"Streaming debate failed: {str(e)}")
+            record_error("api", e)
+            if self._last_type != "error":
+                self._publish({"type": "error", "error": str(e)})
+        finally:
+            self.done = True
+            self.finished_at = time.monotonic()
+            if self.store is not None:
+                self.store.finish_debate(self.debate_id, self.status, self.result)
+            self._wake()
+            LIVE_DEBATES.dec()
+
+    def _publish(self, event: Dict[str, Any]):
+        self.last_id += 1
+        self._last_type = event["type"]
+        frame = sse_frame(self.last_id, event)
+        self._frames.append(frame)
+        if self.store is not None:
+            self.store.append_event(self.debate_id, self.last_id, frame)
+        if len(self._frames) >= 2 * self._limit:
+            # Trim in bulk so appends stay amortized O(1)
+            drop = len(self._frames) - self._limit
+            del self._frames[:drop]
+            self._first_id += drop
+        self._wake()
+
+    def _wake(self):
+        # Resolves the future every current waiter holds; later waiters get a fresh one
+        self._changed.set_result(None)
+        self._changed = asyncio.get_running_loop().create_future()
+
+    def _since(self, cursor: int) -> Tuple[List[bytes], int]:
+        """Buffered frames after event ``cursor`` and how many events were evicted before them"""
+        if cursor >= self.last_id:
+            return [], 0
+        start = max(cursor + 1, self._first_id)
+        return self._frames[start - self._first_id:], start - cursor - 1
+
+    async def frames(self, last_event_id: int = 0) -> AsyncIterator[bytes]:
+        """SSE frames for events after ``last_event_id`` until the debate ends
+
+        Frames that queued up while the subscriber was writing are sent as one
+        chunk. A heartbeat comment goes out when nothing happened for
+        ``heartbeat_seconds``; a subscriber that fell behind the replay buffer
+        gets a ``gap`` event and continues from the oldest buffered event.
+        """
+        self._attach()
+        try:
+            cursor = last_event_id
+            while True:
+                pending, missed = self._since(cursor)
+                if pending:
+                    chunk = b"".join(pending)
+                    if missed:
+                        SSE_REPLAY_GAPS.inc()
+                        chunk = sse_frame(cursor, {"type": "gap", "missed": missed}) + chunk
+                    cursor += missed + len(pending)
+                    yield chunk
+                    continue
+                if self.done:
+                    return
+                # Taken right after checking the buffer, so no event can slip in between
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(asyncio.shield(changed), self.config.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+        finally:
+            self._detach()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "debate_id": self.debate_id,
+            "topic": self.topic,
+            "status": self.status,
+            "worker": self.store.worker if self.store is not None else None,
+            "subscribers": self.subscribers,
+            "last_event_id": self.last_id
+        }
+
+    def _attach(self):
+        self.subscribers += 1
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+
+    def _detach(self):
+        self.subscribers -= 1
+        if self.subscribers or self.done or self.on_disconnect != CANCEL:
+            return
+        logger.info(f"Debate {self.debate_id}: all subscribers disconnected, "
+                    f"cancelling in {self.config.resume_grace_seconds}s unless one resumes")
+        self._cancel_handle = asyncio.get_running_loop().call_later(
+            self.config.resume_grace_seconds, self._cancel_abandoned)
+
+    def _cancel_abandoned(self):
+        self._cancel_handle = None
+        if not self.subscribers and self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def cancel(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+class LiveDebates:
+    """Running and recently finished debates by id"""
+
+    def __init__(self):
+        self._sessions: Dict[str, DebateSession] = {}
+
+    def start(self, orchestrator: DebateOrchestrator, topic: str, config: StreamConfig,
+              on_disconnect: Optional[str] = None) -> DebateSession:
+        self._prune()
+        session = DebateSession(uuid.uuid4().hex, orchestrator, topic, config, on_disconnect)
+        self._sessions[session.debate_id] = session
+        session.start()
+        return session
+
+    def get(self, debate_id: str) -> Optional[DebateSession]:
+        self._prune()
+        return self._sessions.get(debate_id)
+
+    def list(self) -> List[DebateSession]:
+        self._prune()
+        return list(self._sessions.values())
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [debate_id for debate_id, session in self._sessions.items()
+                   if session.done and now - session.finished_at > session.config.retention_seconds]
+        for debate_id in expired:
+            del self._sessions[debate_id]
+
+    def shutdown(self):
+        """Cancel every running debate"""
+        for session in self._sessions.values():
+            session.cancel()
+        self._sessions.clear()
+
+
+live_debates = LiveDebates()
+
+
+async def follow_stored(store: SharedStore, debate_id: str, last_event_id: int, config: StreamConfig,
+                        stale_after_seconds: float) -> AsyncIterator[bytes]:
+    """SSE frames of a debate run by another worker, read from the shared store (or a job broker)"""
+    cursor = last_event_id
+    idle = 0.0
+    while True:
+        # Status first: once it is final, every frame is already in the store
+        found = await store.get_debate(debate_id)
+        if found is None:
+            return
+        record, _ = found
+        rows = await store.events_after(debate_id, cursor)
+        if rows:
+            cursor = rows[-1][0]
+            idle = 0.0
+            yield b"".join(frame for _, frame in rows)
+            continue
+        if record["status"] not in (QUEUED, RUNNING):
+            return
+        if record["status"] == RUNNING and time.time() - record["updated_at"] > stale_after_seconds:
+            yield sse_frame(cursor, {"type": "error", "error": "Debate lost: its worker stopped reporting"})
+            return
+        await asyncio.sleep(STORE_POLL_INTERVAL)
+        idle += STORE_POLL_INTERVAL
+        if idle >= config.heartbeat_seconds:
+            idle = 0.0
+            yield HEARTBEAT_FRAME
@@ -2,27 +2,164 @@
 Memory management for the debate system
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import json
 from collections import deque
 
 from agents.base_agent import Message
+from config.settings import ClaimIndexConfig
 from utils.logger import setup_logger
+from utils.metrics import PROMPT_CHARS_COLLAPSED
+from utils.text_similarity import LSHIndex, MinHasher, Signature, sentences, shingles, word_count
 
 logger = setup_logger(__name__)
 
+
+def _marker(turns: List[int], current: int) -> str:
+    names = [f"turn {turn}" for turn in sorted(turns) if turn != current]
+    if current in turns:
+        names.append("earlier in this turn")
+    return f"[Repeats {', '.join(names)}]"
+
+
+class ClaimIndex:
+    """Claims (sentences) of a debate's turns, grouped into near-duplicates as turns arrive
+
+    Each sentence of a PRO/CON turn is shingled and MinHashed once, when the
+    turn is added; an LSH lookup finds earlier claims it may repeat, and the
+    closest one at or above ``similarity_threshold`` gives it that claim's id.
+    Collapsing a list of turns is then a pass over the stored ids: a sentence
+    whose claim already appeared earlier in the list becomes a
+    ``[Repeats turn N]`` marker (one marker per run of them), so a reader sees
+    every claim once, where it first appeared.
+    """
+
+    def __init__(self, config: ClaimIndexConfig):
+        self.config = config
+        self.hasher = MinHasher(config.num_perm)
+        self.lsh = LSHIndex(config.bands)
+        self._claims: List[Signature] = []  # Signature of each claim's first sentence, by claim id
+        # Turn -> its sentences as (sentence, following whitespace, claim id or None when too short, words)
+        self._turns: Dict[int, List[Tuple[str, str, Optional[int], int]]] = {}
+        self._speakers: Dict[int, str] = {}
+
+    def add(self, message: Message):
+        turn = message.metadata.get("turn")
+        if message.role not in ("pro", "con") or turn is None or turn in self._turns:
+            return
+        entries = []
+        for sentence, separator in sentences(message.content):
+            words = word_count(sentence)
+            claim = None
+            if words >= self.config.min_words:
+                claim = self._claim(self.hasher.signature(shingles(sentence, self.config.shingle_size)))
+            entries.append((sentence, separator, claim, words))
+        self._turns[turn] = entries
+        self._speakers[turn] = message.metadata.get("speaker", message.role)
+
+    def _claim(self, signature: Signature) -> int:
+        """Id of the claim the sentence repeats, or of a new claim"""
+        best, best_similarity = None, self.config.similarity_threshold
+        for claim in self.lsh.query(signature):
+            similarity = MinHasher.similarity(signature, self._claims[claim])
+            if similarity >= best_similarity:
+                best, best_similarity = claim, similarity
+        if best is None:
+            best = len(self._claims)
+            self._claims.append(signature)
+            self.lsh.add(best, signature)
+        return best
+
+    def collapse(self, messages: List[Message]) -> Tuple[List[Message], int]:
+        """The messages with claims repeated from earlier in the list collapsed, and the characters saved
+
+        Messages that are not indexed turns pass through; collapsed turns are new
+        ``Message`` objects, the originals (and the transcript) keep their text.
+        """
+        first: Dict[int, int] = {}  # Claim id -> turn of its first appearance in the list
+        collapsed: List[Message] = []
+        saved = 0
+        for message in messages:
+            turn = message.metadata.get("turn")
+            entries = self._turns.get(turn) if message.role in ("pro", "con") else None
+            if not entries:
+                collapsed.append(message)
+                continue
+            parts: List[str] = []
+            repeats: List[int] = []
+            separator_after = ""
+            for sentence, separator, claim, _ in entries:
+                if claim is not None and claim in first:
+                    if first[claim] not in repeats:
+                        repeats.append(first[claim])
+                    separator_after = separator
+                    continue
+                if repeats:
+                    parts.append(_marker(repeats, turn) + separator_after)
+                    repeats = []
+                if claim is not None:
+                    first[claim] = turn
+                parts.append(sentence + separator)
+            if repeats:
+                parts.append(_marker(repeats, turn))
+            content = "".join(parts)
+            if len(content) < len(message.content):
+                saved += len(message.content) - len(content)
+                message = Message(role=message.role, content=content, timestamp=message.timestamp,
+                                  metadata=message.metadata)
+            collapsed.append(message)
+        return collapsed, saved
+
+    def summary(self) -> Dict[str, Any]:
+        """Claim counts and redundancy (share of sentence words repeating an earlier claim), in turn order"""
+        first = set()
+        words = repeated_words = sentence_count = repeated = 0
+        speakers: Dict[str, List[int]] = {}
+        for turn in sorted(self._turns):
+            totals = speakers.setdefault(self._speakers[turn], [0, 0])
+            for _, _, claim, count in self._turns[turn]:
+                if claim is None:
+                    continue
+                sentence_count += 1
+                words += count
+                totals[0] += count
+                if claim in first:
+                    repeated += 1
+                    repeated_words += count
+                    totals[1] += count
+                first.add(claim)
+        return {
+            "claims": len(self._claims),
+            "sentences": sentence_count,
+            "repeated_sentences": repeated,
+            "redundancy": round(repeated_words / words, 3) if words else 0.0,
+            "by_speaker": {speaker: round(repeats / total, 3) if total else 0.0
+                           for speaker, (total, repeats) in speakers.items()}
+        }
+
+    def clear(self):
+        self.lsh.clear()
+        self._claims.clear()
+        self._turns.clear()
+        self._speakers.clear()
+
 class MemoryManager:
     """Manages conversation memory and context"""
     
-    def __init__(self, max_memory_size: int = 1000):
+    def __init__(self, max_memory_size: int = 1000, claims: Optional[ClaimIndexConfig] = None):
         self.max_memory_size = max_memory_size
         self.messages: deque = deque(maxlen=max_memory_size)
         self.metadata: Dict[str, Any] = {}
+        # Near-duplicate claims of the debate's turns, built as they are added
+        self.claims = ClaimIndex(claims) if claims is not None and claims.enabled else None
+        self.collapsed_chars: Dict[str, int] = {}
         logger.info(f"Memory manager initialized with max size: {max_memory_size}")
     
     def add_message(self, message: Message):
         """Add a message to memory"""
         self.messages.append(message)
+        if self.claims is not None:
+            self.claims.add(message)
         logger.debug(f"Added message to memory: {message.role} ({len(message.content)} chars)")
     
     def get_messages(self, 
@@ -55,10 +192,31 @@ class MemoryManager:
             limit=limit
         )
     
+    def collapse_repeats(self, messages: List[Message], prompt: str) -> List[Message]:
+        """Messages with repeated claims collapsed (as they are without a claim index)
+        
+        ``prompt`` names the reader (context, judge) in the collapsed-characters stats.
+        """
+        if self.claims is None:
+            return messages
+        collapsed, saved = self.claims.collapse(messages)
+        self.collapsed_chars[prompt] = self.collapsed_chars.get(prompt, 0) + saved
+        PROMPT_CHARS_COLLAPSED.labels(prompt).inc(saved)
+        return collapsed
+    
+    def claim_summary(self) -> Optional[Dict[str, Any]]:
+        """Redundancy of the debate's turns and characters collapsed out of prompts, if claims are indexed"""
+        if self.claims is None:
+            return None
+        return {**self.claims.summary(), "collapsed_chars": dict(self.collapsed_chars)}
+    
     def clear_memory(self):
         """Clear all memory"""
         self.messages.clear()
         self.metadata.clear()
+        self.collapsed_chars.clear()
+        if self.claims is not None:
+            self.claims.clear()
         logger.info("Memory cleared")
     
     def get_memory_stats(self) -> Dict[str, Any]:
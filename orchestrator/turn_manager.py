@@ -14,7 +14,7 @@ logger = setup_logger(__name__)
 @dataclass
 class TurnState:
     current_turn: int = 0
-    start_time: float = 0
+    start_time: float = 0  # time.monotonic() seconds, not wall-clock
     last_turn_time: float = 0
     max_turns: int = 10
     max_time: int = 1800
@@ -29,7 +29,7 @@ class TurnManager:
             max_turns=config.max_turns,
             max_time=config.max_time,
             turn_timeout=config.turn_timeout,
-            start_time=time.time()
+            start_time=time.monotonic()
         )
         logger.info(f"Turn manager initialized: max_turns={config.max_turns}, max_time={config.max_time}s")
     
@@ -41,12 +41,12 @@ class TurnManager:
     def advance_turn(self):
         """Advance to the next turn"""
         self.state.current_turn += 1
-        self.state.last_turn_time = time.time()
+        self.state.last_turn_time = time.monotonic()
         logger.debug(f"Advanced to turn {self.state.current_turn}")
     
     def is_debate_finished(self) -> bool:
         """Check if the debate should end"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Check turn limit
         if self.state.current_turn >= self.state.max_turns:
@@ -65,7 +65,7 @@ class TurnManager:
         if self.state.last_turn_time == 0:
             return False
         
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.state.last_turn_time >= self.state.turn_timeout:
             logger.warning(f"Turn timeout: {self.state.turn_timeout}s exceeded")
             return True
@@ -74,7 +74,7 @@ class TurnManager:
     
     def get_remaining_time(self) -> float:
         """Get remaining time for the debate"""
-        current_time = time.time()
+        current_time = time.monotonic()
         elapsed = current_time - self.state.start_time
         return max(0, self.state.max_time - elapsed)
     
@@ -84,7 +84,7 @@ class TurnManager:
     
     def get_stats(self) -> dict:
         """Get current turn statistics"""
-        current_time = time.time()
+        current_time = time.monotonic()
         return {
             "current_turn": self.state.current_turn,
             "remaining_turns": self.get_remaining_turns(),
@@ -0,0 +1,208 @@
+"""
+Debate workers: run debates claimed from a job broker
+
+``python main.py --mode worker`` runs a ``DebateWorker``. It claims up to
+``queue.concurrency`` jobs at a time, runs each debate with the config the API
+node enqueued (API keys come from the worker's own environment, plus any the
+request carried), and writes every event to the broker's debate log, from
+which the API node streams it.
+
+While a debate runs, its lease is renewed every third of ``lease_seconds``.
+Every finished turn is a ``message`` event in the log and the research result
+is checkpointed once, so a job delivered again after its worker died
+continues with the turn after the last one in the log. Event ids continue
+after the last event the log holds; phase and progress events of the
+interrupted run may appear twice. On shutdown a worker cancels its debates
+and releases their leases, so other workers resume them right away.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from agents.base_agent import Message
+from config.settings import Config, QueueConfig, load_config
+from orchestrator.debate_loop import DebateCheckpoint, DebateOrchestrator
+from orchestrator.events import decode_frame, encode_result, sse_frame
+from utils import fast_json
+from utils.job_broker import Job, JobBroker
+from utils.logger import setup_logger
+from utils.metrics import DEBATE_JOBS, record_error
+from utils.shared_store import QUEUED, RUNNING
+
+logger = setup_logger(__name__)
+
+
+def job_payload(topic: str, config: Config, api_keys: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Job for a debate; only keys supplied with the request travel through the broker"""
+    return {"topic": topic, "config": config.model_dump(exclude={"api_keys"}), "api_keys": api_keys or {}}
+
+
+def job_config(payload: Dict[str, Any]) -> Config:
+    config = Config(**payload["config"])
+    config.api_keys = {**load_config().api_keys, **payload["api_keys"]}
+    return config
+
+
+class DebateWorker:
+    """Claims jobs from a broker and runs their debates"""
+
+    def __init__(self, broker: JobBroker, config: QueueConfig):
+        self.broker = broker
+        self.config = config
+        self._tasks: Set[asyncio.Task] = set()
+        self._lost: Set[str] = set()
+        self._stop = asyncio.Event()
+
+    async def run(self):
+        """Claim and run jobs until ``stop``; returns once every job was handed back"""
+        slots = asyncio.Semaphore(max(1, self.config.concurrency))
+        logger.info(f"Worker {self.broker.worker} running up to {self.config.concurrency} debates")
+
+        def release(task: asyncio.Task):
+            self._tasks.discard(task)
+            slots.release()
+
+        while not self._stop.is_set():
+            await slots.acquire()
+            if self._stop.is_set():
+                break
+            try:
+                job = await self.broker.claim(self.config.lease_seconds)
+            except Exception as e:
+                logger.error(f"Claiming a job failed: {str(e)}")
+                record_error("worker", e)
+                job = None
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.config.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._process(job))
+            self._tasks.add(task)
+            task.add_done_callback(release)
+        await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        try:
+            await self.broker.flush()
+        except Exception as e:
+            logger.error(f"Flushing the broker failed: {str(e)}")
+
+    def stop(self):
+        """Stop claiming, cancel running debates and hand their jobs back to the broker"""
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+
+    async def _keep_leased(self, job: Job, task: asyncio.Task):
+        while True:
+            await asyncio.sleep(max(0.1, self.config.lease_seconds / 3))
+            try:
+                renewed = await self.broker.renew(job, self.config.lease_seconds)
+            except Exception as e:
+                # The lease may still be renewed before it runs out
+                logger.warning(f"Renewing the lease of debate {job.job_id} failed: {str(e)}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost the lease of debate {job.job_id}; stopping it here")
+                self._lost.add(job.job_id)
+                task.cancel()
+                return
+
+    async def _process(self, job: Job):
+        debate_id = job.job_id
+        DEBATE_JOBS.labels("redelivered" if job.attempts > 1 else "claimed").inc()
+        keeper = asyncio.create_task(self._keep_leased(job, asyncio.current_task()))
+        try:
+            found = await self.broker.get_debate(debate_id)
+            if found is None or found[0]["status"] not in (QUEUED, RUNNING):
+                # Expired, or finished by a worker whose lease ran out just before
+                await self.broker.complete(job)
+                return
+            last_id = found[0]["last_event_id"]
+            if job.attempts > self.config.max_attempts:
+                logger.error(f"Debate {debate_id} abandoned after {job.attempts - 1} attempts")
+                DEBATE_JOBS.labels("abandoned").inc()
+                error = {"type": "error", "error": f"Debate abandoned after {job.attempts - 1} failed attempts"}
+                self.broker.append_event(debate_id, last_id + 1, sse_frame(last_id + 1, error))
+                self.broker.finish_debate(debate_id, "failed")
+            else:
+                await self._run(job, last_id)
+                DEBATE_JOBS.labels("completed").inc()
+            await self.broker.flush()
+            await self.broker.complete(job)
+        except asyncio.CancelledError:
+            if debate_id in self._lost:
+                self._lost.discard(debate_id)
+                DEBATE_JOBS.labels("lease_lost").inc()
+            else:
+                # Shutting down: let the next worker take over now rather than after the lease
+                try:
+                    await self.broker.flush()
+                    await self.broker.renew(job, 0)
+                except Exception as e:
+                    logger.error(f"Handing back debate {debate_id} failed: {str(e)}")
+        except Exception as e:
+            # Broker unreachable, or a write of the debate failed: the lease runs out and the job
+            # is delivered again
+            logger.error(f"Job {debate_id} failed: {str(e)}")
+            record_error("worker", e)
+        finally:
+            keeper.cancel()
+
+    async def _checkpoint(self, debate_id: str) -> Optional[DebateCheckpoint]:
+        """Research checkpoint and the turns in the debate's event log, if research had finished"""
+        data = await self.broker.get_checkpoint(debate_id)
+        if data is None:
+            return None
+        messages = []
+        cursor = 0
+        while True:
+            rows = await self.broker.events_after(debate_id, cursor)
+            if not rows:
+                break
+            for _, frame in rows:
+                _, event = decode_frame(frame)
+                if event["type"] == "message" and event["message"]["role"] in ("pro", "con"):
+                    messages.append(Message(**event["message"]))
+            cursor = rows[-1][0]
+        return DebateCheckpoint(fast_json.loads(data)["research_context"], messages)
+
+    async def _run(self, job: Job, last_id: int):
+        """Run (or resume) the debate, writing its events, checkpoint and outcome to the broker"""
+        debate_id = job.job_id
+        topic = job.payload["topic"]
+        resume = await self._checkpoint(debate_id) if last_id else None
+        if resume is not None:
+            logger.info(f"Resuming debate {debate_id} after turn {len(resume.messages)} (attempt {job.attempts})")
+        orchestrator = DebateOrchestrator(job_config(job.payload))
+        self.broker.start_debate(debate_id)
+
+        event_id = last_id
+        last_type = None
+
+        def publish(event: Dict[str, Any]):
+            nonlocal event_id, last_type
+            event_id += 1
+            last_type = event["type"]
+            self.broker.append_event(debate_id, event_id, sse_frame(event_id, event))
+
+        if not last_id:
+            publish({"type": "session", "debate_id": debate_id})
+        status, result = "completed", None
+        try:
+            async for event in orchestrator.stream_debate(topic, resume):
+                if event["type"] == "message" and event["message"]["metadata"].get("phase") == "research_complete":
+                    self.broker.save_checkpoint(
+                        debate_id, fast_json.dumps({"research_context": orchestrator.research_context}))
+                elif event["type"] == "complete":
+                    result = encode_result(event["result"])
+                publish(event)
+        except Exception as e:
+            status = "failed"
+            logger.error(f"Debate {debate_id} failed: {str(e)}")
+            record_error("worker", e)
+            # The pipeline has usually published its error event already
+            if last_type != "error":
+                publish({"type": "error", "error": str(e)})
+        self.broker.finish_debate(debate_id, status, result)
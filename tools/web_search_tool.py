@@ -9,6 +9,11 @@ from urllib.parse import quote_plus
 import json
 
 from utils.logger import setup_logger
+from utils.timing import timed, monotonic_ns, SEARCH
+from utils.metrics import SEARCH_REQUEST_DURATION, record_error
+from utils.tracing import tracer
+from utils.mock_llm import MockSearch
+from utils.shared_store import result_cache
 
 logger = setup_logger(__name__)
 
@@ -21,26 +26,49 @@ class WebSearchTool:
         self.provider = config.get("provider", "duckduckgo")
         self.max_results = config.get("max_results", 5)
         self.timeout = config.get("timeout", 30)
+        self._latency_metric = SEARCH_REQUEST_DURATION.labels(self.provider)
+        self.mock = MockSearch(**config.get("mock", {})) if self.provider == "mock" else None
         
         logger.info(f"Web search tool initialized with provider: {self.provider}")
     
     async def search(self, query: str) -> List[Dict[str, Any]]:
         """Perform web search using the configured provider"""
+        cache_key = result_cache.key(self.provider, self.max_results, query)
+        cached = await result_cache.get("search", cache_key)
+        if cached is not None:
+            logger.info(f"Search cache hit for: {query}")
+            return cached
+        
         logger.info(f"Searching for: {query}")
         
+        start_ns = monotonic_ns()
         try:
-            if self.provider == "duckduckgo":
-                return await self._search_duckduckgo(query)
-            elif self.provider == "tavily":
-                return await self._search_tavily(query)
-            elif self.provider == "serpapi":
-                return await self._search_serpapi(query)
-            else:
-                raise ValueError(f"Unsupported search provider: {self.provider}")
+            with timed(SEARCH), tracer.span("web_search.search", **{
+                "search.provider": self.provider,
+                "search.query": query,
+                "search.max_results": self.max_results
+            }) as span:
+                if self.provider == "duckduckgo":
+                    results = await self._search_duckduckgo(query)
+                elif self.provider == "tavily":
+                    results = await self._search_tavily(query)
+                elif self.provider == "serpapi":
+                    results = await self._search_serpapi(query)
+                elif self.provider == "mock":
+                    results = await self.mock.search(query, self.max_results)
+                else:
+                    raise ValueError(f"Unsupported search provider: {self.provider}")
+                span.set_attribute("search.result_count", len(results))
+                if results:
+                    result_cache.put("search", cache_key, results)
+                return results
                 
         except Exception as e:
             logger.error(f"Search failed: {str(e)}")
+            record_error("search", e)
             return []
+        finally:
+            self._latency_metric.observe((monotonic_ns() - start_ns) / 1_000_000_000)
     
     async def _search_duckduckgo(self, query: str) -> List[Dict[str, Any]]:
         """Search using DuckDuckGo (free, no API key required)"""
@@ -0,0 +1,255 @@
+"""
+Append-only column files, readable as memory-mapped arrays
+
+A table is a directory holding one file per column of fixed-width
+little-endian values, the layout NumPy and Arrow use in memory, so a reader
+maps the files instead of parsing anything:
+
+- ``number``: float64, NaN when missing;
+- ``category``: int32 codes into a dictionary of strings (-1 when missing).
+  Model names, providers and winners repeat, so a row costs 4 bytes and
+  grouping works on integers. ``category:<name>`` columns share the
+  dictionary ``<name>``, so e.g. the PRO and CON model columns use the same
+  codes;
+- ``text``: UTF-8 bytes plus one int64 end offset per row (Arrow's string
+  layout without the leading zero).
+
+``_table.json`` holds the schema, the dictionaries and the row count. It is
+replaced atomically after the column files are written, which makes it the
+commit point: readers only map committed rows, and the bytes of an append
+that was cut short are truncated on the next append. Writers in several
+processes take an exclusive lock on the table for each append.
+
+``read`` maps columns with ``numpy.memmap`` when NumPy is installed and
+otherwise with ``mmap`` and ``memoryview.cast``, which hold the same values
+as Python sequences.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; appends from several processes are then unsafe
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMBER = "number"
+CATEGORY = "category"
+TEXT = "text"
+
+META_FILE = "_table.json"
+
+# Column type -> (array typecode, NumPy dtype)
+_NUMBER = ("d", "<f8")
+_CODE = ("i", "<i4")
+_OFFSET = ("q", "<i8")
+
+
+def column_kind(column_type: str) -> str:
+    return column_type.split(":", 1)[0]
+
+
+def dictionary_name(column: str, column_type: str) -> str:
+    """Dictionary of a category column: its own, or the one named after ``category:``"""
+    return column_type.split(":", 1)[1] if ":" in column_type else column
+
+
+def _check_schema(schema: Dict[str, str]):
+    for column, column_type in schema.items():
+        if column_kind(column_type) not in (NUMBER, CATEGORY, TEXT):
+            raise ValueError(f"Column {column}: unsupported type {column_type} "
+                             f"(expected {NUMBER}, {CATEGORY}[:dictionary] or {TEXT})")
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else float("nan")
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+class TextColumn(Sequence):
+    """Strings of a text column, decoded on access"""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start = int(self._offsets[index - 1]) if index else 0
+        return bytes(self._data[start:int(self._offsets[index])]).decode("utf-8")
+
+
+class ColumnTable:
+    """An append-only table of typed column files in ``directory``"""
+
+    def __init__(self, directory: str, schema: Dict[str, str]):
+        _check_schema(schema)
+        self.directory = Path(directory)
+        self.schema = dict(schema)
+        self.rows = 0
+        self.dictionaries: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self.refresh()
+            if not (self.directory / META_FILE).exists():
+                self._commit()
+
+    # Files and metadata
+
+    def _files(self, column: str) -> List[Path]:
+        kind = column_kind(self.schema[column])
+        if kind == TEXT:
+            return [self.directory / f"{column}.offsets", self.directory / f"{column}.utf8"]
+        return [self.directory / f"{column}.{'f64' if kind == NUMBER else 'i32'}"]
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self.directory / f"{META_FILE}.lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Load the committed row count and dictionaries (other processes may have appended)"""
+        path = self.directory / META_FILE
+        if not path.exists():
+            return
+        meta = json.loads(path.read_text())
+        if meta["schema"] != self.schema:
+            raise ValueError(f"Column table {self.directory} has columns {', '.join(meta['schema'])}, "
+                             f"expected {', '.join(self.schema)}")
+        self.rows = meta["rows"]
+        self.dictionaries = meta["dictionaries"]
+        self._codes = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self.dictionaries.items()}
+
+    def _commit(self):
+        path = self.directory / META_FILE
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"schema": self.schema, "rows": self.rows,
+                                         "dictionaries": self.dictionaries}))
+        os.replace(temporary, path)
+
+    def _committed_size(self, column: str) -> List[int]:
+        """Bytes of each file of a column that belong to committed rows"""
+        kind = column_kind(self.schema[column])
+        if kind == NUMBER:
+            return [self.rows * 8]
+        if kind == CATEGORY:
+            return [self.rows * 4]
+        return [self.rows * 8, self._text_end(column)]
+
+    def _text_end(self, column: str) -> int:
+        if not self.rows:
+            return 0
+        with open(self._files(column)[0], "rb") as offsets:
+            offsets.seek((self.rows - 1) * 8)
+            return int.from_bytes(offsets.read(8), "little")
+
+    # Writing
+
+    def _code(self, column: str, value: Any) -> int:
+        if value is None or value == "":
+            return -1
+        name = dictionary_name(column, self.schema[column])
+        codes = self._codes.setdefault(name, {})
+        value = str(value)
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.dictionaries.setdefault(name, []).append(value)
+        return code
+
+    def append(self, rows: List[Dict[str, Any]]) -> int:
+        """Append rows (missing columns are missing values); returns the new row count"""
+        if not rows:
+            return self.rows
+        with self._locked():
+            self.refresh()
+            for column, column_type in self.schema.items():
+                kind = column_kind(column_type)
+                files = self._files(column)
+                values = [row.get(column) for row in rows]
+                if kind == NUMBER:
+                    chunks = [_little_endian(array(_NUMBER[0], map(_number, values)))]
+                elif kind == CATEGORY:
+                    chunks = [_little_endian(array(_CODE[0], (self._code(column, value) for value in values)))]
+                else:
+                    data = [str(value).encode("utf-8") if value is not None else b"" for value in values]
+                    offsets, end = array(_OFFSET[0]), self._text_end(column)
+                    for item in data:
+                        end += len(item)
+                        offsets.append(end)
+                    chunks = [_little_endian(offsets), b"".join(data)]
+                for path, size, chunk in zip(files, self._committed_size(column), chunks):
+                    with open(path, "ab") as handle:
+                        # Drop anything past the committed rows: an append cut short
+                        if handle.tell() != size:
+                            handle.truncate(size)
+                        handle.write(chunk)
+            self.rows += len(rows)
+            self._commit()
+        return self.rows
+
+    # Reading
+
+    def _map(self, path: Path, length: int, types) -> Any:
+        """The first ``length`` values of a column file, memory-mapped"""
+        typecode, dtype = types
+        if not length:
+            return np.zeros(0, dtype=dtype) if np is not None else memoryview(array(typecode))
+        if np is not None:
+            return np.memmap(path, dtype=dtype, mode="r", shape=(length,))
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped)[:length * array(typecode).itemsize].cast(typecode)
+
+    def column(self, column: str):
+        """A committed column: numbers or category codes as an array, text as a ``TextColumn``"""
+        kind = column_kind(self.schema[column])
+        files = self._files(column)
+        if kind == NUMBER:
+            return self._map(files[0], self.rows, _NUMBER)
+        if kind == CATEGORY:
+            return self._map(files[0], self.rows, _CODE)
+        end = self._text_end(column)
+        return TextColumn(self._map(files[0], self.rows, _OFFSET), self._map(files[1], end, ("B", "u1")))
+
+    def read(self, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Committed columns by name (all by default)"""
+        self.refresh()
+        return {column: self.column(column) for column in (columns or self.schema)}
+
+    def categories(self, column: str) -> List[str]:
+        """Values of a category column's codes, in code order"""
+        return self.dictionaries.get(dictionary_name(column, self.schema[column]), [])
@@ -0,0 +1,435 @@
+"""
+Columnar analytics over finished debates
+
+With ``analytics.path`` set, every completed debate (API, streamed, broker
+worker or CLI) is appended, as it finishes, to two column tables
+(utils/column_store.py) in that directory:
+
+- ``debates``: one row per debate with its id (the archive's content hash),
+  time, topic, format, winner, model and provider per seat, scores, duration,
+  turn count, token totals, cost and the judge's ``analysis`` (JSON text);
+- ``turns``: one row per PRO/CON turn with its debate's row number, turn,
+  speaker, side, kind, model, provider, LLM latency, turn duration, queue
+  wait, tokens and length.
+
+``python main.py --mode report`` maps the columns and computes win rates and
+debate-duration percentiles by model pairing, Elo ratings by model and
+turn-latency percentiles by model. The aggregations group on integer
+category codes over whole columns (``numpy.bincount``, one sort per group
+for percentiles) when NumPy is installed, and run the same computations in
+pure Python otherwise. Elo ratings are a Bradley-Terry fit to the pairing
+win counts, so they do not depend on the order debates finished in.
+``--import`` appends saved results and ``--export`` writes the tables as
+Parquet or Arrow files with pyarrow.
+"""
+
+import math
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils import fast_json
+from utils.column_store import CATEGORY, NUMBER, TEXT, ColumnTable, column_kind, np
+from utils.debate_archive import archive_row
+from utils.logger import setup_logger
+from utils.text_similarity import word_count
+
+logger = setup_logger(__name__)
+
+DEBATE_COLUMNS = {
+    "debate_id": TEXT,
+    "created_at": NUMBER,
+    "topic": TEXT,
+    "format": CATEGORY,
+    "winner": CATEGORY,
+    "pro_model": f"{CATEGORY}:model",
+    "pro_provider": f"{CATEGORY}:provider",
+    "con_model": f"{CATEGORY}:model",
+    "con_provider": f"{CATEGORY}:provider",
+    "judge_model": f"{CATEGORY}:model",
+    "judge_provider": f"{CATEGORY}:provider",
+    "pro_score": NUMBER,
+    "con_score": NUMBER,
+    "duration": NUMBER,
+    "turns": NUMBER,
+    "prompt_tokens": NUMBER,
+    "completion_tokens": NUMBER,
+    "cost_usd": NUMBER,
+    "analysis": TEXT
+}
+
+TURN_COLUMNS = {
+    "debate": NUMBER,  # Row of the debate in the debates table
+    "turn": NUMBER,
+    "speaker": CATEGORY,
+    "side": CATEGORY,
+    "kind": CATEGORY,
+    "model": CATEGORY,
+    "provider": CATEGORY,
+    "latency_ms": NUMBER,  # LLM calls of the turn
+    "duration_ms": NUMBER,  # Whole turn, including queue_wait; not the pacing between turns
+    "queue_wait_ms": NUMBER,  # Waiting for a provider slot
+    "prompt_tokens": NUMBER,
+    "completion_tokens": NUMBER,
+    "cached_tokens": NUMBER,
+    "words": NUMBER
+}
+
+PERCENTILES = (50, 90, 99)
+ELO_START = 1500.0
+
+# Winner category values the report counts (errors and missing judgments are skipped)
+OUTCOMES = ("PRO", "CON", "TIE")
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+
+def _log_failure(future: Future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Exporting a debate for analytics failed: {str(error)}")
+
+
+def _total(values: List[Any]) -> Optional[float]:
+    numbers = [value for value in values if isinstance(value, (int, float))]
+    return sum(numbers) if numbers else None
+
+
+def analytics_rows(result: Dict[str, Any], encoded: bytes) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """The debates row of a result and its turns rows (``debate`` left for the caller)"""
+    facets, _ = archive_row(result, encoded)
+    metadata = result.get("metadata") or {}
+    agents = list(((metadata.get("usage") or {}).get("agents") or {}).values())
+    debate = {
+        **facets,
+        "debate_id": facets["archive_id"],
+        "prompt_tokens": _total([agent.get("prompt_tokens") for agent in agents]),
+        "completion_tokens": _total([agent.get("completion_tokens") for agent in agents]),
+        "cost_usd": _total([agent.get("cost_usd") for agent in agents]),
+        "analysis": fast_json.dumps(metadata["analysis"]).decode() if metadata.get("analysis") else None
+    }
+    turns = []
+    for message in result.get("transcript") or []:
+        if message.get("role") not in ("pro", "con"):
+            continue
+        turn_metadata = message.get("metadata") or {}
+        agent_config = turn_metadata.get("agent_config") or {}
+        usage = turn_metadata.get("usage") or {}
+        timings = turn_metadata.get("timings") or {}
+        turns.append({
+            "turn": turn_metadata.get("turn"),
+            "speaker": turn_metadata.get("speaker", message["role"]),
+            "side": message["role"],
+            "kind": turn_metadata.get("kind", "argument"),
+            "model": agent_config.get("model") or facets[f"{message['role']}_model"],
+            "provider": agent_config.get("provider") or facets[f"{message['role']}_provider"],
+            "latency_ms": usage.get("latency_ms"),
+            "duration_ms": timings.get("duration_ms"),
+            "queue_wait_ms": (timings.get("segments_ms") or {}).get("queue_wait"),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "cached_tokens": usage.get("cached_tokens"),
+            "words": word_count(message.get("content", ""))
+        })
+    return debate, turns
+
+
+class DebateAnalytics:
+    """Appends finished debates to the ``debates`` and ``turns`` column tables in ``path``"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.debates = ColumnTable(str(Path(path) / "debates"), DEBATE_COLUMNS)
+        self.turns = ColumnTable(str(Path(path) / "turns"), TURN_COLUMNS)
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="debate-analytics")
+        self._ids: Set[str] = set()
+        self._known = 0  # Debates rows whose ids are in ``_ids``
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _append(self, results: List[Tuple[Dict[str, Any], bytes]]) -> int:
+        self.debates.refresh()
+        ids = self.debates.column("debate_id")
+        self._ids.update(ids[self._known:])
+        self._known = len(ids)
+
+        debates, turns = [], []
+        for result, encoded in results:
+            debate, debate_turns = analytics_rows(result, encoded)
+            if debate["debate_id"] in self._ids:
+                continue
+            self._ids.add(debate["debate_id"])
+            debates.append(debate)
+            turns.append(debate_turns)
+        if not debates:
+            return 0
+        first = self.debates.append(debates) - len(debates)
+        self.turns.append([{**turn, "debate": first + index}
+                           for index, debate_turns in enumerate(turns) for turn in debate_turns])
+        return len(debates)
+
+    def add(self, result: Dict[str, Any], encoded: bytes):
+        """Queue a finished debate (``encoded``: its JSON result) for export"""
+        self._executor.submit(self._append, [(result, encoded)]).add_done_callback(_log_failure)
+
+    def add_many(self, results: List[Tuple[Dict[str, Any], bytes]]) -> int:
+        """Export results and wait; returns how many were new"""
+        return self._executor.submit(self._append, results).result()
+
+
+# Grouped aggregations over integer keys: NumPy when installed, the same results in Python otherwise
+
+def _counts(keys, size: int, weights=None) -> List[float]:
+    if np is not None:
+        return np.bincount(keys, weights=weights, minlength=size).tolist()
+    counts = [0.0] * size
+    for index, key in enumerate(keys):
+        counts[key] += weights[index] if weights is not None else 1.0
+    return counts
+
+
+def _percentiles(keys, values, size: int) -> List[Optional[List[float]]]:
+    """Linearly interpolated ``PERCENTILES`` of the non-NaN values of each group (None: no values)"""
+    if np is not None:
+        keys, values = np.asarray(keys), np.asarray(values, dtype="f8")
+        present = ~np.isnan(values)
+        keys, values = keys[present], values[present]
+        # Gather each group's values, then sort every group's slice in place
+        order = np.argsort(keys)
+        keys, values = keys[order], values[order]
+        starts = np.searchsorted(keys, np.arange(size))
+        counts = np.searchsorted(keys, np.arange(size), side="right") - starts
+        for start, count in zip(starts.tolist(), counts.tolist()):
+            if count > 1:
+                values[start:start + count].sort()
+        table = []
+        for percentile in PERCENTILES:
+            position = starts + (counts - 1).clip(0) * percentile / 100
+            low = np.floor(position).astype(int).clip(0, max(len(values) - 1, 0))
+            high = np.ceil(position).astype(int).clip(0, max(len(values) - 1, 0))
+            table.append(values[low] + (values[high] - values[low]) * (position - low) if len(values) else
+                         np.zeros(size))
+        return [[float(column[group]) for column in table] if counts[group] else None for group in range(size)]
+
+    groups: List[List[float]] = [[] for _ in range(size)]
+    for key, value in zip(keys, values):
+        if not math.isnan(value):
+            groups[key].append(value)
+    table = []
+    for group in groups:
+        if not group:
+            table.append(None)
+            continue
+        group.sort()
+        row = []
+        for percentile in PERCENTILES:
+            position = (len(group) - 1) * percentile / 100
+            low, high = math.floor(position), math.ceil(position)
+            row.append(group[low] + (group[high] - group[low]) * (position - low))
+        table.append(row)
+    return table
+
+
+def _select(column, mask) -> Any:
+    if np is not None:
+        return np.asarray(column)[mask]
+    return [value for value, keep in zip(column, mask) if keep]
+
+
+def _percentile_fields(values: Optional[List[float]], unit: str) -> Dict[str, Optional[float]]:
+    return {f"p{percentile}_{unit}": round(value, 3) if values else None
+            for percentile, value in zip(PERCENTILES, values or [None] * len(PERCENTILES))}
+
+
+def elo_ratings(wins: List[List[float]], iterations: int = 500) -> List[Optional[float]]:
+    """Bradley-Terry strengths fitted to a win matrix, on the Elo scale (mean 1500, 400 points = 10:1 odds)
+
+    ``wins[i][j]`` counts debates model i won against model j, ties as half a
+    win each. Unlike online Elo updates, the fit does not depend on the order
+    debates finished in. Each pair of models that met gets one extra virtual
+    tie, so a model that never won still has a finite rating. A model that
+    never debated another one gets None.
+    """
+    size = len(wins)
+    met = [[i != j and wins[i][j] + wins[j][i] > 0 for j in range(size)] for i in range(size)]
+    wins = [[wins[i][j] + 0.5 if met[i][j] else 0.0 for j in range(size)] for i in range(size)]
+    rated = [any(row) for row in met]
+    if not any(rated):
+        return [None] * size
+    total = [sum(row) for row in wins]
+    strength = [1.0] * size
+    for _ in range(iterations):
+        # Minorization-maximization update (Hunter 2004), then rescale to a geometric mean of 1
+        updated = []
+        for i in range(size):
+            denominator = sum((wins[i][j] + wins[j][i]) / (strength[i] + strength[j]) for j in range(size) if met[i][j])
+            updated.append(total[i] / denominator if denominator else 1.0)
+        scale = math.exp(sum(math.log(updated[i]) for i in range(size) if rated[i]) / sum(rated))
+        updated = [value / scale for value in updated]
+        change = max(abs(a - b) for a, b in zip(updated, strength))
+        strength = updated
+        if change < 1e-9:
+            break
+    return [ELO_START + 400 * math.log10(strength[i]) if rated[i] else None for i in range(size)]
+
+
+def report(path: str) -> Dict[str, Any]:
+    """Win rates, duration percentiles, Elo and turn latency from the analytics tables in ``path``"""
+    debates = ColumnTable(str(Path(path) / "debates"), DEBATE_COLUMNS)
+    turns = ColumnTable(str(Path(path) / "turns"), TURN_COLUMNS)
+    columns = debates.read(["winner", "pro_model", "con_model", "duration"])
+    models = debates.categories("pro_model")
+    winners = debates.categories("winner")
+    codes = [winners.index(outcome) if outcome in winners else -2 for outcome in OUTCOMES]
+    size = len(models)
+
+    # Debates with a verdict and both debaters' models
+    winner = columns["winner"]
+    if np is not None:
+        winner = np.asarray(winner)
+        mask = ((winner == codes[0]) | (winner == codes[1]) | (winner == codes[2])) & \
+               (np.asarray(columns["pro_model"]) >= 0) & (np.asarray(columns["con_model"]) >= 0)
+    else:
+        mask = [code in codes and pro >= 0 and con >= 0
+                for code, pro, con in zip(winner, columns["pro_model"], columns["con_model"])]
+    pro, con = _select(columns["pro_model"], mask), _select(columns["con_model"], mask)
+    winner, duration = _select(winner, mask), _select(columns["duration"], mask)
+    if np is not None:
+        pro_wins, con_wins = (winner == codes[0]).astype("f8"), (winner == codes[1]).astype("f8")
+        pairs = pro.astype("i8") * size + con
+    else:
+        pro_wins = [1.0 if code == codes[0] else 0.0 for code in winner]
+        con_wins = [1.0 if code == codes[1] else 0.0 for code in winner]
+        pairs = [a * size + b for a, b in zip(pro, con)]
+
+    # By pairing: PRO model x CON model
+    pair_count = _counts(pairs, size * size)
+    pair_pro = _counts(pairs, size * size, pro_wins)
+    pair_con = _counts(pairs, size * size, con_wins)
+    pair_duration = _percentiles(pairs, duration, size * size)
+    pairings = []
+    for key, count in enumerate(pair_count):
+        if count:
+            pairings.append({
+                "pro_model": models[key // size], "con_model": models[key % size], "debates": int(count),
+                "pro_wins": int(pair_pro[key]), "con_wins": int(pair_con[key]),
+                "ties": int(count - pair_pro[key] - pair_con[key]),
+                "pro_win_rate": round(pair_pro[key] / count, 3),
+                **_percentile_fields(pair_duration[key], "duration_s")
+            })
+    pairings.sort(key=lambda entry: -entry["debates"])
+
+    # By model, either side; Elo from the pairing totals (ties count half a win for each side)
+    games = [a + b for a, b in zip(_counts(pro, size), _counts(con, size))]
+    wins = [a + b for a, b in zip(_counts(pro, size, pro_wins), _counts(con, size, con_wins))]
+    matrix = [[0.0] * size for _ in range(size)]
+    for key, count in enumerate(pair_count):
+        if count:
+            ties = count - pair_pro[key] - pair_con[key]
+            matrix[key // size][key % size] += pair_pro[key] + ties / 2
+            matrix[key % size][key // size] += pair_con[key] + ties / 2
+    ratings = elo_ratings(matrix)
+    by_model = sorted(({"model": models[code], "debates": int(games[code]), "wins": int(wins[code]),
+                        "win_rate": round(wins[code] / games[code], 3),
+                        "elo": round(ratings[code], 1) if ratings[code] is not None else None}
+                       for code in range(size) if games[code]), key=lambda entry: -(entry["elo"] or 0))
+
+    # Turn latency by the turn's model
+    turn_columns = turns.read(["model", "latency_ms", "completion_tokens"])
+    turn_models = turns.categories("model")
+    turn_mask = ([code >= 0 for code in turn_columns["model"]] if np is None
+                 else np.asarray(turn_columns["model"]) >= 0)
+    turn_keys = _select(turn_columns["model"], turn_mask)
+    latency = _percentiles(turn_keys, _select(turn_columns["latency_ms"], turn_mask), len(turn_models))
+    tokens = _select(turn_columns["completion_tokens"], turn_mask)
+    turn_count = _counts(turn_keys, len(turn_models))
+    if np is not None:
+        counted = ~np.isnan(tokens)
+        token_sum = _counts(turn_keys[counted], len(turn_models), tokens[counted])
+        token_count = _counts(turn_keys[counted], len(turn_models))
+    else:
+        counted = [not math.isnan(value) for value in tokens]
+        token_sum = _counts(_select(turn_keys, counted), len(turn_models), _select(tokens, counted))
+        token_count = _counts(_select(turn_keys, counted), len(turn_models))
+    turn_latency = [{"model": turn_models[code], "turns": int(turn_count[code]),
+                     **_percentile_fields(latency[code], "latency_ms"),
+                     "mean_completion_tokens": round(token_sum[code] / token_count[code], 1)
+                     if token_count[code] else None}
+                    for code in range(len(turn_models)) if turn_count[code]]
+
+    return {
+        "debates": debates.rows,
+        "judged": len(pro),
+        "turns": turns.rows,
+        "backend": "numpy" if np is not None else "python",
+        "pairings": pairings,
+        "models": by_model,
+        "turn_latency": turn_latency
+    }
+
+
+def export_tables(path: str, output: str, export_format: str = "parquet") -> List[str]:
+    """Write the analytics tables as Parquet or Arrow IPC files in ``output``; needs pyarrow"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.feather as feather
+        import pyarrow.parquet as parquet
+    except ImportError:
+        raise RuntimeError("Exporting analytics needs pyarrow (pip install pyarrow)")
+
+    Path(output).mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, schema in (("debates", DEBATE_COLUMNS), ("turns", TURN_COLUMNS)):
+        table = ColumnTable(str(Path(path) / name), schema)
+        arrays = {}
+        for column, values in table.read().items():
+            kind = column_kind(schema[column])
+            if kind == TEXT:
+                arrays[column] = pa.array(list(values), pa.large_string())
+            elif kind == NUMBER:
+                # NaN marks a missing number in the column files; Arrow has nulls for that
+                numbers = pa.Array.from_buffers(pa.float64(), table.rows, [None, pa.py_buffer(values)])
+                arrays[column] = pc.if_else(pc.is_nan(numbers), None, numbers)
+            else:
+                codes = pa.Array.from_buffers(pa.int32(), table.rows, [None, pa.py_buffer(values)])
+                arrays[column] = pa.DictionaryArray.from_arrays(pc.if_else(pc.equal(codes, -1), None, codes),
+                                                                pa.array(table.categories(column), pa.string()))
+        arrow_table = pa.table(arrays)
+        target = str(Path(output) / f"{name}.{'parquet' if export_format == 'parquet' else 'arrow'}")
+        if export_format == "parquet":
+            parquet.write_table(arrow_table, target)
+        else:
+            feather.write_feather(arrow_table, target)
+        written.append(target)
+    return written
+
+
+_analytics: Optional[DebateAnalytics] = None
+
+
+def get_analytics() -> Optional[DebateAnalytics]:
+    """The analytics exporter, or None when export is off"""
+    return _analytics
+
+
+def configure_analytics(analytics_config) -> Optional[DebateAnalytics]:
+    """Open the column tables at ``analytics_config.path`` (none: export off)"""
+    global _analytics
+    if _analytics is not None and _analytics.path != analytics_config.path:
+        _analytics.close()
+        _analytics = None
+    if analytics_config.path and _analytics is None:
+        _analytics = DebateAnalytics(analytics_config.path)
+        logger.info(f"Debate analytics: {analytics_config.path}")
+    return _analytics
+
+
+def close_analytics():
+    global _analytics
+    if _analytics is not None:
+        _analytics.close()
+        _analytics = None
@@ -0,0 +1,372 @@
+"""
+Searchable archive of finished debates
+
+With ``archive.path`` set, every completed debate (API, streamed, broker
+worker or CLI) is added to a SQLite archive as it finishes, and
+``python main.py --mode search --import`` adds saved ``--output`` files and
+API responses. Entries are keyed by a hash of the encoded result, so adding
+the same debate twice is a no-op.
+
+- ``debates_fts`` is an FTS5 inverted index (Porter stemming) over topics and
+  transcripts. It is contentless: the text lives once, in the compressed
+  result;
+- ``debates`` holds one small row per debate with the facet columns
+  (winner, format, model and provider per seat, scores, duration, turns);
+- ``debate_results`` holds the zlib-compressed results, apart so that scans
+  over ``debates`` stay in a few megabytes of pages.
+
+A search intersects the text match with column filters and counts every
+match. Ranking (BM25, or newest first without text) and facet counts cost
+time per match, so they cover the newest ``archive.search_window`` matches:
+FTS5 reaches the window's first row id by walking its index newest first,
+then restricts the match to row ids from there. Broad queries over a large
+archive stay within tens of milliseconds, selective ones take a few; when
+the window cut matches off the response says ``sampled``. Writes are queued
+to the archive's thread without waiting.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import fast_json
+from utils.logger import setup_logger
+from utils.text_similarity import words
+
+logger = setup_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    id INTEGER PRIMARY KEY,
+    archive_id TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    winner TEXT,
+    format TEXT,
+    pro_model TEXT,
+    pro_provider TEXT,
+    con_model TEXT,
+    con_provider TEXT,
+    judge_model TEXT,
+    judge_provider TEXT,
+    pro_score REAL,
+    con_score REAL,
+    duration REAL,
+    turns INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS debates_created ON debates (created_at);
+CREATE TABLE IF NOT EXISTS debate_results (
+    id INTEGER PRIMARY KEY,
+    result BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts USING fts5(
+    topic, transcript, content='', tokenize='porter unicode61'
+);
+"""
+
+# Facet columns of every search result
+COLUMNS = ("archive_id", "topic", "winner", "format", "pro_model", "pro_provider", "con_model", "con_provider",
+           "judge_model", "judge_provider", "pro_score", "con_score", "duration", "turns", "created_at")
+
+TERM_FACETS = ("winner", "format", "pro_model", "con_model", "judge_model", "pro_provider", "con_provider")
+
+# Range facets: (label, lower bound) in ascending order; a row falls in the last bucket it reaches
+DURATION_BUCKETS = (("<1m", 0.0), ("1-5m", 60.0), ("5-15m", 300.0), ("15m+", 900.0))
+MARGIN_BUCKETS = (("0-9", 0.0), ("10-24", 10.0), ("25+", 25.0))
+
+SNIPPET_CHARS = 200
+
+
+def _log_failure(future: Future):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Archiving a debate failed: {str(error)}")
+
+
+def _bucket_sql(expression: str, buckets: Tuple[Tuple[str, float], ...]) -> str:
+    cases = " ".join(f"WHEN {expression} >= {lower} THEN '{label}'" for label, lower in reversed(buckets))
+    return f"CASE {cases} ELSE NULL END"
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query matching every word of free text (stemmed; quoted, so punctuation cannot break the syntax)"""
+    return " ".join(f'"{word}"' for word in words(query))
+
+
+@dataclass
+class ArchiveQuery:
+    text: str = ""
+    winner: Optional[str] = None
+    format: Optional[str] = None
+    model: Optional[str] = None  # Any seat
+    provider: Optional[str] = None  # Any seat
+    min_duration: Optional[float] = None
+    max_duration: Optional[float] = None
+    min_pro_score: Optional[float] = None
+    min_con_score: Optional[float] = None
+    since: Optional[float] = None  # Epoch seconds
+    until: Optional[float] = None
+    limit: int = 20
+    offset: int = 0
+    facets: bool = True
+
+    def where(self) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if self.winner:
+            clauses.append("d.winner = ?")
+            params.append(self.winner.upper())
+        if self.format:
+            clauses.append("d.format = ?")
+            params.append(self.format)
+        if self.model:
+            clauses.append("? IN (d.pro_model, d.con_model, d.judge_model)")
+            params.append(self.model)
+        if self.provider:
+            clauses.append("? IN (d.pro_provider, d.con_provider, d.judge_provider)")
+            params.append(self.provider)
+        for column, operator, value in (("duration", ">=", self.min_duration), ("duration", "<=", self.max_duration),
+                                        ("pro_score", ">=", self.min_pro_score),
+                                        ("con_score", ">=", self.min_con_score),
+                                        ("created_at", ">=", self.since), ("created_at", "<=", self.until)):
+            if value is not None:
+                clauses.append(f"d.{column} {operator} ?")
+                params.append(value)
+        return (" AND ".join(clauses) or "1"), params
+
+
+def archive_id(encoded: bytes) -> str:
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def archive_row(result: Dict[str, Any], encoded: bytes) -> Tuple[Dict[str, Any], str]:
+    """Facet columns of a debate result and its transcript text"""
+    metadata = result.get("metadata") or {}
+    agents = (metadata.get("usage") or {}).get("agents") or {}
+    transcript = result.get("transcript") or []
+    seats: Dict[str, Dict[str, Any]] = {seat: dict(agents.get(seat) or {}) for seat in ("pro", "con", "judge")}
+    for message in transcript:
+        # Results without usage still name the debaters' models per turn
+        agent_config = (message.get("metadata") or {}).get("agent_config")
+        if agent_config and message.get("role") in ("pro", "con"):
+            seats[message["role"]].setdefault("model", agent_config.get("model"))
+            seats[message["role"]].setdefault("provider", agent_config.get("provider"))
+    score = result.get("score") or {}
+    debate_format = metadata.get("format")
+    timestamps = [message.get("timestamp") for message in transcript if message.get("timestamp")]
+    row = {
+        "archive_id": archive_id(encoded),
+        "topic": result.get("topic", ""),
+        "winner": str(result.get("winner") or "").upper() or None,
+        "format": debate_format.get("name") if isinstance(debate_format, dict) else debate_format,
+        "pro_model": seats["pro"].get("model"),
+        "pro_provider": seats["pro"].get("provider"),
+        "con_model": seats["con"].get("model"),
+        "con_provider": seats["con"].get("provider"),
+        "judge_model": seats["judge"].get("model"),
+        "judge_provider": seats["judge"].get("provider"),
+        "pro_score": _number(score.get("pro_score")),
+        "con_score": _number(score.get("con_score")),
+        "duration": _number(metadata.get("duration")),
+        "turns": metadata.get("total_turns"),
+        "created_at": max(timestamps) / 1000 if timestamps else time.time()
+    }
+    text = "\n".join(message.get("content", "") for message in transcript if message.get("role") in ("pro", "con"))
+    return row, text
+
+
+def _snippet(result: Dict[str, Any], query_words: List[str]) -> Optional[str]:
+    """Text around the first transcript mention of a query word"""
+    for message in result.get("transcript") or []:
+        content = message.get("content", "")
+        lowered = content.lower()
+        for word in query_words:
+            position = lowered.find(word)
+            if position >= 0:
+                start = max(0, position - SNIPPET_CHARS // 2)
+                snippet = content[start:start + SNIPPET_CHARS].replace("\n", " ")
+                return f"{message.get('role', '').upper()}: {'...' if start else ''}{snippet}..."
+    return None
+
+
+class DebateArchive:
+    """SQLite archive of debate results with full-text and faceted search"""
+
+    def __init__(self, path: str, search_window: int = 1000):
+        self.path = path
+        self.search_window = max(1, search_window)
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="debate-archive")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor.submit(self._open).result()
+
+    def _open(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def close(self):
+        def close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._executor.submit(close)
+        self._executor.shutdown(wait=True)
+
+    # Indexing
+
+    def _insert(self, rows: List[Tuple[Dict[str, Any], str, bytes]]) -> int:
+        added = 0
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row, text, encoded in rows:
+                cursor = self._conn.execute(
+                    f"INSERT OR IGNORE INTO debates ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    tuple(row[column] for column in COLUMNS))
+                if cursor.rowcount:
+                    self._conn.execute("INSERT INTO debate_results (id, result) VALUES (?, ?)",
+                                       (cursor.lastrowid, zlib.compress(encoded)))
+                    self._conn.execute("INSERT INTO debates_fts (rowid, topic, transcript) VALUES (?, ?, ?)",
+                                       (cursor.lastrowid, row["topic"], text))
+                    added += 1
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def add(self, result: Dict[str, Any], encoded: bytes):
+        """Queue a finished debate (``encoded``: its JSON result) for indexing"""
+        row, text = archive_row(result, encoded)
+        self._executor.submit(self._insert, [(row, text, encoded)]).add_done_callback(_log_failure)
+
+    def add_many(self, results: List[Tuple[Dict[str, Any], bytes]]) -> int:
+        """Index results in one transaction and wait; returns how many were new"""
+        rows = [(*archive_row(result, encoded), encoded) for result, encoded in results]
+        return self._executor.submit(self._insert, rows).result()
+
+    # Queries
+
+    def _search(self, query: ArchiveQuery) -> Dict[str, Any]:
+        start = time.perf_counter()
+        where, params = query.where()
+        filters = bool(params)
+        match = match_expression(query.text)
+        if match:
+            source = "debates_fts f JOIN debates d ON d.id = f.rowid"
+            where = f"debates_fts MATCH ? AND {where}"
+            params = [match, *params]
+            row_id, order = "f.rowid", "f.rank"
+        else:
+            source = "debates d"
+            row_id, order = "d.id", "d.created_at DESC"
+
+        # Without column filters the FTS index counts its matches alone, without reading any rows
+        counted = ("debates_fts WHERE debates_fts MATCH ?", [match]) if match and not filters else (
+            f"{source} WHERE {where}", params)
+        total = self._conn.execute(f"SELECT COUNT(*) FROM {counted[0]}", counted[1]).fetchone()[0]
+        sampled = total > self.search_window
+        if sampled:
+            cutoff = self._conn.execute(f"SELECT {row_id} FROM {source} WHERE {where} ORDER BY {row_id} DESC "
+                                        f"LIMIT 1 OFFSET ?", (*params, self.search_window - 1)).fetchone()[0]
+            where = f"{where} AND {row_id} >= ?"
+            params = [*params, cutoff]
+
+        rows = self._conn.execute(
+            f"SELECT d.id, {', '.join('d.' + column for column in COLUMNS)} FROM {source} WHERE {where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?", (*params, max(0, query.limit), max(0, query.offset))).fetchall()
+        query_words = words(query.text)
+        blobs: Dict[int, bytes] = {}
+        if query_words and rows:
+            ids = [row[0] for row in rows]
+            blobs = dict(self._conn.execute(
+                f"SELECT id, result FROM debate_results WHERE id IN ({', '.join('?' * len(ids))})", ids).fetchall())
+        results = []
+        for row in rows:
+            entry = dict(zip(COLUMNS, row[1:]))
+            if row[0] in blobs:
+                entry["snippet"] = _snippet(fast_json.loads(zlib.decompress(blobs[row[0]])), query_words)
+            results.append(entry)
+
+        facets: Dict[str, Dict[str, int]] = {}
+        if query.facets and total:
+            duration = _bucket_sql("d.duration", DURATION_BUCKETS)
+            margin = _bucket_sql("abs(d.pro_score - d.con_score)", MARGIN_BUCKETS)
+            rows = self._conn.execute(
+                f"SELECT {', '.join('d.' + column for column in TERM_FACETS)}, {duration}, {margin} "
+                f"FROM {source} WHERE {where}", params).fetchall()
+            names = (*TERM_FACETS, "duration", "score_margin")
+            facets = {name: {value: count for value, count in Counter(values).most_common() if value is not None}
+                      for name, values in zip(names, zip(*rows))}
+        return {
+            "query": asdict(query),
+            "total": total,
+            "sampled": sampled,
+            "window": min(total, self.search_window),
+            "results": results,
+            "facets": facets,
+            "took_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    def _get(self, archive_id: str) -> Optional[bytes]:
+        row = self._conn.execute("SELECT r.result FROM debates d JOIN debate_results r ON r.id = d.id "
+                                 "WHERE d.archive_id = ?", (archive_id,)).fetchone()
+        return zlib.decompress(row[0]) if row is not None else None
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM debates").fetchone()[0]
+
+    async def search(self, query: ArchiveQuery) -> Dict[str, Any]:
+        return await self._call(self._search, query)
+
+    async def get(self, archive_id: str) -> Optional[bytes]:
+        """Encoded result of an archived debate"""
+        return await self._call(self._get, archive_id)
+
+    async def count(self) -> int:
+        return await self._call(self._count)
+
+
+_archive: Optional[DebateArchive] = None
+
+
+def get_archive() -> Optional[DebateArchive]:
+    """The debate archive, or None when archiving is off"""
+    return _archive
+
+
+def configure_archive(archive_config) -> Optional[DebateArchive]:
+    """Open the archive at ``archive_config.path`` (none: archiving off)"""
+    global _archive
+    if _archive is not None and _archive.path != archive_config.path:
+        _archive.close()
+        _archive = None
+    if archive_config.path and _archive is None:
+        _archive = DebateArchive(archive_config.path, archive_config.search_window)
+        logger.info(f"Debate archive: {archive_config.path}")
+    return _archive
+
+
+def close_archive():
+    global _archive
+    if _archive is not None:
+        _archive.close()
+        _archive = None
@@ -0,0 +1,126 @@
+"""
+JSON encoding for SSE events, API responses and provider payloads
+
+Uses orjson or msgspec when installed (``pip install orjson``) and falls back
+to the standard library; ``JSON_BACKEND=orjson|msgspec|stdlib`` forces one.
+Every backend produces compact UTF-8 bytes.
+
+``CachedJSON`` is a dict that encodes itself once. Debate messages are
+built as ``CachedJSON`` records, so a message is encoded a single time
+whether it goes out as a live event, in the final result or in the
+``/debate`` response; ``dumps_object`` splices such pre-encoded values into
+an enclosing object.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+
+class JsonCodec:
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    option = orjson.OPT_NON_STR_KEYS
+    return JsonCodec("orjson", lambda obj: orjson.dumps(obj, option=option), orjson.loads)
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return JsonCodec("msgspec", encoder.encode, decoder.decode)
+
+
+def _stdlib_codec() -> JsonCodec:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return JsonCodec("stdlib", dumps, json.loads)
+
+
+# In order of preference
+CODECS = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "stdlib": _stdlib_codec
+}
+
+
+def load_codec(name: str) -> JsonCodec:
+    """Codec by name; ImportError if its library is not installed"""
+    if name not in CODECS:
+        raise ValueError(f"Unsupported JSON backend: {name} (expected one of {', '.join(CODECS)})")
+    return CODECS[name]()
+
+
+def _select_codec(preferred: Optional[str]) -> JsonCodec:
+    if preferred and preferred != "auto":
+        return load_codec(preferred)
+    for name in CODECS:
+        try:
+            return load_codec(name)
+        except ImportError:
+            continue
+
+
+_codec = _select_codec(os.getenv("JSON_BACKEND"))
+
+
+def use(name: str) -> JsonCodec:
+    """Switch the process-wide codec (benchmarks and tests)"""
+    global _codec
+    _codec = load_codec(name)
+    return _codec
+
+
+def backend() -> str:
+    return _codec.name
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if isinstance(obj, CachedJSON):
+        return obj.json()
+    return _codec.dumps(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _codec.loads(data)
+
+
+class CachedJSON(dict):
+    """A dict that caches its encoding; for records that are not modified once built"""
+
+    __slots__ = ("_json",)
+
+    def json(self) -> bytes:
+        try:
+            return self._json
+        except AttributeError:
+            self._json = self.encode()
+            return self._json
+
+    def encode(self) -> bytes:
+        """Encode the record (called once; subclasses may splice in pre-encoded values)"""
+        return _codec.dumps(self)
+
+
+def dumps_list(items) -> bytes:
+    """Encode a list, reusing the cached encoding of ``CachedJSON`` items"""
+    return b"[" + b",".join(dumps(item) for item in items) + b"]"
+
+
+def dumps_object(obj: Dict[str, Any], encoded: Dict[str, bytes]) -> bytes:
+    """Encode a dict whose values for the keys in ``encoded`` are already JSON"""
+    parts = []
+    for key, value in obj.items():
+        parts.append(_codec.dumps(key) + b":" + (encoded[key] if key in encoded else dumps(value)))
+    return b"{" + b",".join(parts) + b"}"
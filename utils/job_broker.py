@@ -0,0 +1,531 @@
+"""
+Job brokers for running debates on worker processes
+
+With ``queue.broker`` set, the API node does not run debates: it enqueues a
+job (the topic and the request's config) and streams the debate's events
+from the broker's log, while ``python main.py --mode worker`` processes on
+any number of machines claim jobs and run them. Backends:
+
+- ``sqlite:///path/to/jobs.db``: the shared store's SQLite database plus a
+  jobs table; workers must reach the file (one host or a shared volume).
+  For development and tests.
+- ``redis://[[user]:password@]host:port/db``: any server speaking the Redis
+  protocol (Redis, Valkey, KeyDB, Dragonfly), through a small built-in
+  client; claims and lease renewals are Lua scripts.
+
+Delivery is at least once. A claimed job is leased to its worker, which
+renews the lease while the debate runs and acknowledges the job only after
+the debate's final status and events are written. If a worker dies, its
+lease expires and another worker claims the job again; it rebuilds the
+debate from the event log (every finished turn is a ``message`` event) and a
+checkpoint of the research phase, and continues from the next turn.
+
+Besides the queue, a broker keeps the same debate log as ``SharedStore``
+(status, result and SSE frames per debate), so ``follow_stored`` and the
+status endpoints read it unchanged.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from utils import fast_json
+from utils.logger import setup_logger
+from utils.metrics import DEBATE_JOBS
+from utils.shared_store import DEBATE_COLUMNS, QUEUED, RUNNING, PRUNE_INTERVAL, SharedStore
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class Job:
+    job_id: str  # Also the debate id
+    payload: Dict[str, Any]
+    attempts: int  # Deliveries so far, including this one; also identifies this claim's lease
+
+
+class JobBroker:
+    """Job queue with leases, plus the debate log of ``SharedStore``"""
+
+    worker: str
+
+    async def enqueue(self, job_id: str, topic: str, payload: Dict[str, Any]):
+        """Create the debate (status ``queued``) and queue its job"""
+        raise NotImplementedError
+
+    async def claim(self, lease_seconds: float) -> Optional[Job]:
+        """Lease the oldest available job (queued, or leased by a worker that stopped renewing)"""
+        raise NotImplementedError
+
+    async def renew(self, job: Job, lease_seconds: float) -> bool:
+        """Extend the lease of this claim; False if the job was redelivered (even to this worker) or acknowledged"""
+        raise NotImplementedError
+
+    async def complete(self, job: Job):
+        """Acknowledge a job (and drop its checkpoint) unless it was redelivered; it is never delivered again"""
+        raise NotImplementedError
+
+    def start_debate(self, debate_id: str):
+        raise NotImplementedError
+
+    def save_checkpoint(self, debate_id: str, data: bytes):
+        raise NotImplementedError
+
+    async def get_checkpoint(self, debate_id: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def flush(self):
+        """Wait until every queued write has reached the backend
+
+        Raises the first write that failed since the previous flush, so a job
+        whose events or status were lost is not acknowledged.
+        """
+        raise NotImplementedError
+
+    async def aclose(self):
+        raise NotImplementedError
+
+
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    enqueued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_enqueued ON jobs (enqueued_at);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    debate_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteBroker(SharedStore, JobBroker):
+    """Jobs in the shared store's SQLite database; claims are serialized by ``BEGIN IMMEDIATE``"""
+
+    def _open(self):
+        super()._open()
+        self._conn.executescript(JOB_SCHEMA)
+
+    def _transaction(self, fn, *args):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(*args)
+            self._conn.execute("COMMIT")
+            return result
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _enqueue(self, job_id: str, topic: str, payload: bytes, now: float):
+        self._conn.execute("INSERT INTO debates VALUES (?, ?, ?, '', ?, ?, 0, NULL)",
+                           (job_id, topic, QUEUED, now, now))
+        self._conn.execute("INSERT INTO jobs VALUES (?, ?, 0, NULL, NULL, ?)", (job_id, payload, now))
+
+    def _claim(self, lease_seconds: float, now: float) -> Optional[Tuple[str, bytes, int]]:
+        row = self._conn.execute("SELECT job_id, payload, attempts FROM jobs "
+                                 "WHERE lease_until IS NULL OR lease_until < ? "
+                                 "ORDER BY enqueued_at LIMIT 1", (now,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE jobs SET attempts = attempts + 1, worker = ?, lease_until = ? WHERE job_id = ?",
+                           (self.worker, now + lease_seconds, row[0]))
+        return row[0], row[1], row[2] + 1
+
+    def _renew(self, job_id: str, attempts: int, lease_until: float) -> bool:
+        return self._conn.execute("UPDATE jobs SET lease_until = ? WHERE job_id = ? AND attempts = ?",
+                                  (lease_until, job_id, attempts)).rowcount == 1
+
+    def _complete(self, job_id: str, attempts: int):
+        if self._conn.execute("DELETE FROM jobs WHERE job_id = ? AND attempts = ?", (job_id, attempts)).rowcount:
+            self._conn.execute("DELETE FROM checkpoints WHERE debate_id = ?", (job_id,))
+
+    def _start_debate(self, debate_id: str, now: float):
+        self._conn.execute("UPDATE debates SET status = ?, worker = ?, updated_at = ? WHERE debate_id = ?",
+                           (RUNNING, self.worker, now, debate_id))
+
+    def _save_checkpoint(self, debate_id: str, data: bytes):
+        self._conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (debate_id, data))
+
+    def _get_checkpoint(self, debate_id: str) -> Optional[bytes]:
+        row = self._conn.execute("SELECT data FROM checkpoints WHERE debate_id = ?", (debate_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _prune(self, now: float):
+        super()._prune(now)
+        self._conn.execute("DELETE FROM checkpoints WHERE debate_id NOT IN (SELECT debate_id FROM debates)")
+
+    async def enqueue(self, job_id: str, topic: str, payload: Dict[str, Any]):
+        now = time.time()
+        await self._call(self._transaction, self._enqueue, job_id, topic, fast_json.dumps(payload), now)
+        if now - self._last_prune > PRUNE_INTERVAL:
+            self._last_prune = now
+            self._submit(self._prune, now)
+        DEBATE_JOBS.labels("enqueued").inc()
+
+    async def claim(self, lease_seconds: float) -> Optional[Job]:
+        row = await self._call(self._transaction, self._claim, lease_seconds, time.time())
+        if row is None:
+            return None
+        return Job(row[0], fast_json.loads(row[1]), row[2])
+
+    async def renew(self, job: Job, lease_seconds: float) -> bool:
+        return await self._call(self._renew, job.job_id, job.attempts, time.time() + lease_seconds)
+
+    async def complete(self, job: Job):
+        await self._call(self._transaction, self._complete, job.job_id, job.attempts)
+
+    def start_debate(self, debate_id: str):
+        self._submit(self._start_debate, debate_id, time.time())
+
+    def save_checkpoint(self, debate_id: str, data: bytes):
+        self._submit(self._save_checkpoint, debate_id, data)
+
+    async def get_checkpoint(self, debate_id: str) -> Optional[bytes]:
+        return await self._call(self._get_checkpoint, debate_id)
+
+    async def flush(self):
+        # One thread runs every call in order
+        await self._call(lambda: None)
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    async def aclose(self):
+        self.close()
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RespConnection:
+    """Minimal Redis protocol (RESP2) client: one connection, commands serialized, pipelining"""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.username = unquote(parts.username) if parts.username else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            elif isinstance(arg, str):
+                data = arg.encode("utf-8")
+            else:
+                data = repr(arg).encode("ascii")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    async def _read(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            return RespError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [await self._read() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from server: {line[:40]!r}")
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.username, self.password) if self.username else ("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for reply in await self._send(setup):
+            if isinstance(reply, RespError):
+                raise reply
+
+    async def _send(self, commands) -> List[Any]:
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+        return [await self._read() for _ in commands]
+
+    async def pipeline(self, commands) -> List[Any]:
+        """Send commands in one write; replies in order, errors returned as ``RespError``"""
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(commands)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError):
+                # Reconnect on the next call; a half-read reply would desynchronize the stream
+                self.close()
+                raise
+
+    async def execute(self, *args) -> Any:
+        reply = (await self.pipeline([args]))[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+# Expired leases go back to the head of the queue, then the next job is leased
+CLAIM_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, id in ipairs(expired) do
+  redis.call('ZREM', KEYS[2], id)
+  redis.call('RPUSH', KEYS[1], id)
+end
+local id = redis.call('RPOP', KEYS[1])
+if not id then
+  return nil
+end
+local key = ARGV[4] .. id
+local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'worker', ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[2], id)
+return {id, attempts, redis.call('HGET', key, 'payload')}
+"""
+
+# Leases belong to one claim: the job's attempt count when it was claimed
+RENEW_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'attempts') == ARGV[1] and redis.call('ZSCORE', KEYS[2], ARGV[3]) then
+  redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+  return 1
+end
+return 0
+"""
+
+COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'attempts') == ARGV[1] then
+  redis.call('ZREM', KEYS[2], ARGV[2])
+  redis.call('LREM', KEYS[3], 0, ARGV[2])
+  redis.call('DEL', KEYS[1], KEYS[4])
+  return 1
+end
+return 0
+"""
+
+
+class RedisBroker(JobBroker):
+    """Jobs and debate logs on a Redis-protocol server
+
+    Keys (under ``prefix``): ``queue`` (list of job ids), ``leases`` (sorted set
+    of job id by lease expiry), ``job:{id}`` (hash), ``debates`` (sorted set by
+    creation time), ``debate:{id}`` (hash), ``events:{id}`` (sorted set of frames
+    by event id) and ``checkpoint:{id}``. Finished debates expire after
+    ``retention_seconds``.
+    """
+
+    def __init__(self, url: str, retention_seconds: float = 86400.0, prefix: str = "agentic-debate:"):
+        self.url = url
+        self.retention_seconds = retention_seconds
+        self.prefix = prefix
+        self.worker = f"{os.uname().nodename}:{os.getpid()}"
+        self._conn = RespConnection(url)
+        self._writes: List[tuple] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._write_error: Optional[Exception] = None
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    # Writes that are not awaited go out in order, batched into pipelines
+
+    def _submit(self, *commands: tuple):
+        self._writes.extend(commands)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._drain())
+
+    def _write_failed(self, error: Exception):
+        logger.error(f"Broker write failed: {str(error)}")
+        if self._write_error is None:
+            self._write_error = error
+
+    async def _drain(self):
+        while self._writes:
+            batch, self._writes = self._writes, []
+            try:
+                replies = await self._conn.pipeline(batch)
+            except Exception as e:
+                self._write_failed(e)
+                continue
+            for reply in replies:
+                if isinstance(reply, RespError):
+                    self._write_failed(reply)
+
+    async def flush(self):
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    async def aclose(self):
+        try:
+            await self.flush()
+        except Exception:
+            pass  # Logged when the write failed; no job is acknowledged after this
+        self._conn.close()
+
+    # Queue
+
+    async def enqueue(self, job_id: str, topic: str, payload: Dict[str, Any]):
+        now = time.time()
+        await self.flush()
+        replies = await self._conn.pipeline([
+            ("HSET", self._key("debate", job_id), "topic", topic, "status", QUEUED, "worker", "",
+             "created_at", now, "updated_at", now, "last_event_id", 0),
+            ("ZADD", self._key("debates"), now, job_id),
+            ("HSET", self._key("job", job_id), "payload", fast_json.dumps(payload), "attempts", 0),
+            ("LPUSH", self._key("queue"), job_id)
+        ])
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        DEBATE_JOBS.labels("enqueued").inc()
+
+    async def claim(self, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        reply = await self._conn.execute("EVAL", CLAIM_SCRIPT, 2, self._key("queue"), self._key("leases"),
+                                         now, now + lease_seconds, self.worker, self._key("job", ""))
+        if reply is None:
+            return None
+        job_id, attempts, payload = reply
+        if payload is None:
+            # Acknowledged while it was being redelivered
+            await self._conn.execute("ZREM", self._key("leases"), job_id)
+            return None
+        return Job(job_id.decode("utf-8"), fast_json.loads(payload), attempts)
+
+    async def renew(self, job: Job, lease_seconds: float) -> bool:
+        return await self._conn.execute("EVAL", RENEW_SCRIPT, 2, self._key("job", job.job_id), self._key("leases"),
+                                        job.attempts, time.time() + lease_seconds, job.job_id) == 1
+
+    async def complete(self, job: Job):
+        await self.flush()
+        await self._conn.execute("EVAL", COMPLETE_SCRIPT, 4, self._key("job", job.job_id), self._key("leases"),
+                                 self._key("queue"), self._key("checkpoint", job.job_id), job.attempts, job.job_id)
+
+    # Debate log
+
+    def start_debate(self, debate_id: str):
+        self._submit(("HSET", self._key("debate", debate_id), "status", RUNNING, "worker", self.worker,
+                      "updated_at", time.time()))
+
+    def append_event(self, debate_id: str, event_id: int, frame: bytes):
+        self._submit(("ZADD", self._key("events", debate_id), event_id, frame),
+                     ("HSET", self._key("debate", debate_id), "last_event_id", event_id, "updated_at", time.time()))
+
+    def finish_debate(self, debate_id: str, status: str, result: Optional[bytes] = None):
+        key = self._key("debate", debate_id)
+        ttl = int(self.retention_seconds)
+        commands = [("HSET", key, "status", status, "updated_at", time.time())]
+        commands.append(("HSET", key, "result", result) if result is not None else ("HDEL", key, "result"))
+        commands += [("EXPIRE", key, ttl), ("EXPIRE", self._key("events", debate_id), ttl)]
+        self._submit(*commands)
+
+    def save_checkpoint(self, debate_id: str, data: bytes):
+        self._submit(("SET", self._key("checkpoint", debate_id), data, "EX", int(self.retention_seconds)))
+
+    async def get_checkpoint(self, debate_id: str) -> Optional[bytes]:
+        return await self._conn.execute("GET", self._key("checkpoint", debate_id))
+
+    @staticmethod
+    def _record(debate_id: str, values: List[Optional[bytes]]) -> Dict[str, Any]:
+        topic, status, worker, created_at, updated_at, last_event_id = values
+        return {
+            "debate_id": debate_id,
+            "topic": topic.decode("utf-8"),
+            "status": status.decode("utf-8"),
+            "worker": worker.decode("utf-8"),
+            "created_at": float(created_at),
+            "updated_at": float(updated_at),
+            "last_event_id": int(last_event_id)
+        }
+
+    async def get_debate(self, debate_id: str) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+        """(status record, encoded result or None), or None for an unknown debate"""
+        values = await self._conn.execute("HMGET", self._key("debate", debate_id), *DEBATE_COLUMNS[1:], "result")
+        if values[0] is None:
+            return None
+        return self._record(debate_id, values[:-1]), values[-1]
+
+    async def events_after(self, debate_id: str, cursor: int, limit: int = 500) -> List[Tuple[int, bytes]]:
+        reply = await self._conn.execute("ZRANGEBYSCORE", self._key("events", debate_id), f"({cursor}", "+inf",
+                                         "WITHSCORES", "LIMIT", 0, limit)
+        return [(int(float(reply[i + 1])), reply[i]) for i in range(0, len(reply), 2)]
+
+    async def list_debates(self, limit: int = 100) -> List[Dict[str, Any]]:
+        index = self._key("debates")
+        await self._conn.execute("ZREMRANGEBYSCORE", index, "-inf", time.time() - self.retention_seconds)
+        ids = [debate_id.decode("utf-8") for debate_id in await self._conn.execute("ZREVRANGE", index, 0, limit - 1)]
+        if not ids:
+            return []
+        rows = await self._conn.pipeline([("HMGET", self._key("debate", debate_id), *DEBATE_COLUMNS[1:])
+                                          for debate_id in ids])
+        return [self._record(debate_id, values) for debate_id, values in zip(ids, rows)
+                if not isinstance(values, RespError) and values[0] is not None]
+
+
+_broker: Optional[JobBroker] = None
+
+
+def open_broker(url: str, retention_seconds: float = 86400.0) -> JobBroker:
+    """Broker for ``sqlite:///relative/path``, ``sqlite:////absolute/path`` or ``redis://...``"""
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):], retention_seconds)
+    if url.startswith("redis://"):
+        return RedisBroker(url, retention_seconds)
+    raise ValueError(f"Unsupported broker URL: {url} (expected sqlite:///path or redis://host:port/db)")
+
+
+def get_broker() -> Optional[JobBroker]:
+    """The job broker, or None when debates run in the API process"""
+    return _broker
+
+
+async def configure_broker(queue_config, retention_seconds: float = 86400.0) -> Optional[JobBroker]:
+    """Open the broker named by a QueueConfig (closing a previously configured one)"""
+    global _broker
+    if _broker is not None:
+        await _broker.aclose()
+        _broker = None
+    if queue_config.broker:
+        _broker = open_broker(queue_config.broker, retention_seconds)
+        logger.info(f"Job broker: {queue_config.broker} (worker {_broker.worker})")
+    return _broker
+
+
+async def close_broker():
+    global _broker
+    if _broker is not None:
+        await _broker.aclose()
+        _broker = None
@@ -0,0 +1,97 @@
+"""
+Micro-batching of non-streaming LLM calls across debates
+
+Agents with ``batch_window_ms`` set send their ``chat()`` / ``generate()``
+calls through a shared batcher. The first call opens a window; calls for the
+same model and endpoint that arrive within it, up to ``batch_max_size``, go
+to the adapter together as one ``complete_batch()``, and each caller awaits
+its own future. With ``batch_api`` an Anthropic batch becomes one Message
+Batches job; a ``local`` batch lands in a single engine batch.
+
+Meant for the judge (research summaries and verdicts) in tournament runs,
+where debates finish close together and a bounded extra delay is cheap.
+"""
+
+import asyncio
+import contextvars
+from typing import Dict, List, Optional, Tuple
+
+from utils.logger import setup_logger
+from utils.metrics import LLM_BATCH_SIZE
+from utils.llm_providers import BatchRequest, LLMResponse, ProviderAdapter
+from utils.llm_scheduler import PRIORITIES, call_context, current_call_context, scheduler
+
+logger = setup_logger(__name__)
+
+
+class MicroBatcher:
+    """Collect calls for one adapter over a short window and send them together"""
+
+    def __init__(self, adapter: ProviderAdapter, window_ms: float, max_size: int):
+        self.adapter = adapter
+        self.window = window_ms / 1000
+        self.max_size = max(1, max_size)
+        self._pending: List[Tuple[BatchRequest, asyncio.Future]] = []
+        self._contexts: List[Tuple[str, str]] = []  # (priority, tenant) of each pending call
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batch_size_metric = LLM_BATCH_SIZE.labels(adapter.name)
+
+    async def submit(self, request: BatchRequest) -> LLMResponse:
+        """Add a call to the open batch and wait for its response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        self._contexts.append(current_call_context())
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        contexts, self._contexts = self._contexts, []
+        if batch:
+            # Fresh context: the batch's timing and spans belong to no single caller
+            asyncio.create_task(self._send(batch, contexts), context=contextvars.Context())
+
+    async def _send(self, batch: List[Tuple[BatchRequest, asyncio.Future]], contexts: List[Tuple[str, str]]):
+        self._batch_size_metric.observe(len(batch))
+        # The batch takes one provider slot at the most urgent priority among its calls
+        priority, tenant = min(contexts, key=lambda context: PRIORITIES.index(context[0]))
+        try:
+            with call_context(priority, tenant):
+                async with scheduler.slot(self.adapter.name):
+                    results = await self.adapter.complete_batch([request for request, _ in batch])
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} {self.adapter.label} calls failed: {str(e)}")
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# One batcher per endpoint/model configuration and event loop, shared by every debate
+_batchers: Dict[Tuple[str, asyncio.AbstractEventLoop], MicroBatcher] = {}
+
+
+def get_batcher(key: str, adapter: ProviderAdapter) -> MicroBatcher:
+    """Shared batcher for calls with an identical configuration ``key``
+
+    Calls are sent through the adapter of the first client to ask.
+    """
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get((key, loop))
+    if batcher is None:
+        for stale in [k for k in _batchers if k[1].is_closed()]:
+            del _batchers[stale]
+        config = adapter.config
+        batcher = _batchers[(key, loop)] = MicroBatcher(adapter, config.batch_window_ms, config.batch_max_size)
+    return batcher
@@ -1,220 +1,195 @@
 """
 LLM client for interacting with different AI providers
+
+Provider wire formats live in ``utils.llm_providers``; this client adds
+message normalization, metrics and tracing on top of the adapter.
 """
 
-import asyncio
-from typing import Dict, Any, Optional
-import aiohttp
-import json
+import hashlib
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 
 from config.settings import AgentConfig
 from utils.logger import setup_logger
+from utils.timing import monotonic_ns
+from utils.metrics import LLM_REQUEST_DURATION, LLM_TOKENS, CACHE_REQUESTS, record_error
+from utils.tracing import tracer
+from utils.llm_providers import BatchRequest, ChatTurn, LLMResponse, create_adapter
+from utils.llm_batcher import get_batcher
+from utils.llm_scheduler import scheduler
 
 logger = setup_logger(__name__)
 
 class LLMClient:
     """Client for interacting with various LLM providers"""
     
-    def __init__(self, config: AgentConfig, api_keys: Dict[str, str]):
+    def __init__(self, config: AgentConfig, api_keys: Dict[str, str], role: str = "unknown"):
         self.config = config
         self.api_keys = api_keys
         self.provider = config.provider.lower()
+        self.role = role
         
-        # Validate API key
-        self._validate_api_key()
+        # Resolves the provider and validates its API key
+        self.adapter = create_adapter(config, api_keys)
         
-        logger.info(f"LLM client initialized: {self.provider}/{self.config.model}")
-    
-    def _validate_api_key(self):
-        """Validate that the required API key is available"""
-        key_mapping = {
-            "google": "google_api_key",
-            "openai": "openai_api_key",
-            "anthropic": "anthropic_api_key",
-            "xai": "xai_api_key",
-            "groq": "groq_api_key"
-        }
+        # Clients with identical settings and credentials share a micro-batcher
+        self._batch_key = None
+        if config.batch_window_ms > 0:
+            credential = hashlib.sha256((self.adapter.api_key or "").encode("utf-8")).hexdigest()
+            self._batch_key = f"{config.model_dump_json()}\x1f{credential}"
         
-        required_key = key_mapping.get(self.provider)
-        if required_key and not self.api_keys.get(required_key):
-            raise ValueError(f"API key '{required_key}' is required for provider '{self.provider}'")
+        # Resolve metric children once; recording is then allocation-free
+        self._latency_metric = LLM_REQUEST_DURATION.labels(self.provider, config.model, role)
+        self._tokens_in_metric = LLM_TOKENS.labels(self.provider, config.model, role, "in")
+        self._tokens_out_metric = LLM_TOKENS.labels(self.provider, config.model, role, "out")
+        self._tokens_cached_metric = LLM_TOKENS.labels(self.provider, config.model, role, "cached")
+        self._prompt_cache_hits = CACHE_REQUESTS.labels("llm_prompt", "hit")
+        self._prompt_cache_misses = CACHE_REQUESTS.labels("llm_prompt", "miss")
+        
+        logger.info(f"LLM client initialized: {self.provider}/{self.config.model}")
     
     async def generate(self, 
                       prompt: str, 
                       system_prompt: Optional[str] = None,
                       temperature: Optional[float] = None,
-                      max_tokens: Optional[int] = None) -> str:
-        """Generate text using the configured LLM provider"""
+                      max_tokens: Optional[int] = None,
+                      cached_prefix: Optional[str] = None) -> LLMResponse:
+        """Generate text from a single prompt (a one-message chat)
+        
+        ``cached_prefix`` is a stable leading part of the user prompt (identical
+        across calls, e.g. topic + research). It is sent before ``prompt`` and
+        marked for provider-side prompt caching.
+        """
+        messages: List[Dict[str, Any]] = []
+        if cached_prefix:
+            messages.append({"role": "user", "content": cached_prefix, "cache": True})
+        messages.append({"role": "user", "content": prompt})
+        return await self.chat(messages, system_prompt, temperature, max_tokens)
+    
+    async def chat(self,
+                   messages: List[Dict[str, Any]],
+                   system_prompt: Optional[str] = None,
+                   temperature: Optional[float] = None,
+                   max_tokens: Optional[int] = None) -> LLMResponse:
+        """Generate the next assistant turn of a multi-turn conversation
+        
+        ``messages`` are ``{"role": "user" | "assistant", "content": str}`` dicts
+        in order; consecutive messages with the same role are merged. A message
+        with ``"cache": True`` ends a stable prefix that is marked for provider
+        prompt caching: Anthropic ``cache_control`` breakpoints, OpenAI-style
+        automatic prefix caching, and Gemini cached content when
+        ``prompt_cache_ttl`` is set.
+        
+        The call waits for a provider slot from the shared scheduler (see
+        ``utils.llm_scheduler``). With ``batch_window_ms`` set, it is instead
+        micro-batched with concurrent calls from other debates (see
+        ``utils.llm_batcher``), and the batch takes one slot.
+        """
         
         temperature = temperature or self.config.temperature
         max_tokens = max_tokens or self.config.max_tokens
+        turns = self._normalize_messages(messages)
+        cacheable = self.config.prompt_cache and (bool(system_prompt) or any(t.cached for t in turns))
         
+        start_ns = monotonic_ns()
         try:
-            if self.provider == "google":
-                return await self._generate_google(prompt, system_prompt, temperature, max_tokens)
-            elif self.provider == "openai":
-                return await self._generate_openai(prompt, system_prompt, temperature, max_tokens)
-            elif self.provider == "anthropic":
-                return await self._generate_anthropic(prompt, system_prompt, temperature, max_tokens)
-            elif self.provider == "xai":
-                return await self._generate_xai(prompt, system_prompt, temperature, max_tokens)
-            elif self.provider == "groq":
-                return await self._generate_groq(prompt, system_prompt, temperature, max_tokens)
-            else:
-                raise ValueError(f"Unsupported provider: {self.provider}")
+            with tracer.span("llm.generate", **self._span_attributes(turns, system_prompt, temperature, max_tokens)) as span:
+                if self._batch_key is not None:
+                    span.set_attribute("llm.batched", True)
+                    response = await get_batcher(self._batch_key, self.adapter).submit(
+                        BatchRequest(turns, system_prompt, temperature, max_tokens))
+                else:
+                    async with scheduler.slot(self.provider):
+                        response = await self.adapter.complete(turns, system_prompt, temperature, max_tokens)
+                self._record(response, start_ns, cacheable, span)
+                return response
                 
         except Exception as e:
             logger.error(f"LLM generation failed: {str(e)}")
+            record_error("llm", e)
             raise
+        finally:
+            self._latency_metric.observe((monotonic_ns() - start_ns) / 1_000_000_000)
     
-    async def _generate_google(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
-        """Generate using Google Gemini API"""
-        api_key = self.api_keys["google_api_key"]
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.config.model}:generateContent?key={api_key}"
-        
-        # Combine system and user prompts
-        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        
-        payload = {
-            "contents": [{
-                "parts": [{"text": full_prompt}]
-            }],
-            "generationConfig": {
-                "temperature": temperature,
-                "maxOutputTokens": max_tokens,
-                "topP": 0.8,
-                "topK": 10
-            }
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["candidates"][0]["content"]["parts"][0]["text"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Google API error {response.status}: {error_text}")
-    
-    async def _generate_openai(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
-        """Generate using OpenAI API"""
-        api_key = self.api_keys["openai_api_key"]
-        url = "https://api.openai.com/v1/chat/completions"
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        payload = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
+    async def stream_chat(self,
+                          messages: List[Dict[str, Any]],
+                          system_prompt: Optional[str] = None,
+                          temperature: Optional[float] = None,
+                          max_tokens: Optional[int] = None) -> AsyncIterator[Union[str, LLMResponse]]:
+        """Like chat(), but yield text deltas as they arrive, then the final LLMResponse"""
         
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        temperature = temperature or self.config.temperature
+        max_tokens = max_tokens or self.config.max_tokens
+        turns = self._normalize_messages(messages)
+        cacheable = self.config.prompt_cache and (bool(system_prompt) or any(t.cached for t in turns))
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"OpenAI API error {response.status}: {error_text}")
+        start_ns = monotonic_ns()
+        try:
+            with tracer.span("llm.stream", **self._span_attributes(turns, system_prompt, temperature, max_tokens)) as span:
+                first_chunk = True
+                async with scheduler.slot(self.provider):
+                    async for item in self.adapter.stream(turns, system_prompt, temperature, max_tokens):
+                        if isinstance(item, LLMResponse):
+                            self._record(item, start_ns, cacheable, span)
+                        elif first_chunk:
+                            first_chunk = False
+                            span.set_attribute("llm.time_to_first_chunk_ms", (monotonic_ns() - start_ns) / 1_000_000)
+                        yield item
+                
+        except Exception as e:
+            logger.error(f"LLM streaming failed: {str(e)}")
+            record_error("llm", e)
+            raise
+        finally:
+            self._latency_metric.observe((monotonic_ns() - start_ns) / 1_000_000_000)
     
-    async def _generate_anthropic(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
-        """Generate using Anthropic Claude API"""
-        api_key = self.api_keys["anthropic_api_key"]
-        url = "https://api.anthropic.com/v1/messages"
-        
-        payload = {
-            "model": self.config.model,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "messages": [{"role": "user", "content": prompt}]
+    def _span_attributes(self,
+                         turns: List[ChatTurn],
+                         system_prompt: Optional[str],
+                         temperature: float,
+                         max_tokens: int) -> Dict[str, Any]:
+        return {
+            "gen_ai.system": self.provider,
+            "gen_ai.request.model": self.config.model,
+            "gen_ai.request.temperature": temperature,
+            "gen_ai.request.max_tokens": max_tokens,
+            "agent.role": self.role,
+            "llm.messages": len(turns),
+            "llm.prompt_chars": len(system_prompt or "") + sum(len(t.text) for t in turns)
         }
-        
-        if system_prompt:
-            payload["system"] = system_prompt
-        
-        headers = {
-            "x-api-key": api_key,
-            "Content-Type": "application/json",
-            "anthropic-version": "2023-06-01"
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["content"][0]["text"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Anthropic API error {response.status}: {error_text}")
     
-    async def _generate_xai(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
-        """Generate using xAI Grok API"""
-        api_key = self.api_keys["xai_api_key"]
-        url = "https://api.x.ai/v1/chat/completions"
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        payload = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
-        
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"xAI API error {response.status}: {error_text}")
+    def _record(self, response: LLMResponse, start_ns: int, cacheable: bool, span):
+        """Stamp latency and record token metrics and span attributes for a finished call"""
+        response.latency_ms = (monotonic_ns() - start_ns) / 1_000_000
+        
+        self._tokens_in_metric.inc(response.prompt_tokens)
+        self._tokens_out_metric.inc(response.completion_tokens)
+        if cacheable:
+            self._tokens_cached_metric.inc(response.cached_tokens)
+            if response.cached_tokens:
+                self._prompt_cache_hits.inc()
+            else:
+                self._prompt_cache_misses.inc()
+        span.set_attributes({
+            "gen_ai.response.model": response.model,
+            "gen_ai.usage.input_tokens": response.prompt_tokens,
+            "gen_ai.usage.output_tokens": response.completion_tokens,
+            "gen_ai.usage.cache_read.input_tokens": response.cached_tokens,
+            "llm.response_chars": len(response.text)
+        })
     
-    async def _generate_groq(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> str:
-        """Generate using Groq API"""
-        api_key = self.api_keys["groq_api_key"]
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        payload = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
-        
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+    def _normalize_messages(self, messages: List[Dict[str, Any]]) -> List[ChatTurn]:
+        """Merge consecutive same-role messages into alternating turns"""
+        turns: List[ChatTurn] = []
+        for message in messages:
+            role = message["role"]
+            if role not in ("user", "assistant"):
+                raise ValueError(f"Unsupported chat role: {role}")
+            cache = bool(message.get("cache")) and self.config.prompt_cache
+            if turns and turns[-1].role == role:
+                turns[-1].parts.append((message["content"], cache))
+            else:
+                turns.append(ChatTurn(role, [(message["content"], cache)]))
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Groq API error {response.status}: {error_text}")
+        if not turns or turns[0].role != "user":
+            raise ValueError("Chat messages must start with a user message")
+        return turns
@@ -0,0 +1,740 @@
+"""
+Provider adapters for the LLM client
+
+Each adapter turns normalized chat turns into one provider's wire format and
+parses the reply (text and token usage). Adapters share a pooled HTTP
+session, retry with backoff, SSE streaming and usage parsing.
+
+Adapters are looked up by provider name in a registry. Besides the built-in
+providers, any OpenAI-compatible server (vLLM, llama.cpp, Ollama, a mock
+server) can be registered by base URL, either from the ``providers`` config
+section or with ``register_openai_compatible()``.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from config.settings import AgentConfig
+from utils import fast_json
+from utils.logger import setup_logger
+from utils.metrics import LLM_RETRIES
+from utils.mock_llm import MockLLM, MockLLMError
+from utils.timing import timed, NETWORK, PARSE
+
+logger = setup_logger(__name__)
+
+# Joins merged parts of one turn, and turns when a provider takes a single text
+TURN_SEPARATOR = "\n\n"
+
+HTTP_POOL_SIZE = 100  # concurrent connections per event loop, across all providers
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRY_BASE_DELAY = 0.5  # seconds; doubled per attempt, with jitter
+RETRY_MAX_DELAY = 20.0
+BATCH_POLL_INTERVAL = 10.0  # seconds between status checks of a provider batch job
+
+
+@dataclass
+class LLMResponse:
+    """Structured result of an LLM call"""
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens read from the provider's prompt cache
+    latency_ms: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class ChatTurn:
+    """One conversation turn after merging consecutive same-role messages"""
+    role: str  # 'user' or 'assistant'
+    parts: List[Tuple[str, bool]]  # (text, ends a cacheable prefix)
+
+    @property
+    def text(self) -> str:
+        return TURN_SEPARATOR.join(text for text, _ in self.parts)
+
+    @property
+    def cached(self) -> bool:
+        return any(cache for _, cache in self.parts)
+
+    def split_at_cache(self) -> Tuple[str, str]:
+        """Split the text after the first cache breakpoint (head, tail)"""
+        index = next((j for j, (_, cache) in enumerate(self.parts) if cache), len(self.parts) - 1)
+        head = TURN_SEPARATOR.join(text for text, _ in self.parts[:index + 1])
+        tail = TURN_SEPARATOR.join(text for text, _ in self.parts[index + 1:])
+        return head, tail
+
+
+@dataclass
+class BatchRequest:
+    """One call collected into a batch"""
+    turns: List[ChatTurn]
+    system_prompt: Optional[str]
+    temperature: float
+    max_tokens: int
+
+
+class ProviderError(Exception):
+    """Non-success reply from a provider API"""
+
+    def __init__(self, message: str, status: int = 0, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+# Pooled HTTP sessions, one per event loop (a session cannot be shared across loops)
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Shared keep-alive session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        for stale in [l for l in _sessions if l.is_closed()]:
+            del _sessions[stale]
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300),
+                                        json_serialize=lambda obj: fast_json.dumps(obj).decode("utf-8"))
+        _sessions[loop] = session
+    return session
+
+
+async def close_sessions():
+    """Close the pooled session of the running event loop"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ProviderAdapter:
+    """Base adapter: HTTP plumbing shared by every provider"""
+
+    label = "LLM"
+    api_key_name: Optional[str] = None
+    default_base_url: Optional[str] = None
+
+    def __init__(self, name: str, config: AgentConfig, api_keys: Dict[str, str]):
+        self.name = name
+        self.config = config
+        self.api_key = api_keys.get(self.api_key_name) if self.api_key_name else None
+        if self.api_key_name and not self.api_key:
+            raise ValueError(f"API key '{self.api_key_name}' is required for provider '{name}'")
+        self.timeout = aiohttp.ClientTimeout(total=config.request_timeout)
+
+    async def complete(self,
+                       turns: List[ChatTurn],
+                       system_prompt: Optional[str],
+                       temperature: float,
+                       max_tokens: int) -> LLMResponse:
+        raise NotImplementedError
+
+    async def stream(self,
+                     turns: List[ChatTurn],
+                     system_prompt: Optional[str],
+                     temperature: float,
+                     max_tokens: int) -> AsyncIterator[Union[str, LLMResponse]]:
+        """Yield text deltas, then the final LLMResponse (default: one chunk)"""
+        response = await self.complete(turns, system_prompt, temperature, max_tokens)
+        yield response.text
+        yield response
+
+    async def complete_batch(self, requests: List[BatchRequest]) -> List[Union[LLMResponse, BaseException]]:
+        """Complete several calls at once; failures are returned in place of their response
+
+        The default sends them concurrently. Adapters with a provider batch API
+        override this when ``batch_api`` is set.
+        """
+        return await asyncio.gather(
+            *(self.complete(r.turns, r.system_prompt, r.temperature, r.max_tokens) for r in requests),
+            return_exceptions=True
+        )
+
+    def endpoint(self, path: str) -> str:
+        """Build a request URL, honouring a configured base_url override"""
+        base_url = self.config.base_url or self.default_base_url
+        return base_url.rstrip("/") + path
+
+    def response(self, text: str, model: Optional[str], **usage) -> LLMResponse:
+        return LLMResponse(text=text, provider=self.name, model=model or self.config.model, **usage)
+
+    async def _with_retries(self, send: Callable[[], Any]) -> Any:
+        """Run a request, retrying throttling, server errors and connection failures"""
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return await send()
+            except (ProviderError, MockLLMError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = getattr(e, "status", 0)
+                retryable = (status in RETRY_STATUSES if isinstance(e, (ProviderError, MockLLMError))
+                             else True)
+                if not retryable or attempt == self.config.max_retries:
+                    raise
+                delay = getattr(e, "retry_after", None)
+                if delay is None:
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * (0.5 + random.random())
+                reason = str(status) if status else type(e).__name__
+                LLM_RETRIES.labels(self.name, reason).inc()
+                logger.warning(f"{self.label} request failed ({reason}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """POST a JSON payload and decode the JSON response, timing network and parse separately"""
+        async def send():
+            with timed(NETWORK):
+                async with get_session().post(url, json=payload, headers=headers, timeout=self.timeout) as response:
+                    body = await response.read()
+                    if response.status != 200:
+                        error_text = body.decode("utf-8", errors="replace")
+                        raise ProviderError(f"{self.label} API error {response.status}: {error_text}",
+                                            response.status, _retry_after(response.headers))
+            with timed(PARSE):
+                return fast_json.loads(body)
+
+        return await self._with_retries(send)
+
+    async def get_bytes(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        """GET a resource body, with the same retries as post_json"""
+        async def send():
+            with timed(NETWORK):
+                async with get_session().get(url, headers=headers, timeout=self.timeout) as response:
+                    body = await response.read()
+                    if response.status != 200:
+                        error_text = body.decode("utf-8", errors="replace")
+                        raise ProviderError(f"{self.label} API error {response.status}: {error_text}",
+                                            response.status, _retry_after(response.headers))
+                    return body
+
+        return await self._with_retries(send)
+
+    async def post_sse(self,
+                       url: str,
+                       payload: Dict[str, Any],
+                       headers: Optional[Dict[str, str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """POST and yield each decoded ``data:`` event of a server-sent event stream
+
+        Only establishing the stream is retried; a stream that fails midway
+        raises, since its partial output has already been yielded.
+        """
+        async def connect():
+            response = await get_session().post(url, json=payload, headers=headers, timeout=self.timeout)
+            if response.status != 200:
+                body = await response.read()
+                response.release()
+                raise ProviderError(f"{self.label} API error {response.status}: {body.decode('utf-8', errors='replace')}",
+                                    response.status, _retry_after(response.headers))
+            return response
+
+        with timed(NETWORK):
+            response = await self._with_retries(connect)
+        try:
+            async for raw_line in response.content:
+                line = raw_line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                with timed(PARSE):
+                    event = fast_json.loads(data)
+                yield event
+        finally:
+            response.release()
+
+
+class OpenAICompatibleAdapter(ProviderAdapter):
+    """Chat Completions API: OpenAI, xAI, Groq and any compatible server"""
+
+    label = "OpenAI-compatible"
+    # Only the OpenAI API itself accepts prompt_cache_key
+    supports_prompt_cache_key = False
+
+    def __init__(self,
+                 name: str,
+                 config: AgentConfig,
+                 api_keys: Dict[str, str],
+                 base_url: Optional[str] = None,
+                 api_key_name: Optional[str] = None,
+                 label: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.api_key_name = api_key_name
+        self.default_base_url = base_url
+        self.label = label or self.label
+        self.extra_headers = headers or {}
+        super().__init__(name, config, api_keys)
+        if not (config.base_url or base_url):
+            raise ValueError(f"Provider '{name}' needs a base_url")
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json", **self.extra_headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def payload(self, turns: List[ChatTurn], system_prompt: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+        # Prefix caching is automatic; system prompt and stable turns go first so it hits
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.extend({"role": turn.role, "content": turn.text} for turn in turns)
+
+        payload = {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if self.supports_prompt_cache_key and turns[0].cached and not self.config.base_url:
+            # Route requests sharing the opening context to the same cache
+            payload["prompt_cache_key"] = prefix_key(system_prompt, turns[0].split_at_cache()[0])[:32]
+        return payload
+
+    def parse_usage(self, usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        return {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "cached_tokens": details.get("cached_tokens", 0)
+        }
+
+    async def complete(self, turns, system_prompt, temperature, max_tokens) -> LLMResponse:
+        data = await self.post_json(self.endpoint("/chat/completions"),
+                                    self.payload(turns, system_prompt, temperature, max_tokens),
+                                    self.headers())
+        with timed(PARSE):
+            return self.response(data["choices"][0]["message"]["content"], data.get("model"),
+                                 **self.parse_usage(data.get("usage")))
+
+    async def stream(self, turns, system_prompt, temperature, max_tokens):
+        payload = self.payload(turns, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+        chunks = []
+        model = None
+        usage = None
+        async for event in self.post_sse(self.endpoint("/chat/completions"), payload, self.headers()):
+            model = event.get("model", model)
+            usage = event.get("usage") or usage
+            for choice in event.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        yield self.response("".join(chunks), model, **self.parse_usage(usage))
+
+
+class OpenAIAdapter(OpenAICompatibleAdapter):
+    supports_prompt_cache_key = True
+
+
+class AnthropicAdapter(ProviderAdapter):
+    """Anthropic Messages API with cache_control breakpoints"""
+
+    label = "Anthropic"
+    api_key_name = "anthropic_api_key"
+    default_base_url = "https://api.anthropic.com/v1"
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+
+    def payload(self, turns: List[ChatTurn], system_prompt: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+        cache_control = {"type": "ephemeral"}
+        # At most four breakpoints per request: the system prompt plus the last three in the messages
+        breakpoints = [(i, j) for i, turn in enumerate(turns) for j, (_, cache) in enumerate(turn.parts) if cache]
+        keep = set(breakpoints[-3:])
+
+        messages = []
+        for i, turn in enumerate(turns):
+            if not turn.cached:
+                messages.append({"role": turn.role, "content": turn.text})
+                continue
+            # Breakpoint after each cached part; the separators keep the text identical to turn.text
+            blocks = []
+            for j, (text, _) in enumerate(turn.parts):
+                block = {"type": "text", "text": text + (TURN_SEPARATOR if j < len(turn.parts) - 1 else "")}
+                if (i, j) in keep:
+                    block["cache_control"] = cache_control
+                blocks.append(block)
+            messages.append({"role": turn.role, "content": blocks})
+
+        payload = {
+            "model": self.config.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": messages
+        }
+        if system_prompt:
+            if self.config.prompt_cache:
+                payload["system"] = [{"type": "text", "text": system_prompt, "cache_control": cache_control}]
+            else:
+                payload["system"] = system_prompt
+        return payload
+
+    @staticmethod
+    def parse_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+        # input_tokens excludes cache reads and writes; report the full prompt size
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        cache_write = usage.get("cache_creation_input_tokens") or 0
+        return {
+            "prompt_tokens": usage.get("input_tokens", 0) + cache_read + cache_write,
+            "completion_tokens": usage.get("output_tokens", 0),
+            "cached_tokens": cache_read
+        }
+
+    async def complete(self, turns, system_prompt, temperature, max_tokens) -> LLMResponse:
+        data = await self.post_json(self.endpoint("/messages"),
+                                    self.payload(turns, system_prompt, temperature, max_tokens),
+                                    self.headers())
+        with timed(PARSE):
+            return self.response(data["content"][0]["text"], data.get("model"),
+                                 **self.parse_usage(data.get("usage", {})))
+
+    async def complete_batch(self, requests):
+        if not self.config.batch_api:
+            return await super().complete_batch(requests)
+
+        # Message Batches API: half price, results arrive asynchronously (usually within minutes)
+        batch = await self.post_json(self.endpoint("/messages/batches"), {"requests": [
+            {"custom_id": str(i), "params": self.payload(r.turns, r.system_prompt, r.temperature, r.max_tokens)}
+            for i, r in enumerate(requests)
+        ]}, self.headers())
+        interval = self.config.options.get("batch_poll_seconds", BATCH_POLL_INTERVAL)
+        while batch.get("processing_status") != "ended":
+            await asyncio.sleep(interval)
+            batch = fast_json.loads(await self.get_bytes(self.endpoint(f"/messages/batches/{batch['id']}"), self.headers()))
+
+        results: List[Union[LLMResponse, BaseException]] = [
+            ProviderError("Anthropic batch result missing") for _ in requests
+        ]
+        body = await self.get_bytes(batch["results_url"], self.headers())
+        with timed(PARSE):
+            for line in body.splitlines():
+                if not line.strip():
+                    continue
+                entry = fast_json.loads(line)
+                result = entry["result"]
+                if result["type"] == "succeeded":
+                    message = result["message"]
+                    results[int(entry["custom_id"])] = self.response(
+                        message["content"][0]["text"], message.get("model"),
+                        **self.parse_usage(message.get("usage", {}))
+                    )
+                else:
+                    results[int(entry["custom_id"])] = ProviderError(
+                        f"Anthropic batch request {result['type']}: {result.get('error')}"
+                    )
+        return results
+
+    async def stream(self, turns, system_prompt, temperature, max_tokens):
+        payload = self.payload(turns, system_prompt, temperature, max_tokens)
+        payload["stream"] = True
+
+        chunks = []
+        model = None
+        usage: Dict[str, Any] = {}
+        async for event in self.post_sse(self.endpoint("/messages"), payload, self.headers()):
+            kind = event.get("type")
+            if kind == "message_start":
+                message = event.get("message", {})
+                model = message.get("model")
+                usage.update(message.get("usage") or {})
+            elif kind == "content_block_delta":
+                delta = event.get("delta", {}).get("text")
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+            elif kind == "message_delta":
+                usage.update(event.get("usage") or {})
+            elif kind == "error":
+                raise ProviderError(f"Anthropic stream error: {event.get('error')}")
+        yield self.response("".join(chunks), model, **self.parse_usage(usage))
+
+
+class GoogleAdapter(ProviderAdapter):
+    """Gemini generateContent API with optional explicit context caching"""
+
+    label = "Google"
+    api_key_name = "google_api_key"
+    default_base_url = "https://generativelanguage.googleapis.com/v1beta"
+
+    def __init__(self, name: str, config: AgentConfig, api_keys: Dict[str, str]):
+        super().__init__(name, config, api_keys)
+        # Explicit context caches: prefix hash -> (cachedContent name or None, expiry)
+        self._caches: Dict[str, Tuple[Optional[str], float]] = {}
+
+    async def payload(self, turns: List[ChatTurn], system_prompt: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+        contents = [
+            {"role": "model" if turn.role == "assistant" else "user", "parts": [{"text": turn.text}]}
+            for turn in turns
+        ]
+
+        cache_name = None
+        if self.config.prompt_cache_ttl:
+            cached_contents, contents = self._split_cached_prefix(turns, contents)
+            if cached_contents:
+                cache_name = await self._cached_content(system_prompt, cached_contents)
+                if cache_name is None:
+                    contents = cached_contents + contents
+
+        payload = {
+            "contents": contents,
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens,
+                "topP": 0.8,
+                "topK": 10
+            }
+        }
+        if cache_name:
+            # System prompt and prefix live in the cached content; send only the remainder
+            payload["cachedContent"] = cache_name
+        elif system_prompt:
+            payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        return payload
+
+    @staticmethod
+    def parse_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            "prompt_tokens": usage.get("promptTokenCount", 0),
+            "completion_tokens": usage.get("candidatesTokenCount", 0),
+            "cached_tokens": usage.get("cachedContentTokenCount", 0)
+        }
+
+    def model_url(self, method: str) -> str:
+        return self.endpoint(f"/models/{self.config.model}:{method}")
+
+    async def complete(self, turns, system_prompt, temperature, max_tokens) -> LLMResponse:
+        payload = await self.payload(turns, system_prompt, temperature, max_tokens)
+        data = await self.post_json(f"{self.model_url('generateContent')}?key={self.api_key}", payload)
+        with timed(PARSE):
+            return self.response(data["candidates"][0]["content"]["parts"][0]["text"], data.get("modelVersion"),
+                                 **self.parse_usage(data.get("usageMetadata", {})))
+
+    async def stream(self, turns, system_prompt, temperature, max_tokens):
+        payload = await self.payload(turns, system_prompt, temperature, max_tokens)
+        url = f"{self.model_url('streamGenerateContent')}?alt=sse&key={self.api_key}"
+
+        chunks = []
+        model = None
+        usage: Dict[str, Any] = {}
+        async for event in self.post_sse(url, payload):
+            model = event.get("modelVersion", model)
+            usage = event.get("usageMetadata") or usage
+            for candidate in event.get("candidates") or []:
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        chunks.append(part["text"])
+                        yield part["text"]
+        yield self.response("".join(chunks), model, **self.parse_usage(usage))
+
+    @staticmethod
+    def _split_cached_prefix(turns: List[ChatTurn],
+                             contents: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split Gemini contents after the first cache breakpoint (cached, remainder)
+
+        Explicit caches are billed for storage, so only the opening context
+        (stable for the whole debate) is cached, not the growing history.
+        """
+        for index, turn in enumerate(turns):
+            if not turn.cached:
+                continue
+            prefix, rest = turn.split_at_cache()
+            role = contents[index]["role"]
+            cached = contents[:index] + [{"role": role, "parts": [{"text": prefix}]}]
+            remainder = ([{"role": role, "parts": [{"text": rest}]}] if rest else []) + contents[index + 1:]
+            return cached, remainder
+        return [], contents
+
+    async def _cached_content(self, system_prompt: Optional[str], cached_contents: List[Dict[str, Any]]) -> Optional[str]:
+        """Get (creating on first use) a cachedContents entry for the system prompt + prefix
+
+        Returns None when the cache cannot be created (e.g. the prefix is below
+        the model's minimum cacheable size); that prefix then falls back to the
+        inline prompt and is not retried.
+        """
+        key = prefix_key(system_prompt, json.dumps(cached_contents, sort_keys=True))
+        now = time.monotonic()
+        entry = self._caches.get(key)
+        if entry is not None and (entry[0] is None or entry[1] > now):
+            return entry[0]
+
+        ttl = self.config.prompt_cache_ttl
+        payload: Dict[str, Any] = {
+            "model": f"models/{self.config.model}",
+            "contents": cached_contents,
+            "ttl": f"{ttl}s"
+        }
+        if system_prompt:
+            payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+
+        try:
+            data = await self.post_json(f"{self.endpoint('/cachedContents')}?key={self.api_key}", payload)
+            name = data["name"]
+        except Exception as e:
+            logger.warning(f"Gemini context cache unavailable, sending prefix inline: {str(e)}")
+            self._caches[key] = (None, float("inf"))
+            return None
+
+        # Refresh a little before the server-side expiry
+        self._caches[key] = (name, now + max(ttl - 30, ttl / 2))
+        logger.info(f"Created Gemini cached content {name} (ttl {ttl}s)")
+        return name
+
+
+class MockAdapter(ProviderAdapter):
+    """Offline seeded mock backend (no network, no API key)"""
+
+    label = "Mock"
+
+    def __init__(self, name: str, config: AgentConfig, api_keys: Dict[str, str]):
+        super().__init__(name, config, api_keys)
+        self.mock = MockLLM(**config.options)
+
+    async def complete(self, turns, system_prompt, temperature, max_tokens) -> LLMResponse:
+        prompt, cache_boundaries = flatten(turns)
+        attempt = 0
+
+        async def send():
+            # Injected errors are seeded per attempt, so a retry can succeed
+            nonlocal attempt
+            attempt += 1
+            with timed(NETWORK):
+                return await self.mock.generate(prompt, system_prompt, max_tokens, cache_boundaries, attempt - 1)
+
+        completion = await self._with_retries(send)
+        return self.response(completion.text, None,
+                             prompt_tokens=completion.prompt_tokens,
+                             completion_tokens=completion.completion_tokens,
+                             cached_tokens=completion.cached_tokens)
+
+    async def stream(self, turns, system_prompt, temperature, max_tokens):
+        # Not retried: an injected error surfaces before the first chunk, as a failed connect would
+        prompt, cache_boundaries = flatten(turns)
+        async for item in self.mock.stream(prompt, system_prompt, max_tokens, cache_boundaries):
+            if isinstance(item, str):
+                yield item
+            else:
+                yield self.response(item.text, None,
+                                    prompt_tokens=item.prompt_tokens,
+                                    completion_tokens=item.completion_tokens,
+                                    cached_tokens=item.cached_tokens)
+
+
+def flatten(turns: List[ChatTurn]) -> Tuple[str, List[int]]:
+    """Whole conversation as one text, plus the offsets where a cacheable prefix may end
+
+    Every part boundary up to the last cache breakpoint qualifies, which is
+    how automatic (longest-prefix) provider caches behave.
+    """
+    texts = []
+    boundaries = []
+    last_breakpoint = -1
+    offset = 0
+    for turn in turns:
+        for text, cache in turn.parts:
+            if texts:
+                offset += len(TURN_SEPARATOR)
+            texts.append(text)
+            offset += len(text)
+            boundaries.append(offset)
+            if cache:
+                last_breakpoint = len(boundaries)
+    return TURN_SEPARATOR.join(texts), boundaries[:max(last_breakpoint, 0)]
+
+
+def prefix_key(system_prompt: Optional[str], cached_prefix: str) -> str:
+    """Stable hash identifying a system prompt + prefix pair"""
+    return hashlib.sha256(f"{system_prompt or ''}\x1f{cached_prefix}".encode("utf-8")).hexdigest()
+
+
+AdapterFactory = Callable[[str, AgentConfig, Dict[str, str]], ProviderAdapter]
+
+_registry: Dict[str, AdapterFactory] = {}
+
+
+def register_provider(name: str, factory: AdapterFactory):
+    """Register an adapter factory under a provider name (replaces an existing one)"""
+    _registry[name.lower()] = factory
+
+
+def register_openai_compatible(name: str,
+                               base_url: str,
+                               api_key_env: Optional[str] = None,
+                               headers: Optional[Dict[str, str]] = None):
+    """Register an OpenAI-compatible endpoint (vLLM, llama.cpp server, Ollama, ...) as a provider"""
+    def factory(provider_name, config, api_keys):
+        keys = dict(api_keys)
+        key_name = None
+        if api_key_env:
+            key_name = api_key_env.lower()
+            if os.getenv(api_key_env):
+                keys.setdefault(key_name, os.getenv(api_key_env))
+        return OpenAICompatibleAdapter(provider_name, config, keys, base_url=base_url, api_key_name=key_name,
+                                       label=name, headers=headers)
+
+    register_provider(name, factory)
+
+
+def register_endpoints(providers: Dict[str, Any]):
+    """Register the OpenAI-compatible endpoints from the ``providers`` config section"""
+    for name, endpoint in providers.items():
+        register_openai_compatible(name, endpoint.base_url, endpoint.api_key_env, endpoint.headers)
+
+
+def create_adapter(config: AgentConfig, api_keys: Dict[str, str]) -> ProviderAdapter:
+    """Instantiate the adapter for the agent's configured provider"""
+    name = config.provider.lower()
+    factory = _registry.get(name)
+    if factory is None:
+        raise ValueError(f"Unsupported provider: {config.provider}")
+    return factory(name, config, api_keys)
+
+
+register_provider("google", GoogleAdapter)
+register_provider("anthropic", AnthropicAdapter)
+register_provider("mock", MockAdapter)
+register_provider("openai", lambda name, config, keys: OpenAIAdapter(
+    name, config, keys, base_url="https://api.openai.com/v1", api_key_name="openai_api_key", label="OpenAI"))
+register_provider("xai", lambda name, config, keys: OpenAICompatibleAdapter(
+    name, config, keys, base_url="https://api.x.ai/v1", api_key_name="xai_api_key", label="xAI"))
+# Any OpenAI-compatible server given by the agent's base_url (no API key)
+register_provider("openai_compatible", lambda name, config, keys: OpenAICompatibleAdapter(name, config, keys))
+register_provider("groq", lambda name, config, keys: OpenAICompatibleAdapter(
+    name, config, keys, base_url="https://api.groq.com/openai/v1", api_key_name="groq_api_key", label="Groq"))
+
+
+def _local_adapter(name: str, config: AgentConfig, api_keys: Dict[str, str]) -> ProviderAdapter:
+    # Imported on first use: the local backend builds on this module
+    from utils.local_llm import LocalAdapter
+    return LocalAdapter(name, config, api_keys)
+
+
+# In-process model shared by all debates (see utils/local_llm.py)
+register_provider("local", _local_adapter)
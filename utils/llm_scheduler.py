@@ -0,0 +1,178 @@
+"""
+Priority-aware scheduling of LLM calls across concurrent debates
+
+Every LLM call takes a slot from its provider before it is sent; each provider
+allows ``max_concurrency`` calls in flight (``scheduler`` config section).
+When the provider is saturated, waiting calls are served in strict priority
+order (interactive, then batch, then background), and round-robin across
+tenants within a class, so one tenant's tournament cannot starve another's
+and interactive debates never wait behind batch work.
+
+The priority class and tenant of a call come from the running context: the
+orchestrator sets them for the debate with ``call_context()``.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, Iterator, Tuple
+
+from utils.logger import setup_logger
+from utils.metrics import QUEUE_DEPTH, QUEUE_WAIT_DURATION
+from utils.timing import current_record, monotonic_ns, QUEUE_WAIT
+
+logger = setup_logger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BATCH, BACKGROUND)  # served in this order
+
+DEFAULT_TENANT = "default"
+
+_call_context: ContextVar[Tuple[str, str]] = ContextVar("llm_call_context", default=(INTERACTIVE, DEFAULT_TENANT))
+
+
+@contextmanager
+def call_context(priority: str = INTERACTIVE, tenant: str = DEFAULT_TENANT) -> Iterator[None]:
+    """Set the priority class and tenant for LLM calls made in this context"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unsupported priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+    token = _call_context.set((priority, tenant))
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def current_call_context() -> Tuple[str, str]:
+    """(priority, tenant) for LLM calls made in this context"""
+    return _call_context.get()
+
+
+class ProviderQueue:
+    """Concurrency cap for one provider with per-class, per-tenant fair queues"""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        # priority -> tenant -> waiting futures; tenants rotate for round-robin
+        self._waiting: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._waiting_count = 0
+
+    async def acquire(self, priority: str, tenant: str) -> bool:
+        """Take a slot, waiting if the provider is saturated; returns whether it waited"""
+        if self.active < self.limit and not self._waiting_count:
+            self.active += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(tenant, deque()).append(future)
+        self._waiting_count += 1
+        depth = QUEUE_DEPTH.labels(priority)
+        depth.inc()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller gave up; pass it on
+                self.release()
+            else:
+                self._remove(priority, tenant, future)
+            raise
+        finally:
+            depth.dec()
+        return True
+
+    def release(self):
+        """Hand the slot to the next waiter, or free it"""
+        future = self._next_waiter()
+        if future is not None:
+            future.set_result(None)
+        else:
+            self.active -= 1
+
+    def _next_waiter(self):
+        for priority in PRIORITIES:
+            tenants = self._waiting[priority]
+            while tenants:
+                tenant, futures = next(iter(tenants.items()))
+                future = futures.popleft()
+                self._waiting_count -= 1
+                if futures:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                if not future.done():
+                    return future
+        return None
+
+    def _remove(self, priority: str, tenant: str, future: asyncio.Future):
+        futures = self._waiting[priority].get(tenant)
+        if futures is not None and future in futures:
+            futures.remove(future)
+            self._waiting_count -= 1
+            if not futures:
+                del self._waiting[priority][tenant]
+
+
+class LLMScheduler:
+    """Process-wide provider slots, configured from the ``scheduler`` config section"""
+
+    def __init__(self):
+        self.enabled = True
+        self.max_concurrency = 32
+        self.provider_concurrency: Dict[str, int] = {}
+        self._queues: Dict[Tuple[str, asyncio.AbstractEventLoop], ProviderQueue] = {}
+
+    def configure(self, enabled: bool, max_concurrency: int, provider_concurrency: Dict[str, int]):
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.provider_concurrency = {name.lower(): limit for name, limit in provider_concurrency.items()}
+        self._queues.clear()
+
+    def _queue(self, provider: str) -> ProviderQueue:
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get((provider, loop))
+        if queue is None:
+            for stale in [key for key in self._queues if key[1].is_closed()]:
+                del self._queues[stale]
+            limit = self.provider_concurrency.get(provider, self.max_concurrency)
+            queue = self._queues[(provider, loop)] = ProviderQueue(limit)
+        return queue
+
+    @asynccontextmanager
+    async def slot(self, provider: str) -> AsyncIterator[None]:
+        """Hold one of the provider's slots for the duration of a call"""
+        if not self.enabled:
+            yield
+            return
+
+        priority, tenant = _call_context.get()
+        queue = self._queue(provider)
+        start_ns = monotonic_ns()
+        waited_ns = 0
+        if await queue.acquire(priority, tenant):
+            waited_ns = monotonic_ns() - start_ns
+            record = current_record()
+            if record is not None:
+                record.add(QUEUE_WAIT, waited_ns)
+        QUEUE_WAIT_DURATION.labels(priority).observe(waited_ns / 1_000_000_000)
+        try:
+            yield
+        finally:
+            queue.release()
+
+
+scheduler = LLMScheduler()
+
+
+def configure_scheduler(scheduler_config) -> LLMScheduler:
+    """Configure the process-wide LLM scheduler from a SchedulerConfig"""
+    scheduler.configure(scheduler_config.enabled, scheduler_config.max_concurrency,
+                        scheduler_config.provider_concurrency)
+    if scheduler.enabled:
+        logger.info(f"LLM scheduler: {scheduler.max_concurrency} concurrent calls per provider"
+                    + (f", overrides {scheduler.provider_concurrency}" if scheduler.provider_concurrency else ""))
+    return scheduler
@@ -0,0 +1,325 @@
+"""
+Local model backend for fully offline debates
+
+``provider: "local"`` runs a small CPU model in-process (one worker thread)
+or in a process pool, and batches concurrent requests from every debate in
+the process onto one shared engine per model. Batching is dynamic: requests
+arriving while a batch runs are collected, and the next batch starts as
+soon as a slot frees up (or after ``batch_wait_ms`` when idle).
+
+Backends (selected with ``options.backend``):
+
+- ``llama_cpp``: GGUF models through llama-cpp-python (optional dependency).
+  Requests in a batch run back to back; use ``workers`` for parallelism.
+- ``transformers``: Hugging Face causal LMs (optional dependency) with true
+  batched generation.
+- ``mock``: seeded MockLLM text with simulated compute cost, for
+  benchmarking the batching engine on any machine.
+
+For token-level continuous batching, run ``llama-server --cont-batching``
+or vLLM and use the ``openai_compatible`` provider instead.
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import AgentConfig
+from utils.logger import setup_logger
+from utils.metrics import LLM_BATCH_SIZE
+from utils.mock_llm import MockLLM, estimate_tokens
+from utils.timing import timed, INFERENCE
+from utils.llm_providers import ProviderAdapter, LLMResponse
+
+logger = setup_logger(__name__)
+
+# Engine settings taken from AgentConfig.options; the rest go to the backend
+ENGINE_OPTIONS = ("backend", "max_batch_size", "batch_wait_ms", "workers")
+
+
+@dataclass
+class LocalRequest:
+    messages: List[Dict[str, str]]  # chat messages including the system prompt
+    temperature: float
+    max_tokens: int
+
+
+@dataclass
+class LocalCompletion:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class MockBackend:
+    """Seeded MockLLM text with compute time modelled like batched decoding
+
+    A batch costs prefill time for all prompt tokens plus one decode step per
+    token of its longest completion, shared by every sequence in the batch.
+    """
+
+    def __init__(self, model: str, step_ms: float = 20.0, prefill_tokens_per_second: float = 1000.0, **options):
+        self.step_ms = step_ms
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.mock = MockLLM(**options)
+
+    def generate_batch(self, requests: List[LocalRequest]) -> List[LocalCompletion]:
+        completions = []
+        for request in requests:
+            system_prompt = "\n\n".join(m["content"] for m in request.messages if m["role"] == "system")
+            prompt = "\n\n".join(m["content"] for m in request.messages if m["role"] != "system")
+            plan = self.mock.plan(prompt, system_prompt, request.max_tokens)
+            completions.append(LocalCompletion(plan.text, plan.prompt_tokens, plan.completion_tokens))
+
+        prefill = sum(c.prompt_tokens for c in completions) / self.prefill_tokens_per_second
+        decode = max(c.completion_tokens for c in completions) * self.step_ms / 1000
+        time.sleep(prefill + decode)
+        return completions
+
+
+class LlamaCppBackend:
+    """GGUF model via llama-cpp-python (``pip install llama-cpp-python``)"""
+
+    def __init__(self, model: str, model_path: Optional[str] = None, n_ctx: int = 4096,
+                 n_threads: Optional[int] = None, **options):
+        from llama_cpp import Llama
+
+        self.llm = Llama(model_path=model_path or model, n_ctx=n_ctx, n_threads=n_threads, verbose=False, **options)
+
+    def generate_batch(self, requests: List[LocalRequest]) -> List[LocalCompletion]:
+        completions = []
+        for request in requests:
+            result = self.llm.create_chat_completion(
+                messages=request.messages, temperature=request.temperature, max_tokens=request.max_tokens
+            )
+            usage = result.get("usage", {})
+            completions.append(LocalCompletion(
+                result["choices"][0]["message"]["content"],
+                usage.get("prompt_tokens", 0),
+                usage.get("completion_tokens", 0)
+            ))
+        return completions
+
+
+class TransformersBackend:
+    """Hugging Face causal LM with batched generation (``pip install transformers torch``)"""
+
+    def __init__(self, model: str, model_path: Optional[str] = None, n_threads: Optional[int] = None, **options):
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        if n_threads:
+            torch.set_num_threads(n_threads)
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path or model, padding_side="left")
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model = AutoModelForCausalLM.from_pretrained(model_path or model, **options)
+        self.model.eval()
+
+    def _prompt(self, messages: List[Dict[str, str]]) -> str:
+        if getattr(self.tokenizer, "chat_template", None):
+            return self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        return "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages) + "\n\nASSISTANT:"
+
+    def generate_batch(self, requests: List[LocalRequest]) -> List[LocalCompletion]:
+        # One generate() call per sampling temperature; lengths are trimmed per request afterwards
+        groups: Dict[float, List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault(request.temperature, []).append(index)
+
+        completions: List[Optional[LocalCompletion]] = [None] * len(requests)
+        for temperature, indexes in groups.items():
+            prompts = [self._prompt(requests[i].messages) for i in indexes]
+            inputs = self.tokenizer(prompts, return_tensors="pt", padding=True)
+            with self.torch.no_grad():
+                output = self.model.generate(
+                    **inputs,
+                    max_new_tokens=max(requests[i].max_tokens for i in indexes),
+                    do_sample=temperature > 0,
+                    temperature=temperature if temperature > 0 else None,
+                    pad_token_id=self.tokenizer.pad_token_id
+                )
+            prompt_length = inputs["input_ids"].shape[1]
+            for row, i in enumerate(indexes):
+                generated = output[row][prompt_length:][:requests[i].max_tokens]
+                generated = generated[generated != self.tokenizer.pad_token_id]
+                completions[i] = LocalCompletion(
+                    self.tokenizer.decode(generated, skip_special_tokens=True).strip(),
+                    int(inputs["attention_mask"][row].sum()),
+                    len(generated)
+                )
+        return completions
+
+
+BACKENDS = {
+    "mock": MockBackend,
+    "llama_cpp": LlamaCppBackend,
+    "transformers": TransformersBackend
+}
+
+
+def load_backend(backend: str, model: str, options: Dict[str, Any]):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported local backend: {backend}")
+    return BACKENDS[backend](model, **options)
+
+
+# Process pool workers hold one model each
+_worker_backend = None
+
+
+def _init_worker(backend: str, model: str, options: Dict[str, Any]):
+    global _worker_backend
+    _worker_backend = load_backend(backend, model, options)
+
+
+def _run_in_worker(requests: List[LocalRequest]) -> List[LocalCompletion]:
+    return _worker_backend.generate_batch(requests)
+
+
+class LocalEngine:
+    """Shared model instance that batches concurrent requests"""
+
+    def __init__(self,
+                 backend: str,
+                 model: str,
+                 options: Dict[str, Any],
+                 max_batch_size: int = 8,
+                 batch_wait_ms: float = 5.0,
+                 workers: int = 0):
+        self.backend_name = backend
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_wait = batch_wait_ms / 1000
+        self._queue: "asyncio.Queue[Tuple[LocalRequest, asyncio.Future]]" = asyncio.Queue()
+        self._scheduler: Optional[asyncio.Task] = None
+        self._batch_size_metric = LLM_BATCH_SIZE.labels(f"local:{backend}")
+
+        if workers > 0:
+            # Each process loads its own copy of the model; one batch in flight per process
+            self._executor: Executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                           initargs=(backend, model, options))
+            self._run = _run_in_worker
+            self._slots = asyncio.Semaphore(workers)
+        else:
+            # In-process: one dedicated thread owns the model (backends are not thread-safe)
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix=f"local-{backend}")
+            self._backend = None
+            self._backend_args = (backend, model, options)
+            self._run = self._run_in_thread
+            self._slots = asyncio.Semaphore(1)
+
+    def _run_in_thread(self, requests: List[LocalRequest]) -> List[LocalCompletion]:
+        if self._backend is None:
+            self._backend = load_backend(*self._backend_args)
+        return self._backend.generate_batch(requests)
+
+    async def submit(self, request: LocalRequest) -> LocalCompletion:
+        """Queue a request for the next batch and wait for its completion"""
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._schedule())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future))
+        return await future
+
+    async def _schedule(self):
+        while True:
+            batch = [await self._queue.get()]
+            await self._slots.acquire()
+            # Requests that queued while every slot was busy join now; when idle, wait briefly for company
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            asyncio.create_task(self._execute(batch))
+
+    async def _execute(self, batch: List[Tuple[LocalRequest, asyncio.Future]]):
+        live = [(request, future) for request, future in batch if not future.cancelled()]
+        try:
+            if not live:
+                return
+            self._batch_size_metric.observe(len(live))
+            loop = asyncio.get_running_loop()
+            completions = await loop.run_in_executor(self._executor, self._run, [r for r, _ in live])
+            for (_, future), completion in zip(live, completions):
+                if not future.done():
+                    future.set_result(completion)
+        except Exception as e:
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# One engine per model configuration and event loop, shared by every agent and debate
+_engines: Dict[Tuple[str, asyncio.AbstractEventLoop], LocalEngine] = {}
+
+
+def get_engine(config: AgentConfig) -> LocalEngine:
+    options = dict(config.options)
+    engine_options = {key: options.pop(key) for key in ENGINE_OPTIONS if key in options}
+    backend = engine_options.pop("backend", "mock")
+
+    key = (json.dumps([backend, config.model, options, engine_options], sort_keys=True),
+           asyncio.get_running_loop())
+    engine = _engines.get(key)
+    if engine is None:
+        engine = LocalEngine(backend, config.model, options, **engine_options)
+        _engines[key] = engine
+        logger.info(f"Local engine started: {backend}/{config.model} "
+                    f"(max batch {engine.max_batch_size}, workers {engine_options.get('workers', 0)})")
+    return engine
+
+
+def shutdown_engines():
+    """Stop every local engine (model workers and threads)"""
+    for engine in _engines.values():
+        engine.shutdown()
+    _engines.clear()
+
+
+class LocalAdapter(ProviderAdapter):
+    """Provider adapter submitting chats to the shared local engine"""
+
+    label = "Local"
+
+    def __init__(self, name: str, config: AgentConfig, api_keys: Dict[str, str]):
+        super().__init__(name, config, api_keys)
+        backend = config.options.get("backend", "mock")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported local backend: {backend}")
+        self._engine: Optional[LocalEngine] = None
+
+    async def complete(self, turns, system_prompt, temperature, max_tokens) -> LLMResponse:
+        # The engine is bound to the running loop, so it is resolved on first use
+        if self._engine is None:
+            self._engine = get_engine(self.config)
+
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.extend({"role": turn.role, "content": turn.text} for turn in turns)
+
+        with timed(INFERENCE):
+            completion = await self._engine.submit(LocalRequest(messages, temperature, max_tokens))
+        return self.response(
+            completion.text, None,
+            prompt_tokens=completion.prompt_tokens or estimate_tokens("".join(m["content"] for m in messages)),
+            completion_tokens=completion.completion_tokens
+        )
@@ -0,0 +1,296 @@
+"""
+In-process metrics for the debate system, exported in Prometheus text format
+
+Labelled children are created once per distinct label tuple and cached, so the
+hot path (``child.inc()`` / ``child.observe()``) allocates nothing. Callers that
+record on every request should resolve their children once (e.g. in
+``__init__``) and keep a reference. All updates happen on the event loop, so no
+locking is needed.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) for LLM and search calls
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+# Duration buckets (seconds) for whole debates and debate phases
+PHASE_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 90.0, 120.0, 180.0, 300.0, 600.0, 1200.0, 1800.0)
+# Wait buckets (seconds) for scheduler queues, where milliseconds matter
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Request counts per executed batch
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0.0
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def reset(self):
+        self.value = 0.0
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        # One slot per bucket plus +Inf; cumulated only when rendering
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def reset(self):
+        self.counts = [0] * (len(self.upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Metric:
+    """Base class for labelled metric families"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._default = self.labels() if not self.labelnames else None
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Get (creating once) the child for a label tuple, in labelnames order"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _render_samples(self, lines: List[str]):
+        raise NotImplementedError
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} {self.metric_type}")
+        self._render_samples(lines)
+
+    def clear(self):
+        """Zero every child in place: callers keep references to their children"""
+        for child in self._children.values():
+            child.reset()
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def _render_samples(self, lines: List[str]):
+        for values, child in self._children.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def _render_samples(self, lines: List[str]):
+        for values, child in self._children.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations"""
+
+    metric_type = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _render_samples(self, lines: List[str]):
+        bounds = self.upper_bounds + (float("inf"),)
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            metric.render(lines)
+        lines.append("")
+        return "\n".join(lines)
+
+    def reset(self):
+        """Zero all recorded values (used by benchmarks between runs)"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+# Debates
+DEBATES_IN_FLIGHT = registry.register(Gauge(
+    "debates_in_flight", "Debates currently running"))
+DEBATES_TOTAL = registry.register(Counter(
+    "debates_total", "Debates finished, by outcome", ["outcome"]))
+DEBATE_DURATION = registry.register(Histogram(
+    "debate_duration_seconds", "End-to-end debate duration", buckets=PHASE_BUCKETS))
+DEBATE_PHASE_DURATION = registry.register(Histogram(
+    "debate_phase_duration_seconds", "Debate phase duration", ["phase"], buckets=PHASE_BUCKETS))
+DEBATE_TURN_DURATION = registry.register(Histogram(
+    "debate_turn_duration_seconds", "Single agent turn duration", ["role"]))
+DEBATE_EVENTS = registry.register(Counter(
+    "debate_events_total", "Debate pipeline events by type", ["type"]))
+DEBATE_EARLY_STOPS = registry.register(Counter(
+    "debate_early_stops_total", "Debates ended early on convergence, by trigger (repetition, stale, mixed)", ["trigger"]))
+PROMPT_CHARS_COLLAPSED = registry.register(Counter(
+    "prompt_chars_collapsed_total", "Characters of repeated claims collapsed out of prompts, by prompt (context, judge)", ["prompt"]))
+
+# LLM calls
+LLM_REQUEST_DURATION = registry.register(Histogram(
+    "llm_request_duration_seconds", "LLM request latency", ["provider", "model", "role"]))
+LLM_TOKENS = registry.register(Counter(
+    "llm_tokens_total", "LLM tokens by direction (in/out; cached = prompt tokens read from the provider cache)", ["provider", "model", "role", "direction"]))
+LLM_RETRIES = registry.register(Counter(
+    "llm_retries_total", "LLM request retries by provider and reason (HTTP status or error type)", ["provider", "reason"]))
+
+# Batching (local backend and micro-batcher)
+LLM_BATCH_SIZE = registry.register(Histogram(
+    "llm_batch_size", "Requests per executed batch", ["backend"], buckets=BATCH_SIZE_BUCKETS))
+
+# Web search
+SEARCH_REQUEST_DURATION = registry.register(Histogram(
+    "search_request_duration_seconds", "Web search latency", ["provider"]))
+
+# Caches (hit/miss per cache name)
+CACHE_REQUESTS = registry.register(Counter(
+    "cache_requests_total", "Cache lookups by result (hit/miss)", ["cache", "result"]))
+
+# Scheduling and serving
+QUEUE_DEPTH = registry.register(Gauge(
+    "llm_queue_depth", "LLM calls waiting for a provider slot", ["priority"]))
+QUEUE_WAIT_DURATION = registry.register(Histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for a provider slot", ["priority"], buckets=QUEUE_WAIT_BUCKETS))
+SSE_CLIENTS = registry.register(Gauge(
+    "sse_clients", "Connected Server-Sent Events clients"))
+SSE_RESUMES = registry.register(Counter(
+    "sse_resumes_total", "Stream reconnections with Last-Event-ID"))
+SSE_REPLAY_GAPS = registry.register(Counter(
+    "sse_replay_gaps_total", "Clients that fell behind the replay buffer and skipped events"))
+LIVE_DEBATES = registry.register(Gauge(
+    "live_debates", "Streamed debates running in the background"))
+
+# Distributed workers
+DEBATE_JOBS = registry.register(Counter(
+    "debate_jobs_total", "Broker job transitions (enqueued, claimed, redelivered, completed, lease_lost, abandoned)", ["event"]))
+ERRORS = registry.register(Counter(
+    "errors_total", "Errors by component and exception type", ["component", "type"]))
+
+
+def record_error(component: str, error: BaseException):
+    """Count an error by component and exception class name"""
+    ERRORS.labels(component, type(error).__name__).inc()
@@ -0,0 +1,260 @@
+"""
+Deterministic mock LLM and search backends for offline benchmarking
+
+Outputs are seeded from the configured seed and the request content, so the
+same debate replays identically across runs and processes. Latency, token
+throughput and error injection are configurable to model real providers.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, List, Optional, Sequence, Union
+
+_WORDS = (
+    "evidence suggests policy outcomes research data impact society economic growth "
+    "costs benefits risks long-term communities studies show however therefore "
+    "moreover critics argue proponents claim regulation innovation access fairness "
+    "efficiency sustainability public private sector markets incentives history "
+    "experience demonstrates consequences stakeholders trade-offs principle practice"
+).split()
+
+
+class MockLLMError(Exception):
+    """Injected provider failure"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class MockCompletion:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    delay_seconds: float
+    error: Optional[MockLLMError] = None
+    cached_tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+# Samples are capped at the mean plus this many jitters, so a heavy tail cannot stall a run
+MAX_LATENCY_JITTERS = 10.0
+
+
+def sample_latency(rng: random.Random, distribution: str, mean_ms: float, jitter_ms: float) -> float:
+    """Sample a latency in seconds from a named distribution (``jitter_ms``: standard deviation)"""
+    if distribution == "fixed":
+        latency_ms = mean_ms
+    elif distribution == "uniform":
+        latency_ms = rng.uniform(mean_ms - jitter_ms, mean_ms + jitter_ms)
+    elif distribution == "normal":
+        latency_ms = rng.gauss(mean_ms, jitter_ms)
+    elif distribution == "lognormal":
+        # Long right tail like real providers, with the given mean and standard deviation
+        if mean_ms <= 0:
+            latency_ms = 0.0
+        else:
+            sigma = math.sqrt(math.log(1 + (jitter_ms / mean_ms) ** 2))
+            latency_ms = rng.lognormvariate(math.log(mean_ms) - sigma ** 2 / 2, sigma)
+    else:
+        raise ValueError(f"Unsupported latency distribution: {distribution}")
+    return min(max(0.0, latency_ms), mean_ms + MAX_LATENCY_JITTERS * abs(jitter_ms)) / 1000
+
+
+def _rng_for(seed: int, *parts: str) -> random.Random:
+    digest = hashlib.sha256("\x1f".join([str(seed), *parts]).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+class MockLLM:
+    """Seeded text generator with configurable latency, throughput and failures
+
+    Simulates provider prompt caching: the longest cacheable prefix of a
+    request seen before is reported as cached tokens and skips the prefill
+    time implied by ``prefill_tokens_per_second`` (0 disables prefill
+    modelling).
+    """
+
+    PREFIX_CACHE_SIZE = 4096
+
+    def __init__(self,
+                 seed: int = 0,
+                 latency_distribution: str = "lognormal",
+                 latency_ms: float = 300.0,
+                 latency_jitter_ms: float = 100.0,
+                 tokens_per_second: float = 200.0,
+                 completion_tokens: int = 150,
+                 error_rate: float = 0.0,
+                 prefill_tokens_per_second: float = 0.0):
+        self.seed = seed
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self._prefix_cache: "OrderedDict[str, None]" = OrderedDict()
+
+    def plan(self,
+             prompt: str,
+             system_prompt: Optional[str],
+             max_tokens: int,
+             cached_tokens: int = 0,
+             attempt: int = 0) -> MockCompletion:
+        """Decide the output, token counts, delay and injected error for a request"""
+        rng = _rng_for(self.seed, system_prompt or "", prompt)
+        prompt_tokens = estimate_tokens((system_prompt or "") + prompt)
+        cached_tokens = min(cached_tokens, prompt_tokens)
+
+        if "JSON format" in prompt:
+            text = self._judgment(rng)
+        else:
+            text = self._argument(rng, min(max_tokens, self.completion_tokens))
+        completion_tokens = estimate_tokens(text)
+
+        # Time to first token plus generation time at the configured throughput
+        delay = sample_latency(rng, self.latency_distribution, self.latency_ms, self.latency_jitter_ms)
+        if self.tokens_per_second > 0:
+            delay += completion_tokens / self.tokens_per_second
+        if self.prefill_tokens_per_second > 0:
+            delay += (prompt_tokens - cached_tokens) / self.prefill_tokens_per_second
+
+        error = None
+        # Errors are drawn per attempt, so a retried request can succeed
+        error_rng = _rng_for(self.seed, "error", str(attempt), system_prompt or "", prompt) if attempt else rng
+        if self.error_rate > 0 and error_rng.random() < self.error_rate:
+            status = error_rng.choice((429, 500, 503))
+            error = MockLLMError(f"Mock API error {status}: injected failure", status)
+
+        return MockCompletion(text, prompt_tokens, completion_tokens, delay, error, cached_tokens)
+
+    async def generate(self,
+                       prompt: str,
+                       system_prompt: Optional[str],
+                       max_tokens: int,
+                       cache_boundaries: Sequence[int] = (),
+                       attempt: int = 0) -> MockCompletion:
+        """Wait out the planned delay, then return the completion or raise the injected error
+
+        ``cache_boundaries`` are offsets into ``prompt`` where a cacheable prefix
+        ends (message boundaries); a prefix seen before, together with the
+        system prompt, is a cache hit.
+        """
+        cached_tokens = self._lookup_prefixes(system_prompt, prompt, cache_boundaries) if cache_boundaries else 0
+        completion = self.plan(prompt, system_prompt, max_tokens, cached_tokens, attempt)
+        await asyncio.sleep(completion.delay_seconds)
+        if completion.error is not None:
+            raise completion.error
+        return completion
+
+    async def stream(self,
+                     prompt: str,
+                     system_prompt: Optional[str],
+                     max_tokens: int,
+                     cache_boundaries: Sequence[int] = (),
+                     attempt: int = 0) -> AsyncIterator[Union[str, MockCompletion]]:
+        """Yield the completion word by word at the configured throughput, then the MockCompletion
+
+        The time to the first chunk is the planned delay minus generation time,
+        so a streamed and an unstreamed request take equally long in total.
+        """
+        cached_tokens = self._lookup_prefixes(system_prompt, prompt, cache_boundaries) if cache_boundaries else 0
+        completion = self.plan(prompt, system_prompt, max_tokens, cached_tokens, attempt)
+        generation = completion.completion_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        await asyncio.sleep(max(0.0, completion.delay_seconds - generation))
+        if completion.error is not None:
+            raise completion.error
+
+        words = completion.text.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(generation / len(words))
+            yield word if i == len(words) - 1 else word + " "
+        yield completion
+
+    def _lookup_prefixes(self, system_prompt: Optional[str], prompt: str, boundaries: Sequence[int]) -> int:
+        """Return the cached token count of the longest known prefix, then cache every prefix"""
+        cached_tokens = 0
+        keys = []
+        for end in sorted(set(boundaries), reverse=True):
+            key = hashlib.sha256(f"{system_prompt or ''}\x1f{prompt[:end]}".encode("utf-8")).hexdigest()
+            keys.append(key)
+            if not cached_tokens and key in self._prefix_cache:
+                cached_tokens = estimate_tokens((system_prompt or "") + prompt[:end])
+
+        for key in keys:
+            self._prefix_cache[key] = None
+            self._prefix_cache.move_to_end(key)
+        while len(self._prefix_cache) > self.PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return cached_tokens
+
+    def _argument(self, rng: random.Random, target_tokens: int) -> str:
+        sentences = []
+        tokens = 0
+        while tokens < target_tokens:
+            words = rng.choices(_WORDS, k=rng.randint(8, 18))
+            sentence = " ".join(words).capitalize() + "."
+            sentences.append(sentence)
+            tokens += estimate_tokens(sentence) + 1
+        return " ".join(sentences)
+
+    def _judgment(self, rng: random.Random) -> str:
+        pro_score = rng.randint(40, 90)
+        con_score = rng.randint(40, 90)
+        winner = "PRO" if pro_score >= con_score else "CON"
+        return json.dumps({
+            "winner": winner,
+            "reasoning": f"Mock judgment: {winner} presented the more consistent case.",
+            "score": {"pro_score": pro_score, "con_score": con_score},
+            "analysis": {
+                "pro_strengths": ["mock strength"],
+                "pro_weaknesses": ["mock weakness"],
+                "con_strengths": ["mock strength"],
+                "con_weaknesses": ["mock weakness"]
+            }
+        })
+
+
+class MockSearch:
+    """Seeded web search results with configurable latency and failures"""
+
+    def __init__(self,
+                 seed: int = 0,
+                 latency_distribution: str = "lognormal",
+                 latency_ms: float = 200.0,
+                 latency_jitter_ms: float = 50.0,
+                 error_rate: float = 0.0):
+        self.seed = seed
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+
+    async def search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        rng = _rng_for(self.seed, "search", query)
+        await asyncio.sleep(sample_latency(rng, self.latency_distribution, self.latency_ms, self.latency_jitter_ms))
+        if self.error_rate > 0 and rng.random() < self.error_rate:
+            raise MockLLMError("Mock search error: injected failure")
+
+        results = []
+        for i in range(max_results):
+            snippet = " ".join(rng.choices(_WORDS, k=rng.randint(20, 40))).capitalize() + "."
+            results.append({
+                "title": f"{query} - source {i + 1}",
+                "snippet": snippet,
+                "url": f"https://example.org/{i + 1}",
+                "source": "Mock"
+            })
+        return results
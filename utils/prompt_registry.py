@@ -0,0 +1,117 @@
+"""
+Prompt template registry and precompiled debate prompts
+
+Templates in ``prompts/*.txt`` are read once at import time into an immutable
+mapping, so agents never touch the filesystem on the event loop. Setting
+``PROMPTS_AUTO_RELOAD=1`` (development) re-reads a template when its mtime
+changes.
+"""
+
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from utils.logger import setup_logger
+from utils.metrics import CACHE_REQUESTS
+
+logger = setup_logger(__name__)
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+
+class PromptRegistry:
+    """Immutable name -> template mapping loaded from a prompts directory"""
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, auto_reload: bool = False):
+        self.prompts_dir = Path(prompts_dir)
+        self.auto_reload = auto_reload
+        self._mtimes: Dict[str, float] = {}
+        self._templates: Mapping[str, str] = MappingProxyType({})
+        self._hits = CACHE_REQUESTS.labels("prompt_template", "hit")
+        self._misses = CACHE_REQUESTS.labels("prompt_template", "miss")
+        self.load()
+
+    def load(self):
+        """(Re)load every template in the prompts directory"""
+        templates = {}
+        mtimes = {}
+        for path in sorted(self.prompts_dir.glob("*.txt")):
+            templates[path.stem] = path.read_text()
+            mtimes[path.stem] = path.stat().st_mtime
+        self._templates = MappingProxyType(templates)
+        self._mtimes = mtimes
+        logger.info(f"Loaded {len(templates)} prompt templates from {self.prompts_dir}")
+
+    def get(self, name: str, fallback: Optional[str] = None) -> Optional[str]:
+        """Get a template by name (file stem), or the fallback if it does not exist"""
+        if self.auto_reload:
+            self._reload_if_changed(name)
+
+        template = self._templates.get(name)
+        if template is None:
+            self._misses.inc()
+            return fallback
+        self._hits.inc()
+        return template
+
+    @property
+    def templates(self) -> Mapping[str, str]:
+        return self._templates
+
+    def _reload_if_changed(self, name: str):
+        path = self.prompts_dir / f"{name}.txt"
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._mtimes.get(name):
+            # Copy-on-write so readers holding the old mapping are unaffected
+            templates = dict(self._templates)
+            templates[name] = path.read_text()
+            self._templates = MappingProxyType(templates)
+            self._mtimes[name] = mtime
+            logger.info(f"Reloaded prompt template: {name}")
+
+
+class DebatePromptTemplate:
+    """PRO/CON turn prompt with the static instructions joined once
+
+    Only the topic, research and history slots are filled per turn; empty
+    sections are omitted along with their headers. ``evidence`` (research
+    retrieved for this turn) and an ``instruction`` for the kind of turn
+    (opening, rebuttal, ...) go before the standard instructions.
+    """
+
+    def __init__(self, task: str, guidelines: List[str], closing: str):
+        self._instructions = "\n".join([task, "Guidelines:", *guidelines, closing])
+
+    def render_messages(self,
+                        topic: str,
+                        research: str = "",
+                        history: Optional[List[Dict[str, Any]]] = None,
+                        instruction: Optional[str] = None,
+                        evidence: str = "") -> List[Dict[str, Any]]:
+        """Render as chat messages: stable context, prior turns, then the instructions
+
+        The topic/research message and the last prior turn are marked as cache
+        breakpoints, so providers can reuse everything before the new
+        instructions on the next turn; per-turn evidence therefore goes with
+        the instructions.
+        """
+        context = [f"DEBATE TOPIC: {topic}"]
+        if research:
+            context.append("RESEARCH CONTEXT:")
+            context.append(research)
+        messages = [{"role": "user", "content": "\n".join(context), "cache": True}]
+        if history:
+            messages.extend(history[:-1])
+            messages.append({**history[-1], "cache": True})
+        content = f"{instruction}\n{self._instructions}" if instruction else self._instructions
+        if evidence:
+            content = f"RELEVANT RESEARCH:\n{evidence}\n\n{content}"
+        messages.append({"role": "user", "content": content})
+        return messages
+
+
+prompt_registry = PromptRegistry(auto_reload=os.getenv("PROMPTS_AUTO_RELOAD", "").lower() in ("1", "true", "yes"))
@@ -0,0 +1,94 @@
+"""
+In-memory retrieval over a debate's research
+
+The research text (numbered search results, then the judge's summary) is
+split into chunks at blank lines, one search result or summary paragraph
+each; paragraphs longer than ``chunk_words`` are packed into windows of
+whole sentences. ``BM25Index`` ranks the chunks for a query with Okapi
+BM25 over an inverted index, which for a few dozen chunks takes well under
+a millisecond, so every turn can retrieve the research that bears on what
+it is answering instead of carrying all of it.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from utils.text_similarity import sentences, words
+
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+# Common words that carry no retrieval signal
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+def terms(text: str) -> List[str]:
+    """Words of a text minus stopwords"""
+    return [word for word in words(text) if word not in STOPWORDS]
+
+
+def chunk_text(text: str, chunk_words: int = 80, min_words: int = 4) -> List[str]:
+    """Paragraphs of a text, long ones split into windows of whole sentences; tiny fragments dropped"""
+    chunks: List[str] = []
+    for paragraph in _BLANK_LINE.split(text):
+        paragraph = paragraph.strip()
+        if len(words(paragraph)) < min_words:
+            continue
+        if len(words(paragraph)) <= chunk_words:
+            chunks.append(paragraph)
+            continue
+        window: List[str] = []
+        size = 0
+        for sentence, _ in sentences(paragraph):
+            count = len(words(sentence))
+            if window and size + count > chunk_words:
+                chunks.append(" ".join(window))
+                window, size = [], 0
+            window.append(sentence)
+            size += count
+        if window:
+            chunks.append(" ".join(window))
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 ranking of a fixed list of documents"""
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}  # Term -> (document, term frequency)
+        self._lengths: List[int] = []
+        for index, document in enumerate(documents):
+            counts = Counter(terms(document))
+            self._lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                self._postings.setdefault(term, []).append((index, frequency))
+        self._average_length = sum(self._lengths) / len(self._lengths) if documents else 0.0
+        count = len(documents)
+        self._idf = {term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                     for term, postings in self._postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Up to ``k`` (document index, score) pairs sharing a term with the query, best first"""
+        scores: Dict[int, float] = {}
+        for term in set(terms(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for index, frequency in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / self._average_length)
+                scores[index] = scores.get(index, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,290 @@
+"""
+Shared state for multi-process API serving
+
+With ``store.path`` set (``--workers N`` sets it for every worker), all API
+workers open the same SQLite database in WAL mode, where readers never block
+the writer. It holds:
+
+- result caches (web search results, research summaries), when their TTLs
+  are set, so a topic researched by one worker is reused by all of them;
+- streamed debates: status, final result and every SSE frame, so any worker
+  can report a debate's status and replay or follow a debate running on
+  another worker.
+
+Caching is off by default (TTLs of 0). Without a path, caches are an
+in-process LRU and debates are visible only to the worker running them.
+SQLite calls run on one thread per process; event writes are queued to it
+without waiting, in order.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import fast_json
+from utils.logger import setup_logger
+from utils.metrics import CACHE_REQUESTS
+
+logger = setup_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS debates (
+    debate_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_event_id INTEGER NOT NULL DEFAULT 0,
+    result BLOB
+);
+CREATE INDEX IF NOT EXISTS debates_created ON debates (created_at);
+CREATE TABLE IF NOT EXISTS debate_events (
+    debate_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    frame BLOB NOT NULL,
+    PRIMARY KEY (debate_id, event_id)
+) WITHOUT ROWID;
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+
+# Seconds between sweeps of expired cache entries and old debates
+PRUNE_INTERVAL = 300.0
+
+DEBATE_COLUMNS = ("debate_id", "topic", "status", "worker", "created_at", "updated_at", "last_event_id")
+
+
+class SharedStore:
+    """SQLite database shared by the API workers of one host"""
+
+    def __init__(self, path: str, retention_seconds: float = 86400.0):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.worker = f"{os.uname().nodename}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="shared-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_prune = 0.0
+        # First write that failed since the job broker last flushed (see JobBroker.flush)
+        self._write_error: Optional[BaseException] = None
+        self._executor.submit(self._open).result()
+
+    def _open(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _submit(self, fn, *args):
+        self._executor.submit(fn, *args).add_done_callback(self._log_failure)
+
+    def _log_failure(self, future: Future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Shared store write failed: {str(error)}")
+            if self._write_error is None:
+                self._write_error = error
+
+    def close(self):
+        def close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._executor.submit(close)
+        self._executor.shutdown(wait=True)
+
+    # Caches
+
+    def _cache_get(self, namespace: str, key: str) -> Optional[bytes]:
+        row = self._conn.execute("SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                                 (namespace, key)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def _cache_put(self, namespace: str, key: str, value: bytes, ttl: float):
+        self._conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                           (namespace, key, value, time.time() + ttl))
+
+    async def cache_get(self, namespace: str, key: str) -> Optional[bytes]:
+        return await self._call(self._cache_get, namespace, key)
+
+    def cache_put(self, namespace: str, key: str, value: bytes, ttl: float):
+        self._submit(self._cache_put, namespace, key, value, ttl)
+
+    # Debates
+
+    def _create_debate(self, debate_id: str, topic: str, now: float):
+        self._conn.execute("INSERT OR REPLACE INTO debates VALUES (?, ?, ?, ?, ?, ?, 0, NULL)",
+                           (debate_id, topic, RUNNING, self.worker, now, now))
+        if now - self._last_prune > PRUNE_INTERVAL:
+            self._last_prune = now
+            self._prune(now)
+
+    def _append_event(self, debate_id: str, event_id: int, frame: bytes, now: float):
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.execute("INSERT OR REPLACE INTO debate_events VALUES (?, ?, ?)", (debate_id, event_id, frame))
+            self._conn.execute("UPDATE debates SET last_event_id = ?, updated_at = ? WHERE debate_id = ?",
+                               (event_id, now, debate_id))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _finish_debate(self, debate_id: str, status: str, result: Optional[bytes], now: float):
+        self._conn.execute("UPDATE debates SET status = ?, result = ?, updated_at = ? WHERE debate_id = ?",
+                           (status, result, now, debate_id))
+
+    def _prune(self, now: float):
+        cutoff = now - self.retention_seconds
+        self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        self._conn.execute("DELETE FROM debate_events WHERE debate_id IN "
+                           "(SELECT debate_id FROM debates WHERE updated_at < ?)", (cutoff,))
+        self._conn.execute("DELETE FROM debates WHERE updated_at < ?", (cutoff,))
+
+    def create_debate(self, debate_id: str, topic: str):
+        self._submit(self._create_debate, debate_id, topic, time.time())
+
+    def append_event(self, debate_id: str, event_id: int, frame: bytes):
+        self._submit(self._append_event, debate_id, event_id, frame, time.time())
+
+    def finish_debate(self, debate_id: str, status: str, result: Optional[bytes] = None):
+        self._submit(self._finish_debate, debate_id, status, result, time.time())
+
+    def _get_debate(self, debate_id: str) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+        row = self._conn.execute(f"SELECT {', '.join(DEBATE_COLUMNS)}, result FROM debates WHERE debate_id = ?",
+                                 (debate_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(DEBATE_COLUMNS, row[:-1])), row[-1]
+
+    def _events_after(self, debate_id: str, cursor: int, limit: int) -> List[Tuple[int, bytes]]:
+        return self._conn.execute("SELECT event_id, frame FROM debate_events WHERE debate_id = ? AND event_id > ? "
+                                  "ORDER BY event_id LIMIT ?", (debate_id, cursor, limit)).fetchall()
+
+    def _list_debates(self, limit: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(f"SELECT {', '.join(DEBATE_COLUMNS)} FROM debates ORDER BY created_at DESC LIMIT ?",
+                                  (limit,)).fetchall()
+        return [dict(zip(DEBATE_COLUMNS, row)) for row in rows]
+
+    async def get_debate(self, debate_id: str) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+        """(status record, encoded result or None), or None for an unknown debate"""
+        return await self._call(self._get_debate, debate_id)
+
+    async def events_after(self, debate_id: str, cursor: int, limit: int = 500) -> List[Tuple[int, bytes]]:
+        return await self._call(self._events_after, debate_id, cursor, limit)
+
+    async def list_debates(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return await self._call(self._list_debates, limit)
+
+
+class MemoryCache:
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bytes, float]]" = OrderedDict()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        if entry[1] < time.time():
+            del self._entries[(namespace, key)]
+            return None
+        self._entries.move_to_end((namespace, key))
+        return entry[0]
+
+    def put(self, namespace: str, key: str, value: bytes, ttl: float):
+        self._entries[(namespace, key)] = (value, time.time() + ttl)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class ResultCache:
+    """TTL cache for search results and research, in the shared store when configured"""
+
+    def __init__(self):
+        self.store: Optional[SharedStore] = None
+        self.memory = MemoryCache(1024)
+        self.ttls: Dict[str, float] = {"search": 0.0, "research": 0.0}
+
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, 0.0)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return hashlib.sha256(fast_json.dumps(parts)).hexdigest()
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        if self.ttl(namespace) <= 0:
+            return None
+        if self.store is not None:
+            value = await self.store.cache_get(namespace, key)
+        else:
+            value = self.memory.get(namespace, key)
+        CACHE_REQUESTS.labels(namespace, "miss" if value is None else "hit").inc()
+        return None if value is None else fast_json.loads(value)
+
+    def put(self, namespace: str, key: str, value: Any):
+        ttl = self.ttl(namespace)
+        if ttl <= 0:
+            return
+        encoded = fast_json.dumps(value)
+        if self.store is not None:
+            self.store.cache_put(namespace, key, encoded, ttl)
+        else:
+            self.memory.put(namespace, key, encoded, ttl)
+
+
+result_cache = ResultCache()
+_store: Optional[SharedStore] = None
+
+
+def get_store() -> Optional[SharedStore]:
+    """The shared store, or None when state is kept in-process"""
+    return _store
+
+
+def configure_store(store_config) -> Optional[SharedStore]:
+    """Open the shared store (if a path is configured) and set cache TTLs from a StoreConfig"""
+    global _store
+    if _store is not None and (store_config.path is None or _store.path != store_config.path):
+        _store.close()
+        _store = None
+    if store_config.path and _store is None:
+        _store = SharedStore(store_config.path, store_config.retention_seconds)
+        logger.info(f"Shared store: {store_config.path} (worker {_store.worker})")
+    result_cache.store = _store
+    result_cache.memory = MemoryCache(store_config.memory_cache_size)
+    result_cache.ttls = {"search": store_config.search_cache_ttl, "research": store_config.research_cache_ttl}
+    return _store
+
+
+def close_store():
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+    result_cache.store = None
@@ -0,0 +1,127 @@
+"""
+Cheap text similarity: word shingles and MinHash signatures
+
+A text becomes the set of its hashed word n-grams (shingles, 64-bit
+BLAKE2b). A MinHash signature keeps, for each of ``num_perm`` permutations of
+the hash space (XOR with a seeded 64-bit mask: as accurate as affine
+permutations on well-mixed hashes, and several times cheaper in Python),
+the smallest permuted shingle; the share of equal positions in two signatures
+estimates the Jaccard similarity of their shingle sets, at a fixed cost per
+comparison however long the texts are. ``LSHIndex`` buckets signatures by
+bands, so near-duplicates of a new text are found without comparing it to
+every indexed one. Everything is local and deterministic (no embedding
+calls), so it can run after every debate turn.
+"""
+
+import hashlib
+import random
+import re
+from typing import AbstractSet, Dict, Hashable, Iterable, List, Set, Tuple
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+# Sentence ends (terminal punctuation followed by whitespace) and line breaks
+_SENTENCE_BREAK = re.compile(r"((?<=[.!?])\s+|\s*\n\s*)")
+
+Signature = Tuple[int, ...]
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def words(text: str) -> List[str]:
+    """Lowercased words of a text, punctuation dropped"""
+    return _WORD.findall(text.lower())
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of a text (lowercased, punctuation dropped); a shorter text is one shingle"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {_hash(" ".join(words))} if words else set()
+    return {_hash(" ".join(words[index:index + size])) for index in range(len(words) - size + 1)}
+
+
+def word_count(text: str) -> int:
+    return len(_WORD.findall(text.lower()))
+
+
+def sentences(text: str) -> List[Tuple[str, str]]:
+    """Sentences of a text with the whitespace that follows each; joining the pairs restores the text"""
+    parts = _SENTENCE_BREAK.split(text)
+    parts.append("")
+    return [(parts[index], parts[index + 1]) for index in range(0, len(parts) - 1, 2)
+            if parts[index] or parts[index + 1]]
+
+
+def jaccard(a: AbstractSet[int], b: AbstractSet[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def novelty(hashes: AbstractSet[int], seen: AbstractSet[int]) -> float:
+    """Share of a text's shingles not in ``seen`` (1.0 for an empty text)"""
+    if not hashes:
+        return 1.0
+    return len(hashes - seen) / len(hashes)
+
+
+class MinHasher:
+    """MinHash signatures with ``num_perm`` XOR-mask permutations drawn from ``seed``"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = max(1, num_perm)
+        self._masks = [rng.getrandbits(64) for _ in range(self.num_perm)]
+
+    def signature(self, hashes: Iterable[int]) -> Signature:
+        """Signature of a shingle set; empty for an empty set"""
+        hashes = list(hashes)
+        if not hashes:
+            return ()
+        return tuple(min(map(mask.__xor__, hashes)) for mask in self._masks)
+
+    def signature_of(self, text: str, size: int = 3) -> Signature:
+        return self.signature(shingles(text, size))
+
+    @staticmethod
+    def similarity(a: Signature, b: Signature) -> float:
+        """Estimated Jaccard similarity of the sets behind two signatures"""
+        if not a or not b:
+            return 0.0
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures
+
+    A signature is split into ``bands`` bands; two signatures become candidates
+    when any band matches exactly. With ``r`` rows per band, sets of Jaccard
+    similarity ``s`` collide with probability ``1 - (1 - s**r)**bands``, so
+    near-duplicates are almost always found and dissimilar texts rarely are.
+    """
+
+    def __init__(self, bands: int = 16):
+        self.bands = max(1, bands)
+        self._buckets: Dict[Tuple[int, Signature], List[Hashable]] = {}
+
+    def _keys(self, signature: Signature) -> List[Tuple[int, Signature]]:
+        rows = max(1, len(signature) // self.bands)
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(min(self.bands, len(signature)))]
+
+    def add(self, key: Hashable, signature: Signature):
+        for bucket in self._keys(signature):
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def query(self, signature: Signature) -> Set[Hashable]:
+        """Keys sharing at least one band with the signature"""
+        found: Set[Hashable] = set()
+        for bucket in self._keys(signature):
+            found.update(self._buckets.get(bucket, ()))
+        return found
+
+    def clear(self):
+        self._buckets.clear()
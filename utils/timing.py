@@ -0,0 +1,197 @@
+"""
+Timing utilities for the debate system
+
+All durations are measured with the monotonic high-resolution clock
+(``time.perf_counter_ns``) so they are immune to wall-clock jumps. Wall-clock
+time is only used for message timestamps shown to users.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Iterator
+
+from utils.metrics import DEBATE_PHASE_DURATION, DEBATE_TURN_DURATION
+
+# Segments recorded inside a phase or turn
+QUEUE_WAIT = "queue_wait"  # waiting for a provider slot
+PROMPT_BUILD = "prompt_build"
+NETWORK = "network"
+INFERENCE = "inference"  # local model compute, including waiting for a batch slot
+PARSE = "parse"
+SEARCH = "search"
+
+
+def monotonic_ns() -> int:
+    """Monotonic high-resolution clock in nanoseconds"""
+    return time.perf_counter_ns()
+
+
+def wall_clock_ms() -> int:
+    """Wall-clock time in epoch milliseconds (used for message timestamps)"""
+    return time.time_ns() // 1_000_000
+
+
+def ns_to_ms(duration_ns: int) -> float:
+    """Convert nanoseconds to milliseconds rounded to microsecond precision"""
+    return round(duration_ns / 1_000_000, 3)
+
+
+class TimingRecord:
+    """Durations recorded for a single phase or turn"""
+
+    __slots__ = ("kind", "name", "start_ns", "end_ns", "segments", "attributes")
+
+    def __init__(self, kind: str, name: str, **attributes: Any):
+        self.kind = kind
+        self.name = name
+        self.start_ns = monotonic_ns()
+        self.end_ns: Optional[int] = None
+        self.segments: Dict[str, int] = {}
+        self.attributes = attributes
+
+    def add(self, segment: str, duration_ns: int):
+        """Accumulate a segment duration (segments may repeat, e.g. several LLM calls)"""
+        self.segments[segment] = self.segments.get(segment, 0) + duration_ns
+        timing_registry.observe(f"segment.{segment}", duration_ns)
+
+    def finish(self):
+        """Mark the record as finished"""
+        self.end_ns = monotonic_ns()
+        duration_ns = self.duration_ns
+        timing_registry.observe(f"{self.kind}.{self.name}", duration_ns)
+        if self.kind == "phase":
+            DEBATE_PHASE_DURATION.labels(self.name).observe(duration_ns / 1_000_000_000)
+        elif self.kind == "turn":
+            DEBATE_TURN_DURATION.labels(self.name).observe(duration_ns / 1_000_000_000)
+
+    @property
+    def duration_ns(self) -> int:
+        end_ns = self.end_ns if self.end_ns is not None else monotonic_ns()
+        return end_ns - self.start_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the record with durations in milliseconds"""
+        return {
+            **self.attributes,
+            "duration_ms": ns_to_ms(self.duration_ns),
+            "segments_ms": {name: ns_to_ms(ns) for name, ns in self.segments.items()}
+        }
+
+
+# Record that segments measured by agents and LLM clients are attributed to.
+# Context variables are copied into each asyncio task, so concurrent debates
+# (and concurrent turns within a debate) never see each other's records.
+_current_record: ContextVar[Optional[TimingRecord]] = ContextVar("current_timing_record", default=None)
+
+
+def _reset(token):
+    # Async generators closed by the event loop's finalizer run in a different
+    # context than the one that set the record; there is nothing to restore then.
+    try:
+        _current_record.reset(token)
+    except ValueError:
+        pass
+
+
+def current_record() -> Optional[TimingRecord]:
+    """Get the timing record active in the current context, if any"""
+    return _current_record.get()
+
+
+@contextmanager
+def timed(segment: str) -> Iterator[None]:
+    """Measure a block and attribute it to the active phase/turn record"""
+    start_ns = monotonic_ns()
+    try:
+        yield
+    finally:
+        duration_ns = monotonic_ns() - start_ns
+        record = _current_record.get()
+        if record is not None:
+            record.add(segment, duration_ns)
+        else:
+            timing_registry.observe(f"segment.{segment}", duration_ns)
+
+
+class PhaseTimer:
+    """Collects per-phase and per-turn durations for one debate"""
+
+    def __init__(self):
+        self.start_ns = monotonic_ns()
+        self.phases: List[TimingRecord] = []
+        self.turns: List[TimingRecord] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[TimingRecord]:
+        """Time a debate phase (research, debate, judgment)"""
+        record = TimingRecord("phase", name)
+        self.phases.append(record)
+        token = _current_record.set(record)
+        try:
+            yield record
+        finally:
+            _reset(token)
+            record.finish()
+
+    @contextmanager
+    def turn(self, turn: int, role: str) -> Iterator[TimingRecord]:
+        """Time a single agent turn"""
+        record = TimingRecord("turn", role, turn=turn, role=role)
+        self.turns.append(record)
+        token = _current_record.set(record)
+        try:
+            yield record
+        finally:
+            _reset(token)
+            record.finish()
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Seconds since the timer was created"""
+        return (monotonic_ns() - self.start_ns) / 1_000_000_000
+
+    def summary(self) -> Dict[str, Any]:
+        """Export all phase and turn timings in milliseconds"""
+        return {
+            "total_ms": ns_to_ms(monotonic_ns() - self.start_ns),
+            "phases": {record.name: record.to_dict() for record in self.phases},
+            "turns": [record.to_dict() for record in self.turns]
+        }
+
+
+class TimingRegistry:
+    """Process-wide aggregation of timings for the metrics endpoint"""
+
+    def __init__(self):
+        self._stats: Dict[str, List[int]] = {}
+
+    def observe(self, key: str, duration_ns: int):
+        """Record one observation: [count, total_ns, max_ns]"""
+        stats = self._stats.get(key)
+        if stats is None:
+            self._stats[key] = [1, duration_ns, duration_ns]
+            return
+        stats[0] += 1
+        stats[1] += duration_ns
+        if duration_ns > stats[2]:
+            stats[2] = duration_ns
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get count, total, average and max (milliseconds) per key"""
+        return {
+            key: {
+                "count": count,
+                "total_ms": ns_to_ms(total_ns),
+                "avg_ms": ns_to_ms(total_ns // count),
+                "max_ms": ns_to_ms(max_ns)
+            }
+            for key, (count, total_ns, max_ns) in sorted(self._stats.items())
+        }
+
+    def reset(self):
+        """Clear all aggregated timings"""
+        self._stats.clear()
+
+
+timing_registry = TimingRegistry()
@@ -0,0 +1,299 @@
+"""
+Lightweight OpenTelemetry-compatible tracing for the debate system
+
+Spans follow the OpenTelemetry data model (trace/span ids, parent links,
+attributes, status) and are exported as OTLP/JSON, either appended to a local
+file or POSTed to an OTLP/HTTP collector. Sampling is decided once per trace at
+the root span; unsampled traces use a shared no-op span, so tracing costs a
+context-variable lookup when a debate is not sampled.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "attributes",
+                 "status_code", "status_message", "events", "start_unix_ns", "_start_ns", "end_unix_ns")
+
+    sampled = True
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = attributes
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.events: List[Dict[str, Any]] = []
+        # Wall-clock start for export, monotonic clock for the duration
+        self.start_unix_ns = time.time_ns()
+        self._start_ns = time.perf_counter_ns()
+        self.end_unix_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def record_exception(self, error: BaseException):
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error)
+        self.events.append({
+            "name": "exception",
+            "timeUnixNano": str(time.time_ns()),
+            "attributes": _otlp_attributes({
+                "exception.type": type(error).__name__,
+                "exception.message": str(error)
+            })
+        })
+
+    def end(self):
+        self.end_unix_ns = self.start_unix_ns + (time.perf_counter_ns() - self._start_ns)
+        if self.status_code == STATUS_UNSET:
+            self.status_code = STATUS_OK
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON span"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_unix_ns),
+            "endTimeUnixNano": str(self.end_unix_ns or self.start_unix_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code, "message": self.status_message}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+class _NonRecordingSpan:
+    """Span used for unsampled traces; every operation is a no-op"""
+
+    __slots__ = ()
+
+    sampled = False
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class SpanExporter:
+    """Base exporter: buffers finished spans and flushes them in batches"""
+
+    def __init__(self, service_name: str = "agentic-debate", batch_size: int = 256):
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+
+    def export(self, span: Span, is_root: bool):
+        self._buffer.append(span)
+        # Flush at the end of each trace so a stalled debate is visible as soon as it finishes
+        if is_root or len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        try:
+            self._write(self._encode(spans))
+        except Exception as e:
+            logger.warning(f"Span export failed: {str(e)}")
+
+    def _encode(self, spans: List[Span]) -> bytes:
+        """Encode spans as an OTLP/JSON ExportTraceServiceRequest"""
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "agentic-debate"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+        return json.dumps(request, separators=(",", ":")).encode("utf-8")
+
+    def _write(self, payload: bytes):
+        raise NotImplementedError
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON request per line to a local file (collector stand-in)"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, payload: bytes):
+        with open(self.path, "ab") as f:
+            f.write(payload + b"\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """POSTs OTLP/JSON to a collector's /v1/traces endpoint off the event loop"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def _write(self, payload: bytes):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._post(payload)
+            return
+        loop.run_in_executor(None, self._post, payload)
+
+    def _post(self, payload: bytes):
+        request = urllib.request.Request(
+            self.endpoint, data=payload, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as e:
+            logger.warning(f"OTLP export to {self.endpoint} failed: {str(e)}")
+
+
+_current_span: ContextVar[Optional[Any]] = ContextVar("current_span", default=None)
+
+
+def _reset(token):
+    # Async generators closed by the event loop's finalizer run in a different
+    # context than the one that set the span; there is nothing to restore then.
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        pass
+
+
+class Tracer:
+    """Creates spans and hands finished, sampled spans to the exporter"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_ratio = 1.0
+        self.exporter: Optional[SpanExporter] = None
+
+    def configure(self, enabled: bool, sample_ratio: float = 1.0, exporter: Optional[SpanExporter] = None):
+        if self.exporter is not None:
+            self.exporter.flush()
+        self.enabled = enabled and exporter is not None
+        self.sample_ratio = max(0.0, min(1.0, sample_ratio))
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Start a child of the current span (or a new trace) for the duration of the block"""
+        if not self.enabled:
+            yield NON_RECORDING_SPAN
+            return
+
+        parent = _current_span.get()
+        if parent is None:
+            # Root span: decide sampling for the whole trace
+            if self.sample_ratio < 1.0 and random.random() >= self.sample_ratio:
+                span = NON_RECORDING_SPAN
+            else:
+                span = Span(name, os.urandom(16).hex(), None, attributes)
+        elif not parent.sampled:
+            span = NON_RECORDING_SPAN
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _reset(token)
+            if span.sampled:
+                span.end()
+                self.exporter.export(span, is_root=parent is None)
+
+    def current_span(self) -> Any:
+        """Get the active span (a no-op span when none is active)"""
+        return _current_span.get() or NON_RECORDING_SPAN
+
+    def flush(self):
+        if self.exporter is not None:
+            self.exporter.flush()
+
+
+tracer = Tracer()
+
+
+def configure_tracing(tracing_config) -> Tracer:
+    """Configure the process-wide tracer from a TracingConfig"""
+    exporter: Optional[SpanExporter] = None
+    if tracing_config.enabled:
+        if tracing_config.exporter == "file":
+            exporter = FileSpanExporter(tracing_config.file_path, service_name=tracing_config.service_name)
+        elif tracing_config.exporter == "otlp_http":
+            exporter = OtlpHttpSpanExporter(tracing_config.otlp_endpoint, service_name=tracing_config.service_name)
+        else:
+            raise ValueError(f"Unsupported trace exporter: {tracing_config.exporter}")
+
+    tracer.configure(tracing_config.enabled, tracing_config.sample_ratio, exporter)
+    if tracer.enabled:
+        logger.info(f"Tracing enabled: exporter={tracing_config.exporter}, sample_ratio={tracer.sample_ratio}")
+    return tracer
@@ -0,0 +1,102 @@
+"""
+Token usage and cost accounting for LLM calls
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional
+
+TOKENS_PER_PRICE_UNIT = 1_000_000  # prices are quoted in USD per million tokens
+
+
+@dataclass
+class TokenUsage:
+    """Accumulated usage for one agent (or a whole debate)"""
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens served from the provider's cache (included in prompt_tokens)
+    latency_ms: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def add(self, prompt_tokens: int, completion_tokens: int, latency_ms: float, cached_tokens: int = 0):
+        """Record one LLM call"""
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached_tokens += cached_tokens
+        self.latency_ms += latency_ms
+
+    def merge(self, other: "TokenUsage"):
+        """Add another usage total into this one"""
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.latency_ms += other.latency_ms
+
+    def to_dict(self, cost_usd: Optional[float] = None) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": round(self.latency_ms, 3),
+            "cost_usd": round(cost_usd, 6) if cost_usd is not None else None
+        }
+
+
+_collected: ContextVar[Optional[TokenUsage]] = ContextVar("collected_usage", default=None)
+
+
+@contextmanager
+def collect_usage() -> Iterator[TokenUsage]:
+    """Usage of the LLM calls recorded inside the block, including tasks it starts
+
+    Per-turn accounting that stays correct when one agent takes several turns at once.
+    """
+    usage = TokenUsage()
+    token = _collected.set(usage)
+    try:
+        yield usage
+    finally:
+        _collected.reset(token)
+
+
+def record_call(total: TokenUsage, prompt_tokens: int, completion_tokens: int, latency_ms: float,
+                cached_tokens: int = 0):
+    """Add one LLM call to an agent's total and to the usage being collected, if any"""
+    total.add(prompt_tokens, completion_tokens, latency_ms, cached_tokens)
+    collected = _collected.get()
+    if collected is not None:
+        collected.add(prompt_tokens, completion_tokens, latency_ms, cached_tokens)
+
+
+def estimate_cost(model: str,
+                  prompt_tokens: int,
+                  completion_tokens: int,
+                  pricing: Dict[str, Dict[str, float]],
+                  cached_tokens: int = 0) -> Optional[float]:
+    """Estimate USD cost from a price table of {model: {"input": ..., "output": ...}} per million tokens
+
+    ``cached_tokens`` (a subset of ``prompt_tokens``) are charged at the
+    optional "cached_input" price.
+    """
+    prices = pricing.get(model)
+    if prices is None:
+        # Allow dated model ids ("claude-3-5-sonnet-20241022") to match their family entry
+        matches = [name for name in pricing if model.startswith(name)]
+        if not matches:
+            return None
+        prices = pricing[max(matches, key=len)]
+
+    input_price = prices.get("input", 0.0)
+    cached_price = prices.get("cached_input", input_price)
+    return ((prompt_tokens - cached_tokens) * input_price
+            + cached_tokens * cached_price
+            + completion_tokens * prices.get("output", 0.0)) / TOKENS_PER_PRICE_UNIT